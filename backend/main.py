@@ -2,12 +2,19 @@
 Civic Sense Portal - FastAPI Backend
 Main entry point
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
-from routers import grievances, admin, auth, user, media, admin_analytics, auto_assignment
+from routers import grievances, admin, auth, user, media, admin_analytics, auto_assignment, incidents
+from storage.data_store import data_store
+from storage.persistence import persister
+from storage.blob_store import blob_store
+from services.password_pool import password_pool
+from services.auth_utils import token_cache
+from services.auth_context import auth_metrics, require_admin
+from services.classification_preview import classification_preview
 
 # Create FastAPI app
 app = FastAPI(
@@ -35,6 +42,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -45,6 +53,7 @@ app.include_router(user.router)
 app.include_router(media.router)
 app.include_router(admin_analytics.router)
 app.include_router(auto_assignment.router)
+app.include_router(incidents.router)
 
 # Create uploads directory if not exists
 os.makedirs("uploads/audio", exist_ok=True)
@@ -53,6 +62,12 @@ os.makedirs("uploads/audio", exist_ok=True)
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 
+@app.on_event("shutdown")
+def flush_storage():
+    """Flush write-behind buffers before the process exits"""
+    persister.stop()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -68,11 +83,24 @@ async def health_check():
     """API health check"""
     return {
         "status": "healthy",
-        "database": "in-memory",
+        "database": data_store.backend_name,
         "ai_service": "active"
     }
 
 
+@app.get("/api/metrics")
+async def metrics(admin: dict = Depends(require_admin)):
+    """Internal performance counters (admin only)"""
+    return {
+        "persistence": persister.metrics(),
+        "blob_store": blob_store.metrics(),
+        "password_pool": password_pool.metrics(),
+        "token_cache": token_cache.metrics(),
+        "auth": auth_metrics.metrics(),
+        "classify_preview": classification_preview.metrics()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
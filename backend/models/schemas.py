@@ -55,10 +55,30 @@ class ClassificationResult(BaseModel):
     keywords_found: List[str]
 
 
+class ClassifyBatchItem(BaseModel):
+    """One description to classify in a batch"""
+    description: str
+    category: GrievanceCategory
+
+
+class ClassifyBatchRequest(BaseModel):
+    """Descriptions to classify together"""
+    items: List[ClassifyBatchItem]
+
+
+class ClassifyBatchResponse(BaseModel):
+    """Classification results, in request order"""
+    results: List[ClassificationResult]
+    count: int
+
+
 class DuplicateCheckRequest(BaseModel):
     """Request to check for duplicate complaints"""
     description: str
     category: GrievanceCategory
+    location: Optional[str] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
 
 
 class DuplicateCheckResponse(BaseModel):
@@ -82,8 +102,9 @@ class Grievance(BaseModel):
     category: GrievanceCategory
     description: str
     location: str
-    image_path: Optional[str] = None
-    image_data: Optional[str] = None  # Base64 image data for preview
+    image_path: Optional[str] = None  # Served path of the stored image (uploads/blobs/...)
+    image_hash: Optional[str] = None  # SHA-256 of the image in the blob store
+    image_data: Optional[str] = None  # Legacy inline base64 image (moved to blob store on load)
     audio_path: Optional[str] = None  # Path to voice note audio file
     submitter_name: str
     submitter_phone: Optional[str] = None
@@ -101,6 +122,7 @@ class Grievance(BaseModel):
     is_duplicate: bool = False
     similar_to: Optional[str] = None
     duplicate_score: float = 0.0  # Similarity percentage
+    incident_id: Optional[str] = None  # Set by the incident clustering job
     timeline: List[TimelineEntry] = []
     created_at: str
     updated_at: str
@@ -114,6 +136,54 @@ class GrievanceResponse(BaseModel):
     classification: ClassificationResult
 
 
+class NearbyGrievance(BaseModel):
+    """A grievance near a point (public fields only)"""
+    id: str
+    category: GrievanceCategory
+    description: str
+    location: str
+    lat: float
+    lng: float
+    status: Status
+    priority: Priority
+    created_at: str
+    distance_meters: float
+
+
+class NearbyGrievancesResponse(BaseModel):
+    """Grievances within a radius, nearest first"""
+    results: List[NearbyGrievance]
+    count: int
+
+
+class Incident(BaseModel):
+    """Grievances grouped as one incident by the clustering job"""
+    incident_id: str
+    category: GrievanceCategory
+    size: int
+    grievance_ids: List[str]
+    location: str
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    description: str  # Of the first grievance reported
+    first_reported: str
+    last_reported: str
+
+
+class IncidentListResponse(BaseModel):
+    """A page of incidents, largest first"""
+    incidents: List[Incident]
+    count: int
+    total: int
+    generated_at: Optional[str] = None
+
+
+class IncidentDetail(BaseModel):
+    """An incident with its grievances"""
+    incident: Incident
+    grievances: List[Grievance]
+
+
 class StatusUpdateRequest(BaseModel):
     """Request to update grievance status"""
     status: Status
@@ -1,37 +1,24 @@
 """
 Admin API Routes - Protected with JWT and role-based access
 """
-from fastapi import APIRouter, HTTPException, Header, Depends, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Header, Depends, Query, Response
+from fastapi.responses import JSONResponse
+from typing import List, Optional, Set, Tuple
 from pydantic import BaseModel
 from datetime import datetime
+import base64
+import json
 
 from models.schemas import Grievance, StatusUpdateRequest, Status
 from storage.data_store import data_store
-from services.auth_utils import get_user_from_token
+from services import auth_context
+from services.keyword_rules import keyword_rules
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 
-def require_admin(authorization: Optional[str] = Header(None)):
-    """Dependency to require admin role"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
-    
-    # Allow demo token for backward compatibility
-    if token == "admin-demo-token-2024" or token == "demo-token":
-        return {"user_id": "admin", "email": "admin@civicsense.gov.in", "role": "admin", "name": "Admin"}
-    
-    user = get_user_from_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-    
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    return user
+# Shared per-request auth dependency (kept under this name for other routers)
+require_admin = auth_context.require_admin
 
 
 # Request Models
@@ -59,45 +46,82 @@ class AnalyticsResponse(BaseModel):
     resolution_rate: float
 
 
+def encode_cursor(grievance: Grievance) -> str:
+    """Opaque keyset cursor for the (created_at, id) position of a grievance"""
+    raw = json.dumps([grievance.created_at, grievance.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Decode a cursor from encode_cursor, raising 400 if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, grievance_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(created_at), str(grievance_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Set[str]]:
+    """Parse a comma-separated field projection (id is always included)"""
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = requested - set(Grievance.model_fields)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return requested | {"id"}
+
+
 @router.get("/complaints", response_model=List[Grievance])
 async def get_all_complaints(
+    response: Response,
     category: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     area: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    after: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,status,created_at"),
+    sort: Optional[str] = Query(None, pattern="^(newest|relevance)$"),
     admin: dict = Depends(require_admin)
 ):
     """
     Get all complaints with optional filters (Admin only).
+    Newest first, or ranked by relevance when `search` is given (use
+    sort=newest to override). Pass `limit` to page: in newest-first order
+    the next page's cursor is returned in the X-Next-Cursor header and is
+    passed back as `after`; relevance-ranked results page with `offset`.
     """
-    grievances = data_store.get_all_grievances()
-    
-    # Apply filters
-    if category:
-        grievances = [g for g in grievances if g.category.value == category]
-    
-    if priority:
-        grievances = [g for g in grievances if g.priority.value == priority]
+    cursor = decode_cursor(after) if after else None
+    projection = parse_fields(fields)
     
-    if status:
-        grievances = [g for g in grievances if g.status.value == status]
-    
-    if area:
-        grievances = [g for g in grievances if area.lower() in g.location.lower()]
+    grievances = data_store.query_grievances(
+        category=category,
+        priority=priority,
+        status=status,
+        area=area,
+        search=search,
+        limit=limit,
+        offset=offset,
+        after=cursor,
+        sort=sort
+    )
     
-    if search:
-        search_lower = search.lower()
-        grievances = [g for g in grievances if 
-            search_lower in g.id.lower() or
-            search_lower in g.description.lower() or
-            search_lower in g.location.lower() or
-            search_lower in g.submitter_name.lower()
-        ]
+    ranked = bool(search) and sort != "newest"
+    headers = {}
+    if limit is not None and len(grievances) == limit and not ranked:
+        headers["X-Next-Cursor"] = encode_cursor(grievances[-1])
     
-    # Sort by created_at descending (newest first)
-    grievances.sort(key=lambda g: g.created_at, reverse=True)
-    return grievances
+    if projection is None:
+        response.headers.update(headers)
+        return grievances
+    return JSONResponse(
+        content=[g.model_dump(mode="json", include=projection) for g in grievances],
+        headers=headers
+    )
 
 
 @router.get("/complaints/{complaint_id}")
@@ -126,9 +150,10 @@ async def assign_complaint(
         raise HTTPException(status_code=404, detail="Complaint not found")
     
     # Update grievance fields
-    grievance.department = request.department
+    fields = {"department": request.department}
     if request.area:
-        grievance.location = request.area
+        fields["location"] = request.area
+    data_store.update_grievance(complaint_id, **fields)
     
     # Update status to assigned if still submitted
     if grievance.status == Status.SUBMITTED:
@@ -193,21 +218,16 @@ async def update_grievance_status_legacy(
 async def get_analytics(admin: dict = Depends(require_admin)):
     """
     Get dashboard analytics (Admin only).
+    Counts come from the store's incrementally maintained counters.
     """
-    grievances = data_store.get_all_grievances()
-    
-    by_status = {"submitted": 0, "assigned": 0, "in_progress": 0, "resolved": 0}
-    by_priority = {"high": 0, "medium": 0, "low": 0}
-    by_category = {}
-    by_department = {}
+    counts = data_store.get_counts()
     
-    for g in grievances:
-        by_status[g.status.value] = by_status.get(g.status.value, 0) + 1
-        by_priority[g.priority.value] = by_priority.get(g.priority.value, 0) + 1
-        by_category[g.category.value] = by_category.get(g.category.value, 0) + 1
-        by_department[g.department] = by_department.get(g.department, 0) + 1
+    by_status = {"submitted": 0, "assigned": 0, "in_progress": 0, "resolved": 0, **counts["by_status"]}
+    by_priority = {"high": 0, "medium": 0, "low": 0, **counts["by_priority"]}
+    by_category = counts["by_category"]
+    by_department = counts["by_department"]
     
-    total = len(grievances)
+    total = counts["total"]
     resolved = by_status.get("resolved", 0)
     pending = total - resolved
     
@@ -224,25 +244,45 @@ async def get_analytics(admin: dict = Depends(require_admin)):
     )
 
 
+@router.get("/keyword-rules")
+async def get_keyword_rules(admin: dict = Depends(require_admin)):
+    """
+    Active keyword rules and, per table, how many texts each keyword matched
+    since they were loaded (counts are per worker process).
+    """
+    rules = keyword_rules.current()
+    tables = rules.hit_counts()
+    never_fired = sorted({kw for counts in tables.values() for kw, n in counts.items() if n == 0})
+    return {
+        **keyword_rules.status(),
+        "hit_counts": tables,
+        "never_fired": never_fired
+    }
+
+
+@router.post("/keyword-rules/reload")
+async def reload_keyword_rules(admin: dict = Depends(require_admin)):
+    """Load the keyword rules file now instead of waiting for the next check"""
+    try:
+        keyword_rules.reload()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid keyword rules: {e}")
+    return {"success": True, **keyword_rules.status()}
+
+
 # Keep legacy stats endpoint
 @router.get("/stats")
 async def get_stats():
     """Legacy stats endpoint for backward compatibility."""
-    grievances = data_store.get_all_grievances()
+    counts = data_store.get_counts()
     
     stats = {
-        "total": len(grievances),
-        "by_status": {"submitted": 0, "assigned": 0, "in_progress": 0, "resolved": 0},
-        "by_priority": {"high": 0, "medium": 0, "low": 0},
-        "by_category": {}
+        "total": counts["total"],
+        "by_status": {"submitted": 0, "assigned": 0, "in_progress": 0, "resolved": 0, **counts["by_status"]},
+        "by_priority": {"high": 0, "medium": 0, "low": 0, **counts["by_priority"]},
+        "by_category": counts["by_category"]
     }
     
-    for g in grievances:
-        stats["by_status"][g.status.value] += 1
-        stats["by_priority"][g.priority.value] += 1
-        cat = g.category.value
-        stats["by_category"][cat] = stats["by_category"].get(cat, 0) + 1
-    
     return stats
 
 
@@ -250,6 +290,4 @@ async def get_stats():
 @router.get("/grievances", response_model=List[Grievance])
 async def get_all_grievances_legacy(authorization: Optional[str] = Header(None)):
     """Legacy endpoint for backward compatibility."""
-    grievances = data_store.get_all_grievances()
-    grievances.sort(key=lambda g: g.created_at, reverse=True)
-    return grievances
+    return data_store.query_grievances()
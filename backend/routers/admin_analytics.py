@@ -1,46 +1,38 @@
-from fastapi import APIRouter, HTTPException, Header, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable, AsyncIterator
+from datetime import datetime, timedelta
 import csv
 import io
+import zlib
+from models.schemas import Grievance
 from storage.data_store import data_store
-from services.auth_utils import get_user_from_token
+from services.auth_context import require_admin
 
 # Create new router for analytics
 router = APIRouter(prefix="/api/admin/analytics", tags=["Admin Analytics"])
 
-def verify_admin_access(authorization: Optional[str] = Header(None)):
-    """
-    Dependency to verify admin access.
-    Duplicate of logic in admin.py to ensure isolation and valid imports.
-    """
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
-    
-    # Allow demo token
-    if token == "admin-demo-token-2024" or token == "demo-token":
-        return {"role": "admin", "user_id": "admin"}
-    
-    user = get_user_from_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid token")
-        
-    if user.get("role") != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-        
-    return user
+# Largest number of buckets one trends request may return
+MAX_TREND_BUCKETS = 2000
+
+# Grievances fetched per store query (and streamed per chunk) during export
+EXPORT_PAGE_SIZE = 500
+
+# Default window when `from` is omitted
+DEFAULT_TREND_WINDOW = {"hour": timedelta(hours=48), "day": timedelta(days=30)}
+
+# Shared per-request auth dependency
+verify_admin_access = require_admin
 
 @router.get("/summary")
 async def get_summary(admin: Dict[str, Any] = Depends(verify_admin_access)):
     """Get high-level summary counts"""
-    grievances = data_store.get_all_grievances()
-    total = len(grievances)
+    counts = data_store.get_counts()
+    total = counts["total"]
     
-    # Calculate counts
-    resolved = sum(1 for g in grievances if g.status.value == "resolved")
-    in_progress = sum(1 for g in grievances if g.status.value == "in_progress")
+    resolved = counts["by_status"].get("resolved", 0)
+    in_progress = counts["by_status"].get("in_progress", 0)
     # Pending is everything not resolved
     pending = total - resolved
     
@@ -54,33 +46,70 @@ async def get_summary(admin: Dict[str, Any] = Depends(verify_admin_access)):
 @router.get("/by-department")
 async def get_by_department(admin: Dict[str, Any] = Depends(verify_admin_access)):
     """Get complaints count by department"""
-    grievances = data_store.get_all_grievances()
     dept_counts = {}
     
-    for g in grievances:
-        dept = g.department
+    for dept, count in data_store.get_counts()["by_department"].items():
         if not dept:
             dept = "Unassigned"
-        dept_counts[dept] = dept_counts.get(dept, 0) + 1
+        dept_counts[dept] = dept_counts.get(dept, 0) + count
         
     return dept_counts
 
-@router.get("/export")
-async def export_complaints(admin: Dict[str, Any] = Depends(verify_admin_access)):
-    """Export all complaints as CSV"""
-    grievances = data_store.get_all_grievances()
+def parse_timestamp(value: str, name: str) -> datetime:
+    """Parse an ISO date or datetime query parameter (400 if malformed)"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid '{name}' timestamp; use ISO format.")
+    # Stored timestamps are naive local time
+    return parsed.replace(tzinfo=None)
+
+@router.get("/trends")
+async def get_trends(
+    start: Optional[str] = Query(None, alias="from"),
+    end: Optional[str] = Query(None, alias="to"),
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    admin: Dict[str, Any] = Depends(verify_admin_access)
+):
+    """Grievances created and status transitions per hour or day"""
+    end_time = parse_timestamp(end, "to") if end else datetime.now()
+    if end and len(end) == 10:
+        # A bare end date covers that whole day
+        end_time = end_time.replace(hour=23, minute=59)
+    start_time = parse_timestamp(start, "from") if start else end_time - DEFAULT_TREND_WINDOW[granularity]
+    if start_time > end_time:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'.")
     
+    step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+    if (end_time - start_time) / step >= MAX_TREND_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range too large; at most {MAX_TREND_BUCKETS} buckets.")
+    
+    buckets = data_store.get_trends(granularity, start_time, end_time)
+    for bucket in buckets:
+        departments = {}
+        for dept, count in bucket["by_department"].items():
+            dept = dept or "Unassigned"
+            departments[dept] = departments.get(dept, 0) + count
+        bucket["by_department"] = departments
+    
+    return {
+        "granularity": granularity,
+        "from": buckets[0]["bucket"] if buckets else None,
+        "to": buckets[-1]["bucket"] if buckets else None,
+        "buckets": buckets
+    }
+
+def csv_page(grievances: List[Grievance], header: bool = False) -> str:
+    """CSV rows for one page of grievances, optionally preceded by the header"""
     output = io.StringIO()
     writer = csv.writer(output)
     
-    # Header
-    writer.writerow([
-        "Complaint ID", "Category", "Description", "Location", 
-        "Status", "Priority", "Department", "Created Date", 
-        "Submitter Name", "Submitter Phone"
-    ])
-    
-    # Rows
+    if header:
+        writer.writerow([
+            "Complaint ID", "Category", "Description", "Location", 
+            "Status", "Priority", "Department", "Created Date", 
+            "Submitter Name", "Submitter Phone"
+        ])
     for g in grievances:
         writer.writerow([
             g.id,
@@ -94,13 +123,77 @@ async def export_complaints(admin: Dict[str, Any] = Depends(verify_admin_access)
             g.submitter_name,
             g.submitter_phone or "N/A"
         ])
-        
-    output.seek(0)
+    return output.getvalue()
+
+def ndjson_page(grievances: List[Grievance], header: bool = False) -> str:
+    """One JSON object per line for one page of grievances"""
+    return "".join(g.model_dump_json() + "\n" for g in grievances)
+
+def encode_page(serialize: Callable[..., str], page: List[Grievance], header: bool, compressor=None) -> bytes:
+    """Serialize a page; with a compressor, gzip it and sync-flush so the client sees it right away"""
+    data = serialize(page, header).encode("utf-8")
+    if compressor is not None:
+        data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    return data
+
+async def export_chunks(serialize: Callable[..., str], compress: bool, **filters) -> AsyncIterator[bytes]:
+    """
+    Filtered grievances newest first, one keyset page per chunk.
+    Pages are read on the event loop like every other store read; only
+    serialization and compression run in the threadpool.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    after = None
+    header = True
+    while True:
+        page = data_store.query_grievances(**filters, sort="newest", limit=EXPORT_PAGE_SIZE, after=after)
+        data = await run_in_threadpool(encode_page, serialize, page, header, compressor)
+        if data:
+            yield data
+        header = False
+        if len(page) < EXPORT_PAGE_SIZE:
+            break
+        after = (page[-1].created_at, page[-1].id)
+    if compressor is not None:
+        yield compressor.flush()
+
+@router.get("/export")
+async def export_complaints(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    compress: Optional[str] = Query(None, pattern="^gzip$"),
+    category: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    area: Optional[str] = Query(None),
+    search: Optional[str] = Query(None),
+    admin: Dict[str, Any] = Depends(verify_admin_access)
+):
+    """
+    Export complaints as CSV or NDJSON, optionally gzip-compressed.
+    Takes the same filters as the admin complaint list and streams rows
+    as they are read, so memory use does not grow with the export size.
+    """
+    if export_format == "ndjson":
+        serialize = ndjson_page
+        media_type = "application/x-ndjson"
+        filename = "complaints_export.ndjson"
+    else:
+        serialize = csv_page
+        media_type = "text/csv"
+        filename = "complaints_export.csv"
     
+    if compress == "gzip":
+        media_type = "application/gzip"
+        filename += ".gz"
+    
+    body = export_chunks(
+        serialize, compress == "gzip",
+        category=category, priority=priority, status=status, area=area, search=search
+    )
     return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
+        body,
+        media_type=media_type,
         headers={
-            "Content-Disposition": "attachment; filename=complaints_export.csv"
+            "Content-Disposition": f"attachment; filename={filename}"
         }
     )
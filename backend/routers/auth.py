@@ -4,11 +4,22 @@ JWT Authentication Routes
 from fastapi import APIRouter, HTTPException, Depends, Header
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from services.auth_utils import hash_password, verify_password, create_access_token, get_user_from_token
+from services.auth_utils import hash_password_async, verify_password_async, create_access_token
+from services.auth_context import get_optional_user
+from services.password_pool import PasswordPoolSaturated
 from storage.user_store import get_user_by_email, create_user
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
+
+def auth_busy() -> HTTPException:
+    """503 returned when the bcrypt pool is saturated"""
+    return HTTPException(
+        status_code=503,
+        detail="Authentication is busy, please retry shortly.",
+        headers={"Retry-After": "1"}
+    )
+
 # Request/Response Models
 class RegisterRequest(BaseModel):
     email: EmailStr
@@ -62,7 +73,7 @@ async def register(request: RegisterRequest):
             )
         
         # Create user
-        hashed = hash_password(request.password)
+        hashed = await hash_password_async(request.password)
         user = create_user(request.email, hashed, request.name, "user")
         
         # Create token
@@ -84,6 +95,8 @@ async def register(request: RegisterRequest):
                 "role": user["role"]
             }
         )
+    except PasswordPoolSaturated:
+        raise auth_busy()
     except Exception as e:
         return AuthResponse(
             success=False,
@@ -103,7 +116,7 @@ async def login(request: LoginRequest):
                 message="Invalid email or password"
             )
         
-        if not verify_password(request.password, user["password"]):
+        if not await verify_password_async(request.password, user["password"]):
             return AuthResponse(
                 success=False,
                 message="Invalid email or password"
@@ -128,6 +141,8 @@ async def login(request: LoginRequest):
                 "role": user["role"]
             }
         )
+    except PasswordPoolSaturated:
+        raise auth_busy()
     except Exception as e:
         return AuthResponse(
             success=False,
@@ -148,7 +163,12 @@ async def admin_login(request: AdminLoginRequest):
     email = email_map.get(request.username, request.username)
     user = get_user_by_email(email)
     
-    if user and verify_password(request.password, user["password"]):
+    try:
+        verified = user is not None and await verify_password_async(request.password, user["password"])
+    except PasswordPoolSaturated:
+        raise auth_busy()
+    
+    if verified:
         token = create_access_token({
             "sub": user["id"],
             "email": user["email"],
@@ -177,15 +197,14 @@ async def admin_login(request: AdminLoginRequest):
 
 
 @router.get("/me", response_model=AuthResponse)
-async def get_current_user(authorization: Optional[str] = Header(None)):
+async def get_current_user(
+    authorization: Optional[str] = Header(None),
+    user_data: Optional[dict] = Depends(get_optional_user)
+):
     """Get current logged-in user from token"""
     if not authorization:
         return AuthResponse(success=False, message="No authorization header")
     
-    # Extract token from "Bearer <token>"
-    token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
-    
-    user_data = get_user_from_token(token)
     if user_data:
         return AuthResponse(
             success=True,
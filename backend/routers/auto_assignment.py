@@ -32,16 +32,15 @@ def sync_complaints_to_queue():
     Analyzes complaints that don't have auto-assignment data yet.
     This ensures existing complaints appear in the Auto Assign page.
     """
-    all_grievances = data_store.get_all_grievances()
+    # Only process SUBMITTED complaints that are not yet assigned
+    submitted = data_store.filter_grievances(status=Status.SUBMITTED)
+    # One read of the queued IDs rather than a lookup per complaint
+    queued = set(auto_assignment_store.assignments)
     synced_count = 0
     
-    for grievance in all_grievances:
-        # Only process SUBMITTED complaints that are not yet assigned
-        if grievance.status != Status.SUBMITTED:
-            continue
-        
+    for grievance in submitted:
         # Skip if already has auto-assignment data
-        if grievance.id in auto_assignment_store.assignments:
+        if grievance.id in queued:
             continue
         
         # Analyze and create auto-assignment data
@@ -98,11 +97,9 @@ async def get_auto_assignment_queue(
     config = auto_assignment_store.get_config()
     filter_days = days if days is not None else config.review_window_days
     
-    # Get all grievances
-    all_grievances = data_store.get_all_grievances()
-    
-    # Get all auto-assignment data
-    all_assignments = auto_assignment_store.assignments
+    # Get all auto-assignment data, then their grievances in one lookup
+    all_assignments = dict(auto_assignment_store.assignments.items())
+    all_grievances = data_store.get_grievances(all_assignments)
     
     queue_items = []
     pending_count = 0
@@ -113,10 +110,6 @@ async def get_auto_assignment_queue(
     cutoff_date = now - timedelta(days=filter_days)
     
     for grievance in all_grievances:
-        # Check if this grievance has auto-assignment data
-        if grievance.id not in all_assignments:
-            continue
-        
         auto_data = all_assignments[grievance.id]
         
         # Apply filters
@@ -258,10 +251,8 @@ async def approve_assignment(
     # Update auto-assignment status
     auto_assignment_store.update_auto_status(complaint_id, AutoAssignmentStatus.APPROVED)
     
-    # Update grievance department and status
-    grievance.department = request.department
-    grievance.status = Status.ASSIGNED
-    grievance.updated_at = datetime.now().isoformat()
+    # Update grievance department (status is set below with the timeline entry)
+    data_store.update_grievance(complaint_id, department=request.department)
     
     # Add timeline entry
     remarks = f"Auto-assigned to {request.department} (AI confidence: {auto_data.confidence_score}%)"
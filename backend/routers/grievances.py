@@ -1,7 +1,8 @@
 """
 Grievance API Routes
 """
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Header
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Header, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional
 from datetime import datetime
 import base64
@@ -14,26 +15,45 @@ from models.schemas import (
     DuplicateCheckRequest,
     DuplicateCheckResponse,
     ClassificationResult,
+    ClassifyBatchRequest,
+    ClassifyBatchResponse,
+    NearbyGrievance,
+    NearbyGrievancesResponse,
     Status,
     TimelineEntry,
     GrievanceCategory
 )
 from storage.data_store import data_store
 from storage.auto_assignment_store import auto_assignment_store
+from storage.blob_store import blob_store
 from services.ai_classifier import classify_grievance
+from services.batch_classifier import classify_batch
+from services.classification_preview import classification_preview
 from services.duplicate_checker import check_duplicates
-from services.auth_utils import get_user_from_token
+from services.auth_context import get_optional_user
 from services.auto_categorizer import analyze_grievance_for_auto_assignment
+from services.text_features import analyze_text
 from models.auto_assignment_schemas import AutoAssignmentData, AutoAssignmentStatus
 
 router = APIRouter(prefix="/api/grievances", tags=["Grievances"])
 
+# Largest accepted /classify-batch request
+MAX_CLASSIFY_BATCH = int(os.environ.get("CLASSIFY_BATCH_MAX_ITEMS", "5000"))
+
+# Largest radius (meters) accepted by /nearby
+MAX_NEARBY_RADIUS_METERS = float(os.environ.get("NEARBY_MAX_RADIUS_METERS", "5000"))
+
 
 @router.post("/classify", response_model=ClassificationResult)
-async def classify_complaint(description: str, category: GrievanceCategory):
+async def classify_complaint(
+    description: str,
+    category: GrievanceCategory,
+    x_preview_session: Optional[str] = Header(None)
+):
     """
     Classify a grievance description and return AI analysis.
-    Used for real-time preview before submission.
+    Used for real-time preview before submission; results are memoized, and
+    with an X-Preview-Session header each keystroke only scans the new text.
     """
     # Validate description
     if not description or len(description.strip()) < 20:
@@ -42,10 +62,36 @@ async def classify_complaint(description: str, category: GrievanceCategory):
             detail="Description must be at least 20 characters long."
         )
     
-    result = classify_grievance(description, category)
+    result = classification_preview.classify(description, category, x_preview_session)
     return result
 
 
+@router.post("/classify-batch", response_model=ClassifyBatchResponse)
+async def classify_complaints_batch(request: ClassifyBatchRequest):
+    """
+    Classify many descriptions at once (e.g. re-triaging an imported backlog).
+    Each result is the same as /classify would return for that item.
+    """
+    if len(request.items) > MAX_CLASSIFY_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_CLASSIFY_BATCH} items per batch."
+        )
+    
+    for index, item in enumerate(request.items):
+        if not item.description or len(item.description.strip()) < 20:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Item {index}: description must be at least 20 characters long."
+            )
+    
+    # CPU-bound: keep it off the event loop
+    results = await run_in_threadpool(
+        classify_batch, [(item.description, item.category) for item in request.items]
+    )
+    return ClassifyBatchResponse(results=results, count=len(results))
+
+
 @router.post("/check-duplicate", response_model=DuplicateCheckResponse)
 async def check_duplicate(request: DuplicateCheckRequest):
     """
@@ -58,32 +104,28 @@ async def check_duplicate(request: DuplicateCheckRequest):
             detail="Description must be at least 20 characters long."
         )
     
-    existing = data_store.get_descriptions_for_category(request.category.value)
-    # Pass location if available (from extended request)
-    location = getattr(request, 'location', '')
+    # Pass location and coordinates if available
     result = check_duplicates(
         request.description, 
         request.category, 
-        existing,
-        new_location=location
+        new_location=request.location or "",
+        index=data_store.get_duplicate_index(),
+        new_lat=request.lat,
+        new_lng=request.lng,
+        spatial=data_store.get_spatial_index()
     )
     return result
 
 
 @router.post("", response_model=GrievanceResponse)
-async def submit_grievance(submission: GrievanceSubmission, authorization: Optional[str] = Header(None)):
+async def submit_grievance(submission: GrievanceSubmission, user: Optional[dict] = Depends(get_optional_user)):
     """
     Submit a new grievance.
     Performs AI classification and duplicate check.
     Optionally links to authenticated user if token provided.
     """
-    # Extract user_id from token if authenticated
-    user_id = None
-    if authorization:
-        token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
-        user_data = get_user_from_token(token)
-        if user_data:
-            user_id = user_data.get("user_id")
+    # Link to the signed-in user, if any
+    user_id = user.get("user_id") if user else None
     
     # Validate inputs
     if not submission.description or len(submission.description.strip()) < 20:
@@ -98,28 +140,35 @@ async def submit_grievance(submission: GrievanceSubmission, authorization: Optio
             detail="Location is required."
         )
     
+    # Analyze the text once for classification, duplicates and auto-assignment
+    features = analyze_text(submission.description)
+    
     # Classify the grievance
-    classification = classify_grievance(submission.description, submission.category)
+    classification = classify_grievance(submission.description, submission.category, features)
     
     # Check for duplicates with location
-    existing = data_store.get_descriptions_for_category(submission.category.value)
     duplicate_check = check_duplicates(
         submission.description, 
         submission.category, 
-        existing,
-        new_location=submission.location
+        new_location=submission.location,
+        features=features,
+        index=data_store.get_duplicate_index(),
+        new_lat=submission.lat,
+        new_lng=submission.lng,
+        spatial=data_store.get_spatial_index()
     )
     
     # Generate complaint ID
     complaint_id = data_store.generate_id()
     
-    # Handle image - store base64 data for preview
+    # Handle image - decode once into the content-addressed blob store
     image_path = None
-    image_data = None
+    image_hash = None
     if submission.image_base64:
-        # Store the base64 data directly for demo (in production, save to file system)
-        image_path = f"uploads/{complaint_id}.jpg"
-        image_data = submission.image_base64
+        try:
+            image_hash, image_path = blob_store.put_base64(submission.image_base64)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid image data.")
     
     # Handle audio - PREFER pre-uploaded path from media API
     audio_path = submission.audio_path
@@ -151,7 +200,7 @@ async def submit_grievance(submission: GrievanceSubmission, authorization: Optio
         description=submission.description,
         location=submission.location,
         image_path=image_path,
-        image_data=image_data,
+        image_hash=image_hash,
         audio_path=audio_path,
         submitter_name=submission.submitter_name or "Anonymous",
         submitter_phone=submission.submitter_phone,
@@ -168,7 +217,8 @@ async def submit_grievance(submission: GrievanceSubmission, authorization: Optio
         keywords_found=classification.keywords_found,
         is_duplicate=duplicate_check.is_duplicate,
         similar_to=duplicate_check.similar_complaint_id,
-        duplicate_score=duplicate_check.similarity_score,
+        # Only a duplicate's score is kept; sub-threshold scores are not comparable
+        duplicate_score=duplicate_check.similarity_score if duplicate_check.is_duplicate else 0.0,
         timeline=[
             TimelineEntry(
                 status=Status.SUBMITTED,
@@ -187,7 +237,8 @@ async def submit_grievance(submission: GrievanceSubmission, authorization: Optio
     try:
         auto_category, suggested_dept, confidence = analyze_grievance_for_auto_assignment(
             submission.description,
-            classification.detected_category
+            classification.detected_category,
+            features
         )
         
         auto_data = AutoAssignmentData(
@@ -213,6 +264,38 @@ async def submit_grievance(submission: GrievanceSubmission, authorization: Optio
     )
 
 
+@router.get("/nearby", response_model=NearbyGrievancesResponse)
+async def get_nearby_grievances(
+    lat: float = Query(..., ge=-90.0, le=90.0),
+    lng: float = Query(..., ge=-180.0, le=180.0),
+    radius: float = Query(200.0, gt=0, le=MAX_NEARBY_RADIUS_METERS),
+    category: Optional[GrievanceCategory] = Query(None),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """
+    Grievances within `radius` meters of a point, nearest first.
+    """
+    nearby = data_store.get_nearby(
+        lat, lng, radius, category=category.value if category else None, limit=limit
+    )
+    results = [
+        NearbyGrievance(
+            id=g.id,
+            category=g.category,
+            description=g.description,
+            location=g.location,
+            lat=g.lat,
+            lng=g.lng,
+            status=g.status,
+            priority=g.priority,
+            created_at=g.created_at,
+            distance_meters=round(distance, 1)
+        )
+        for g, distance in nearby
+    ]
+    return NearbyGrievancesResponse(results=results, count=len(results))
+
+
 @router.get("/{grievance_id}", response_model=Grievance)
 async def get_grievance(grievance_id: str):
     """
@@ -0,0 +1,65 @@
+"""
+Incident API Routes - Admin view of grievances clustered into incidents
+"""
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+
+from models.schemas import GrievanceCategory, Incident, IncidentListResponse, IncidentDetail
+from storage.data_store import data_store
+from services.incident_clustering import incident_clusterer
+from routers.admin import require_admin
+
+router = APIRouter(prefix="/api/admin/incidents", tags=["Incidents"])
+
+
+@router.get("", response_model=IncidentListResponse)
+async def list_incidents(
+    category: Optional[GrievanceCategory] = Query(None),
+    min_size: int = Query(2, ge=1),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    admin: dict = Depends(require_admin)
+):
+    """
+    Incidents from the latest clustering run, largest first.
+    """
+    generated_at, incidents = incident_clusterer.incidents()
+    matching = [
+        incident for incident in incidents
+        if incident["size"] >= min_size and (category is None or incident["category"] == category.value)
+    ]
+    page = [Incident(**incident) for incident in matching[offset:offset + limit]]
+    return IncidentListResponse(incidents=page, count=len(page), total=len(matching), generated_at=generated_at)
+
+
+@router.get("/status")
+async def get_clustering_status(admin: dict = Depends(require_admin)):
+    """
+    Whether the clustering job is running, and the outcome of its last run.
+    """
+    return incident_clusterer.status()
+
+
+@router.post("/recluster", status_code=202)
+async def recluster_incidents(admin: dict = Depends(require_admin)):
+    """
+    Start a clustering run over all grievances in the background.
+    """
+    if not incident_clusterer.start(data_store):
+        raise HTTPException(status_code=409, detail="Incident clustering is already running.")
+    return {"success": True, "message": "Incident clustering started."}
+
+
+@router.get("/{incident_id}", response_model=IncidentDetail)
+async def get_incident(incident_id: str, admin: dict = Depends(require_admin)):
+    """
+    An incident with its grievances.
+    """
+    incident = incident_clusterer.get(incident_id.strip().upper())
+    if not incident:
+        raise HTTPException(status_code=404, detail=f"Incident {incident_id} not found.")
+    grievances = [
+        grievance for grievance in (data_store.get_grievance(gid) for gid in incident["grievance_ids"])
+        if grievance is not None
+    ]
+    return IncidentDetail(incident=Incident(**incident), grievances=grievances)
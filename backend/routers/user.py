@@ -1,30 +1,19 @@
 """
 User Routes - Protected endpoints for citizen dashboard
 """
-from fastapi import APIRouter, HTTPException, Header, Depends
-from typing import Optional, List
+from fastapi import APIRouter, HTTPException, Depends
+from typing import List
 from pydantic import BaseModel
 
 from storage.data_store import data_store
 from models.schemas import Grievance
-from services.auth_utils import get_user_from_token
+from services.auth_context import require_user
 
 router = APIRouter(prefix="/api/user", tags=["User Dashboard"])
 
 
-def get_current_user(authorization: Optional[str] = Header(None)):
-    """Dependency to get current user from JWT token"""
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    # Extract token from "Bearer <token>"
-    token = authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
-    
-    user = get_user_from_token(token)
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid or expired token")
-    
-    return user
+# Shared per-request auth dependency: any signed-in user
+get_current_user = require_user
 
 
 class UserComplaintSummary(BaseModel):
@@ -57,8 +46,7 @@ async def get_user_complaints(user: dict = Depends(get_current_user)):
     
     # Also check by email if user_id not found (for backward compatibility)
     if not grievances and user.get("email"):
-        all_grievances = data_store.get_all_grievances()
-        grievances = [g for g in all_grievances if g.submitter_email == user.get("email")]
+        grievances = data_store.get_grievances_by_email(user.get("email"))
     
     # Convert to summary format
     complaints = [
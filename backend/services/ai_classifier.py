@@ -2,10 +2,16 @@
 Rule-based AI Classifier for Grievances
 Simple keyword matching for category and priority detection
 """
-from typing import List, Tuple
+from typing import List, Optional, Tuple, TYPE_CHECKING
 from models.schemas import GrievanceCategory, Priority, ClassificationResult
+from services.keyword_matcher import KeywordHits
+from services.keyword_rules import keyword_rules, RuleSet
 
+if TYPE_CHECKING:
+    from services.text_features import TextFeatures
 
+
+# Built-in keyword tables (overridable through the keyword rules file)
 # Category keywords mapping
 CATEGORY_KEYWORDS = {
     GrievanceCategory.ROAD: [
@@ -63,20 +69,33 @@ DEPARTMENT_MAPPING = {
 }
 
 
-def classify_grievance(description: str, selected_category: GrievanceCategory) -> ClassificationResult:
+def classify_grievance(
+    description: str,
+    selected_category: GrievanceCategory,
+    features: Optional["TextFeatures"] = None
+) -> ClassificationResult:
     """
     Classify grievance based on description text.
     Uses rule-based keyword matching for explainable AI.
+    Pass the description's TextFeatures to reuse its keyword scan.
     """
-    description_lower = description.lower()
-    
+    if features is not None:
+        rules, hits = features.rules, features.hits
+    else:
+        rules = keyword_rules.current()
+        hits = rules.classifier.scan(description.lower())
+    return classify_hits(hits, selected_category, rules)
+
+
+def classify_hits(hits: KeywordHits, selected_category: GrievanceCategory, rules: RuleSet) -> ClassificationResult:
+    """Classify from a scan of the lower-cased description by rules.classifier (or rules.text)"""
     # Detect category from text (may override user selection if strong match)
     detected_category = selected_category
     category_keywords_found = []
     max_category_matches = 0
     
-    for category, keywords in CATEGORY_KEYWORDS.items():
-        matches = [kw for kw in keywords if kw in description_lower]
+    for category in rules.category_keywords:
+        matches = hits.matches(("category", category))
         if len(matches) > max_category_matches:
             max_category_matches = len(matches)
             detected_category = category
@@ -91,19 +110,19 @@ def classify_grievance(description: str, selected_category: GrievanceCategory) -
     priority_keywords_found = []
     
     # Check high priority first
-    high_matches = [kw for kw in PRIORITY_KEYWORDS[Priority.HIGH] if kw in description_lower]
+    high_matches = hits.matches(("priority", Priority.HIGH))
     if high_matches:
         priority = Priority.HIGH
         priority_keywords_found = high_matches
     else:
         # Check medium priority
-        medium_matches = [kw for kw in PRIORITY_KEYWORDS[Priority.MEDIUM] if kw in description_lower]
+        medium_matches = hits.matches(("priority", Priority.MEDIUM))
         if medium_matches:
             priority = Priority.MEDIUM
             priority_keywords_found = medium_matches
         else:
             # Check low priority
-            low_matches = [kw for kw in PRIORITY_KEYWORDS[Priority.LOW] if kw in description_lower]
+            low_matches = hits.matches(("priority", Priority.LOW))
             priority_keywords_found = low_matches
     
     # Combine all found keywords
@@ -0,0 +1,118 @@
+"""
+Per-request authentication
+The Authorization header is resolved to a principal once per request and
+kept on request.state; the role dependencies below all reuse that result
+instead of parsing and verifying the token again.
+"""
+from fastapi import Depends, Header, HTTPException, Request
+from typing import Callable, Dict, Optional
+import threading
+import time
+
+from services.auth_utils import get_user_from_token
+
+# Legacy demo tokens: accepted for admin endpoints only
+DEMO_TOKENS = ("admin-demo-token-2024", "demo-token")
+DEMO_ADMIN = {"user_id": "admin", "email": "admin@civicsense.gov.in", "role": "admin", "name": "Admin"}
+
+
+def extract_token(authorization: Optional[str]) -> Optional[str]:
+    """Token from an "Authorization: Bearer <token>" (or bare token) header"""
+    if not authorization:
+        return None
+    return authorization.replace("Bearer ", "") if authorization.startswith("Bearer ") else authorization
+
+
+class AuthMetrics:
+    """How long token resolution takes, and how it turns out"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.resolutions = 0
+        self.outcomes: Dict[str, int] = {}
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def record(self, outcome: str, elapsed_ms: float):
+        with self._lock:
+            self.resolutions += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            return {
+                "resolutions": self.resolutions,
+                "outcomes": dict(self.outcomes),
+                "avg_ms": round(self._total_ms / self.resolutions, 4) if self.resolutions else 0,
+                "max_ms": round(self._max_ms, 4)
+            }
+
+
+# Singleton instance
+auth_metrics = AuthMetrics()
+
+
+def get_principal(request: Request, authorization: Optional[str] = Header(None)) -> Optional[dict]:
+    """
+    The caller's principal (None if anonymous or the token is invalid).
+    Resolved once per request; sets request.state.principal and
+    request.state.principal_is_demo.
+    """
+    if hasattr(request.state, "principal"):
+        return request.state.principal
+
+    start = time.perf_counter()
+    token = extract_token(authorization)
+    principal = None
+    is_demo = False
+    if token is None:
+        outcome = "anonymous"
+    elif token in DEMO_TOKENS:
+        principal = dict(DEMO_ADMIN)
+        is_demo = True
+        outcome = "demo"
+    else:
+        principal = get_user_from_token(token)
+        outcome = "valid" if principal else "invalid"
+    auth_metrics.record(outcome, (time.perf_counter() - start) * 1000)
+
+    request.state.principal = principal
+    request.state.principal_is_demo = is_demo
+    return principal
+
+
+def get_optional_user(request: Request, principal: Optional[dict] = Depends(get_principal)) -> Optional[dict]:
+    """The signed-in user, or None (demo tokens do not identify a user)"""
+    if principal is None or request.state.principal_is_demo:
+        return None
+    return principal
+
+
+def _unauthenticated(request: Request) -> HTTPException:
+    if request.headers.get("authorization"):
+        return HTTPException(status_code=401, detail="Invalid or expired token")
+    return HTTPException(status_code=401, detail="Not authenticated")
+
+
+def require_user(request: Request, user: Optional[dict] = Depends(get_optional_user)) -> dict:
+    """Dependency: any signed-in user (401 otherwise)"""
+    if user is None:
+        raise _unauthenticated(request)
+    return user
+
+
+def require_role(role: str) -> Callable[..., dict]:
+    """Dependency factory: a principal with the given role (401/403 otherwise)"""
+    def dependency(request: Request, principal: Optional[dict] = Depends(get_principal)) -> dict:
+        if principal is None:
+            raise _unauthenticated(request)
+        if principal.get("role") != role:
+            raise HTTPException(status_code=403, detail=f"{role.capitalize()} access required")
+        return principal
+    dependency.__name__ = f"require_{role}"
+    return dependency
+
+
+require_admin = require_role("admin")
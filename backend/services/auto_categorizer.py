@@ -3,10 +3,16 @@ Auto Categorization Engine for Grievances
 Rule-based NLP/Keyword analysis for department suggestion
 Designed to be extensible for future ML model integration
 """
-from typing import Tuple, List
+from typing import Tuple, List, Optional, TYPE_CHECKING
 from models.schemas import GrievanceCategory
+from services.keyword_matcher import KeywordHits
+from services.keyword_rules import keyword_rules, RuleSet
 
+if TYPE_CHECKING:
+    from services.text_features import TextFeatures
 
+
+# Built-in keyword tables (overridable through the keyword rules file)
 # Department keywords mapping - more granular than category keywords
 DEPARTMENT_KEYWORDS = {
     "Public Works Department (PWD)": {
@@ -88,13 +94,39 @@ CATEGORY_DEFAULT_DEPARTMENT = {
     GrievanceCategory.OTHERS: "General Administration"
 }
 
+# Category keywords used to refine the user's category selection
+CATEGORY_TEXT_KEYWORDS = {
+    GrievanceCategory.ROAD: [
+        "road", "pothole", "street", "highway", "footpath", "bridge",
+        "flyover", "traffic light", "signal", "pavement"
+    ],
+    GrievanceCategory.WATER: [
+        "water", "pipe", "leakage", "tap", "drain", "sewage",
+        "borewell", "drinking water", "water supply"
+    ],
+    GrievanceCategory.ELECTRICITY: [
+        "electricity", "power", "light", "pole", "transformer",
+        "power cut", "street light", "meter"
+    ],
+    GrievanceCategory.SANITATION: [
+        "garbage", "waste", "dustbin", "cleaning", "toilet",
+        "sanitation", "mosquito", "filth", "smell"
+    ],
+    GrievanceCategory.HEALTH_SAFETY: [
+        "hospital", "health", "clinic", "danger", "unsafe",
+        "accident", "emergency", "fire", "safety"
+    ]
+}
+
 
 def analyze_grievance_for_auto_assignment(
     description: str,
-    category: GrievanceCategory
+    category: GrievanceCategory,
+    features: Optional["TextFeatures"] = None
 ) -> Tuple[GrievanceCategory, str, float]:
     """
     Analyze grievance text to determine category and department.
+    Pass the description's TextFeatures to reuse its keyword scan.
     
     Returns:
         Tuple of (detected_category, suggested_department, confidence_score)
@@ -102,14 +134,18 @@ def analyze_grievance_for_auto_assignment(
     The confidence score (0-100) indicates how confident the system is
     in its suggestion based on keyword matches.
     """
-    description_lower = description.lower()
+    if features is not None:
+        rules, description_lower, hits = features.rules, features.normalized, features.hits
+    else:
+        rules = keyword_rules.current()
+        description_lower = description.lower()
+        hits = rules.categorizer.scan(description_lower)
     
     # Score each department based on keyword matches
     department_scores = {}
     
-    for dept_name, dept_info in DEPARTMENT_KEYWORDS.items():
-        keywords = dept_info["keywords"]
-        matches = [kw for kw in keywords if kw in description_lower]
+    for dept_name, dept_info in rules.department_keywords.items():
+        matches = hits.matches(("department", dept_name))
         
         # Calculate score based on number and quality of matches
         base_score = len(matches) * 10
@@ -143,44 +179,32 @@ def analyze_grievance_for_auto_assignment(
         confidence = 40  # Low confidence for fallback
     
     # Detect category from text (may refine user selection)
-    detected_category = detect_category_from_text(description_lower, category)
+    detected_category = detect_category_from_text(description_lower, category, hits, rules)
     
     return detected_category, best_dept_name, confidence
 
 
-def detect_category_from_text(description_lower: str, user_category: GrievanceCategory) -> GrievanceCategory:
+def detect_category_from_text(
+    description_lower: str,
+    user_category: GrievanceCategory,
+    hits: Optional[KeywordHits] = None,
+    rules: Optional[RuleSet] = None
+) -> GrievanceCategory:
     """
     Detect the most appropriate category from text.
     Falls back to user selection if no strong match.
+    Pass hits (from the same rules' matchers) to reuse an existing scan.
     """
-    category_matches = {}
+    if rules is None:
+        rules = keyword_rules.current()
+    if hits is None:
+        hits = rules.categorizer.scan(description_lower)
     
-    category_keywords = {
-        GrievanceCategory.ROAD: [
-            "road", "pothole", "street", "highway", "footpath", "bridge",
-            "flyover", "traffic light", "signal", "pavement"
-        ],
-        GrievanceCategory.WATER: [
-            "water", "pipe", "leakage", "tap", "drain", "sewage",
-            "borewell", "drinking water", "water supply"
-        ],
-        GrievanceCategory.ELECTRICITY: [
-            "electricity", "power", "light", "pole", "transformer",
-            "power cut", "street light", "meter"
-        ],
-        GrievanceCategory.SANITATION: [
-            "garbage", "waste", "dustbin", "cleaning", "toilet",
-            "sanitation", "mosquito", "filth", "smell"
-        ],
-        GrievanceCategory.HEALTH_SAFETY: [
-            "hospital", "health", "clinic", "danger", "unsafe",
-            "accident", "emergency", "fire", "safety"
-        ]
-    }
-    
-    for cat, keywords in category_keywords.items():
-        matches = sum(1 for kw in keywords if kw in description_lower)
-        category_matches[cat] = matches
+    category_matches = {}
+    for cat in rules.category_text_keywords:
+        category_matches[cat] = hits.count(("category_text", cat))
+    if not category_matches:
+        return user_category
     
     best_cat = max(category_matches.items(), key=lambda x: x[1])
     
@@ -193,4 +217,4 @@ def detect_category_from_text(description_lower: str, user_category: GrievanceCa
 
 def get_all_departments() -> List[str]:
     """Return list of all available departments for assignment."""
-    return list(DEPARTMENT_KEYWORDS.keys())
+    return list(keyword_rules.current().department_keywords.keys())
@@ -0,0 +1,97 @@
+"""
+Batch classification
+Scores many descriptions together: each text is scanned once, the hits
+go into a (texts x keywords) matrix, and category and priority match
+counts for all texts come from one matrix product with the
+(keywords x tables) membership matrix. The decision rules are those of
+classify_grievance, so every item gets the same result as a single call.
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+from models.schemas import GrievanceCategory, Priority, ClassificationResult
+from services.ai_classifier import DEPARTMENT_MAPPING, generate_explanation
+from services.keyword_rules import keyword_rules, RuleSet
+
+# Priority score columns, in the order classify_grievance checks them
+PRIORITY_TABLES = [("priority", priority) for priority in (Priority.HIGH, Priority.MEDIUM, Priority.LOW)]
+
+_membership_cache: Tuple[Optional[RuleSet], Optional[np.ndarray]] = (None, None)
+
+
+def category_tables(rules: RuleSet) -> List[Tuple[str, GrievanceCategory]]:
+    """Category score columns, in the order classify_grievance checks them"""
+    return [("category", category) for category in rules.category_keywords]
+
+
+def membership_matrix(rules: RuleSet) -> np.ndarray:
+    """(keywords x tables) counts of each classifier keyword in each scored table"""
+    global _membership_cache
+    cached_rules, matrix = _membership_cache
+    if cached_rules is rules:
+        return matrix
+    matcher = rules.classifier
+    tables = category_tables(rules) + PRIORITY_TABLES
+    matrix = np.zeros((len(matcher.keywords), len(tables)), dtype=np.int32)
+    for kid, postings in enumerate(matcher.postings):
+        for column, table in enumerate(tables):
+            matrix[kid, column] = len(postings.get(table, ()))
+    _membership_cache = (rules, matrix)
+    return matrix
+
+
+def classify_batch(
+    items: Sequence[Tuple[str, GrievanceCategory]],
+    rules: Optional[RuleSet] = None
+) -> List[ClassificationResult]:
+    """Classify (description, selected_category) pairs; same results as classify_grievance"""
+    if not items:
+        return []
+    if rules is None:
+        rules = keyword_rules.current()
+    matcher = rules.classifier
+    tables = category_tables(rules)
+
+    # Batch classification persists nothing, so it does not count rule hits
+    all_hits = [matcher.scan(description.lower(), record_hits=False) for description, _ in items]
+
+    # Sparse hits -> dense (texts x keywords) indicator matrix
+    rows = [row for row, hits in enumerate(all_hits) for _ in range(len(hits))]
+    cols = [kid for hits in all_hits for kid in hits.keyword_ids()]
+    hit_matrix = np.zeros((len(items), len(matcher.keywords)), dtype=np.int32)
+    hit_matrix[rows, cols] = 1
+
+    scores = hit_matrix @ membership_matrix(rules)
+    category_scores = scores[:, :len(tables)]
+    priority_scores = scores[:, len(tables):]
+
+    # First category with the most matches wins (strict > in classify_grievance)
+    if tables:
+        best_category = category_scores.argmax(axis=1)
+        best_count = category_scores.max(axis=1)
+    else:
+        best_category = best_count = np.zeros(len(items), dtype=np.int32)
+    # First priority level (high, medium, low) with any match; low if none
+    has_priority = priority_scores > 0
+    priority_level = np.where(has_priority.any(axis=1), has_priority.argmax(axis=1), 2)
+
+    results = []
+    for row, (_, selected_category) in enumerate(items):
+        hits = all_hits[row]
+        category_table = tables[best_category[row]] if best_count[row] > 0 else None
+        detected_category = category_table[1] if best_count[row] >= 2 else selected_category
+        category_keywords_found = hits.matches(category_table) if category_table else []
+
+        priority_table = PRIORITY_TABLES[priority_level[row]]
+        priority = priority_table[1] if has_priority[row].any() else Priority.LOW
+        priority_keywords_found = hits.matches(priority_table)
+
+        all_keywords = list(set(category_keywords_found + priority_keywords_found))
+        results.append(ClassificationResult(
+            detected_category=detected_category,
+            priority=priority,
+            department=DEPARTMENT_MAPPING.get(detected_category, "General Administration"),
+            explanation=generate_explanation(detected_category, priority, all_keywords),
+            keywords_found=all_keywords
+        ))
+    return results
@@ -0,0 +1,160 @@
+"""
+Memoized classification for the real-time preview
+The submission form asks for a classification while the citizen types.
+Results are cached by a hash of the normalized text and category, and for
+each preview session the keyword scan of the previous text is kept: when
+the new text extends it (the usual case while typing) only the added
+characters are scanned.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import hashlib
+import os
+import threading
+import time
+
+from models.schemas import GrievanceCategory, ClassificationResult
+from services import ai_classifier
+from services.keyword_matcher import KeywordHits
+from services.keyword_rules import keyword_rules, RuleSet
+
+PREVIEW_CACHE_SIZE = int(os.environ.get("PREVIEW_CACHE_SIZE", "4096"))
+PREVIEW_MAX_SESSIONS = int(os.environ.get("PREVIEW_MAX_SESSIONS", "2048"))
+PREVIEW_SESSION_TTL_SECONDS = float(os.environ.get("PREVIEW_SESSION_TTL_SECONDS", "600"))
+
+
+def preview_key(normalized: str, category: GrievanceCategory, rules: RuleSet) -> str:
+    """Cache key: digest of the normalized text, the selected category and the rules in use"""
+    return hashlib.sha256(f"{rules.fingerprint}\0{category.value}\0{normalized}".encode()).hexdigest()
+
+
+class ClassificationPreview:
+    """LRU of preview results plus the last keyword scan of each session"""
+
+    def __init__(
+        self,
+        cache_size: int = PREVIEW_CACHE_SIZE,
+        max_sessions: int = PREVIEW_MAX_SESSIONS,
+        session_ttl: float = PREVIEW_SESSION_TTL_SECONDS
+    ):
+        self.cache_size = cache_size
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self._results: "OrderedDict[str, ClassificationResult]" = OrderedDict()
+        # session id -> (normalized text, its scan, last use)
+        self._sessions: "OrderedDict[str, Tuple[str, KeywordHits, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.requests = 0
+        self.hits = 0
+        self.resumed_scans = 0
+        self.full_scans = 0
+        self.scanned_chars = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def _session_scan(self, session_id: Optional[str], now: float) -> Optional[Tuple[str, KeywordHits]]:
+        if not session_id:
+            return None
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if now - entry[2] > self.session_ttl:
+                del self._sessions[session_id]
+                return None
+            return entry[0], entry[1]
+
+    def _remember(self, session_id: Optional[str], normalized: str, hits: KeywordHits, now: float):
+        if not session_id:
+            return
+        with self._lock:
+            self._sessions[session_id] = (normalized, hits, now)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def _record(self, start: float, cached: bool):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.requests += 1
+            self.hits += cached
+            self._total_ms += elapsed_ms
+            self._max_ms = max(self._max_ms, elapsed_ms)
+
+    def classify(
+        self,
+        description: str,
+        category: GrievanceCategory,
+        session_id: Optional[str] = None
+    ) -> ClassificationResult:
+        """classify_grievance, served from the cache or resumed from the session's last scan"""
+        start = time.perf_counter()
+        now = time.monotonic()
+        rules = keyword_rules.current()
+        normalized = description.lower()
+        key = preview_key(normalized, category, rules)
+
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+        if result is not None:
+            self._record(start, cached=True)
+            return result.model_copy(deep=True)
+
+        hits = self._scan(normalized, self._session_scan(session_id, now), rules)
+        self._remember(session_id, normalized, hits, now)
+        result = ai_classifier.classify_hits(hits, category, rules)
+
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        self._record(start, cached=False)
+        return result.model_copy(deep=True)
+
+    def _scan(self, normalized: str, previous: Optional[Tuple[str, KeywordHits]], rules: RuleSet) -> KeywordHits:
+        """Scan the text, resuming from the previous scan when it covered a prefix"""
+        matcher = rules.classifier
+        resume = None
+        if previous is not None and previous[1].matcher is matcher and normalized.startswith(previous[0]):
+            resume = previous[1]
+        # Keystrokes are not submissions: keep them out of the rule hit counts
+        hits = matcher.scan(normalized, resume=resume, record_hits=False)
+        with self._lock:
+            if resume is not None and not matcher.word_boundary:
+                self.resumed_scans += 1
+                self.scanned_chars += len(normalized) - resume.length
+            else:
+                self.full_scans += 1
+                self.scanned_chars += len(normalized)
+        return hits
+
+    def clear(self):
+        """Drop cached results and session scans"""
+        with self._lock:
+            self._results.clear()
+            self._sessions.clear()
+
+    def metrics(self) -> Dict:
+        """Cache hit rate, scan reuse and latency"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "cache_hits": self.hits,
+                "hit_rate": round(self.hits / self.requests, 4) if self.requests else 0,
+                "cached_results": len(self._results),
+                "sessions": len(self._sessions),
+                "resumed_scans": self.resumed_scans,
+                "full_scans": self.full_scans,
+                "scanned_chars": self.scanned_chars,
+                "avg_ms": round(self._total_ms / self.requests, 4) if self.requests else 0,
+                "max_ms": round(self._max_ms, 4)
+            }
+
+
+# Singleton instance
+classification_preview = ClassificationPreview()
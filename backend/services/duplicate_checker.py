@@ -2,24 +2,31 @@
 Duplicate Complaint Checker
 Enhanced text similarity with location matching
 """
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
+import os
+
 from models.schemas import DuplicateCheckResponse, GrievanceCategory
+from services.text_features import TextFeatures, tokenize_normalized
+from storage.duplicate_index import DuplicateIndex, LOCATION_BONUS
+from storage.spatial_index import SpatialIndex
+
+# Complaints within this distance (meters) get a location bonus that fades with distance
+DUPLICATE_RADIUS_METERS = float(os.environ.get("DUPLICATE_RADIUS_METERS", "200"))
 
 
 def tokenize(text: str) -> set:
     """Simple tokenization - split into words and normalize"""
-    # Remove punctuation and convert to lowercase
-    cleaned = ''.join(c if c.isalnum() or c.isspace() else ' ' for c in text.lower())
-    # Split and filter short words
-    words = set(w for w in cleaned.split() if len(w) > 2)
-    return words
+    # Remove punctuation, convert to lowercase and filter short words
+    return set(tokenize_normalized(text.lower()))
 
 
 def jaccard_similarity(text1: str, text2: str) -> float:
     """Calculate Jaccard similarity between two texts"""
-    set1 = tokenize(text1)
-    set2 = tokenize(text2)
-    
+    return token_similarity(tokenize(text1), tokenize(text2))
+
+
+def token_similarity(set1: set, set2: set) -> float:
+    """Jaccard similarity of two token sets"""
     if not set1 or not set2:
         return 0.0
     
@@ -29,12 +36,32 @@ def jaccard_similarity(text1: str, text2: str) -> float:
     return intersection / union if union > 0 else 0.0
 
 
+def proximity_bonuses(
+    spatial: Optional[SpatialIndex],
+    lat: Optional[float],
+    lng: Optional[float],
+    radius_meters: float = DUPLICATE_RADIUS_METERS
+) -> Dict[str, float]:
+    """Location bonus of each complaint near (lat, lng): LOCATION_BONUS at 0 m, falling to 0 at the radius"""
+    if spatial is None or lat is None or lng is None or radius_meters <= 0:
+        return {}
+    return {
+        complaint_id: LOCATION_BONUS * (1 - distance / radius_meters)
+        for complaint_id, distance in spatial.within(lat, lng, radius_meters)
+    }
+
+
 def check_duplicates(
     new_description: str,
     category: GrievanceCategory,
-    existing_complaints: List[Tuple[str, str, str]],  # (id, description, location)
+    existing_complaints: Optional[List[Tuple[str, str, str]]] = None,  # (id, description, location)
     new_location: str = "",
-    threshold: float = 0.4
+    threshold: float = 0.4,
+    features: Optional[TextFeatures] = None,
+    index: Optional[DuplicateIndex] = None,
+    new_lat: Optional[float] = None,
+    new_lng: Optional[float] = None,
+    spatial: Optional[SpatialIndex] = None
 ) -> DuplicateCheckResponse:
     """
     Check if a new complaint is similar to existing ones.
@@ -46,27 +73,40 @@ def check_duplicates(
         existing_complaints: List of (id, description, location) tuples
         new_location: Location of new complaint
         threshold: Similarity threshold (0.4 = 40% word overlap)
+        features: TextFeatures of new_description, if already analyzed
+        index: The store's duplicate index (exact or MinHash, per DUPLICATE_ENGINE);
+            when given, existing_complaints is not needed
+        new_lat, new_lng: Coordinates of new complaint, if known
+        spatial: The store's SpatialIndex; complaints within DUPLICATE_RADIUS_METERS
+            of the coordinates get a distance-weighted location bonus
     
     Returns:
-        DuplicateCheckResponse with result
+        DuplicateCheckResponse with result. With an index, a best score
+        below threshold - LOCATION_BONUS is a lower bound: the highest
+        among the grievances the pruned search scored
     """
-    if not existing_complaints:
-        return DuplicateCheckResponse(
-            is_duplicate=False,
-            similarity_score=0.0,
-            message="No similar complaints found. Your grievance is unique."
+    new_tokens = features.token_set if features is not None else tokenize(new_description)
+    nearby = proximity_bonuses(spatial, new_lat, new_lng)
+    
+    if index is not None:
+        # The exact engine is exact for any similarity the location bonus could lift over the threshold
+        floor = max(threshold - LOCATION_BONUS, 0.0)
+        most_similar_id, max_similarity, _ = index.best_match(
+            category, new_tokens, new_location, floor=floor, nearby=nearby
         )
+        return duplicate_response(most_similar_id, max_similarity, threshold)
     
     max_similarity = 0.0
     most_similar_id = None
     
-    for complaint_id, existing_desc, existing_location in existing_complaints:
+    for complaint_id, existing_desc, existing_location in existing_complaints or []:
         # Calculate text similarity
-        text_similarity = jaccard_similarity(new_description, existing_desc)
+        text_similarity = token_similarity(new_tokens, tokenize(existing_desc))
         
         # Boost similarity if locations match
-        location_bonus = 0.15 if new_location and existing_location and \
+        location_bonus = LOCATION_BONUS if new_location and existing_location and \
                          new_location.lower() == existing_location.lower() else 0.0
+        location_bonus = max(location_bonus, nearby.get(complaint_id, 0.0))
         
         combined_similarity = min(text_similarity + location_bonus, 1.0)
         
@@ -74,6 +114,11 @@ def check_duplicates(
             max_similarity = combined_similarity
             most_similar_id = complaint_id
     
+    return duplicate_response(most_similar_id, max_similarity, threshold)
+
+
+def duplicate_response(most_similar_id: Optional[str], max_similarity: float, threshold: float) -> DuplicateCheckResponse:
+    """The API response for the best match found"""
     is_duplicate = max_similarity >= threshold
     
     if is_duplicate:
@@ -0,0 +1,330 @@
+"""
+Incident clustering
+Groups grievances that report the same incident ("these 40 complaints are
+one burst water main"). Each category is clustered in its own worker
+process: MinHash/LSH buckets propose candidate pairs, a pair is linked when
+its duplicate score (word Jaccard plus location bonus, as in
+check_duplicates) reaches INCIDENT_THRESHOLD, and connected groups of at
+least INCIDENT_MIN_SIZE grievances become incidents.
+
+The job writes each grievance's incident_id back to the store and the
+incident summaries to INCIDENTS_FILE. Run it from the admin API or with:
+    python -m services.incident_clustering
+"""
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import numpy as np
+
+from models.schemas import GrievanceCategory
+from storage.coordination import atomic_write_json
+from storage.duplicate_index import LOCATION_BONUS, tokenize_normalized
+from storage.minhash_index import MinHasher
+from storage.spatial_index import haversine_meters, valid_coordinates
+
+INCIDENTS_FILE = os.environ.get(
+    "INCIDENTS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "storage", "incidents.json")
+)
+
+# Duplicate score (0-1) at which two grievances belong to the same incident
+INCIDENT_THRESHOLD = float(os.environ.get("INCIDENT_THRESHOLD", "0.4"))
+INCIDENT_MIN_SIZE = int(os.environ.get("INCIDENT_MIN_SIZE", "2"))
+# Grievances this close (meters) get a location bonus that fades with distance
+INCIDENT_RADIUS_METERS = float(os.environ.get("INCIDENT_RADIUS_METERS", "200"))
+# LSH banding for candidate pairs (more bands: more recall, slower)
+INCIDENT_BANDS = int(os.environ.get("INCIDENT_BANDS", "32"))
+INCIDENT_ROWS = int(os.environ.get("INCIDENT_ROWS", "3"))
+# Representatives per LSH bucket each grievance is compared with
+INCIDENT_BUCKET_WINDOW = int(os.environ.get("INCIDENT_BUCKET_WINDOW", "32"))
+# One process per category partition, at most this many at once
+INCIDENT_WORKERS = int(os.environ.get("INCIDENT_WORKERS", os.cpu_count() or 1))
+
+# FNV-1a style mixing of a band's values into one 64-bit bucket key
+_KEY_PRIME = np.uint64(0x100000001B3)
+
+
+def incident_id_for(root_id: str) -> str:
+    """Incident ID derived from its oldest grievance (CSP-20250101-ABC123 -> INC-20250101-ABC123)"""
+    return "INC-" + root_id.split("-", 1)[1] if "-" in root_id else f"INC-{root_id}"
+
+
+def cluster_partition(
+    rows: Sequence[Tuple[str, str, Optional[float], Optional[float]]],
+    threshold: float = INCIDENT_THRESHOLD,
+    radius_meters: float = INCIDENT_RADIUS_METERS,
+    min_size: int = INCIDENT_MIN_SIZE,
+    bands: int = INCIDENT_BANDS,
+    band_rows: int = INCIDENT_ROWS,
+    bucket_window: int = INCIDENT_BUCKET_WINDOW
+) -> List[List[int]]:
+    """
+    Cluster one category's (description, location, lat, lng) rows, given
+    oldest first. Returns clusters as lists of row positions, oldest first.
+    Within an LSH bucket each grievance is compared with the bucket's
+    `bucket_window` most recent representatives only (grievances that did
+    not link to an earlier one): a bucket of identical texts costs one
+    comparison per member, and a bucket formed around common words stays
+    linear. Reports of one incident arrive close together, so little is
+    lost by not looking further back.
+    """
+    count = len(rows)
+    hasher = MinHasher(bands, band_rows)
+    tokens = [frozenset(tokenize_normalized((row[0] or "").lower())) for row in rows]
+    locations = [(row[1] or "").lower() for row in rows]
+    points = [(row[2], row[3]) if valid_coordinates(row[2], row[3]) else None for row in rows]
+
+    signatures = np.zeros((count, hasher.num_perm), dtype=np.uint32)
+    hashed = np.zeros(count, dtype=bool)
+    for i, words in enumerate(tokens):
+        # Over the words themselves: the same sets link() compares
+        signature = hasher.signature_of(words)
+        if signature is not None:
+            signatures[i] = signature
+            hashed[i] = True
+    positions = np.flatnonzero(hashed)
+
+    parent = list(range(count))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def link(older: int, newer: int) -> bool:
+        """Union the two grievances if their duplicate score reaches the threshold"""
+        a, b = tokens[older], tokens[newer]
+        shared = len(a & b)
+        similarity = shared / (len(a) + len(b) - shared) if a and b else 0.0
+        if similarity + LOCATION_BONUS >= threshold:
+            bonus = LOCATION_BONUS if locations[older] and locations[older] == locations[newer] else 0.0
+            if bonus < LOCATION_BONUS and points[older] and points[newer] and radius_meters > 0:
+                distance = haversine_meters(*points[older], *points[newer])
+                if distance <= radius_meters:
+                    bonus = max(bonus, LOCATION_BONUS * (1 - distance / radius_meters))
+            if min(similarity + bonus, 1.0) >= threshold:
+                parent[find(newer)] = find(older)
+                return True
+        return False
+
+    for band in range(bands):
+        block = signatures[positions, band * band_rows:(band + 1) * band_rows].astype(np.uint64)
+        keys = np.zeros(len(positions), dtype=np.uint64)
+        for column in range(block.shape[1]):
+            keys = (keys ^ block[:, column]) * _KEY_PRIME
+        # Stable, so each bucket lists its members oldest first
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(order)]))
+        shared_buckets = np.flatnonzero(ends - starts > 1)
+        for start, end in zip(starts[shared_buckets].tolist(), ends[shared_buckets].tolist()):
+            representatives: Deque[int] = deque(maxlen=bucket_window)
+            for member in positions[order[start:end]].tolist():
+                root = find(member)
+                for representative in reversed(representatives):
+                    if find(representative) == root or link(representative, member):
+                        break
+                else:
+                    representatives.append(member)
+
+    clusters: Dict[int, List[int]] = {}
+    for i in range(count):
+        clusters.setdefault(find(i), []).append(i)
+    return [members for members in clusters.values() if len(members) >= min_size]
+
+
+def summarize(incident_id: str, category: str, rows: List[tuple]) -> Dict[str, Any]:
+    """Incident summary from its (id, description, location, lat, lng, created_at) rows, oldest first"""
+    locations = Counter(row[2] for row in rows if row[2])
+    points = [(row[3], row[4]) for row in rows if valid_coordinates(row[3], row[4])]
+    return {
+        "incident_id": incident_id,
+        "category": category,
+        "size": len(rows),
+        "grievance_ids": [row[0] for row in rows],
+        "location": locations.most_common(1)[0][0] if locations else "",
+        "lat": round(sum(p[0] for p in points) / len(points), 6) if points else None,
+        "lng": round(sum(p[1] for p in points) / len(points), 6) if points else None,
+        "description": rows[0][1],
+        "first_reported": rows[0][5],
+        "last_reported": max(row[5] for row in rows)
+    }
+
+
+class IncidentClusterer:
+    """Runs the clustering job (one at a time) and serves its latest results"""
+
+    def __init__(self, path: str = INCIDENTS_FILE, workers: int = INCIDENT_WORKERS):
+        self.path = path
+        self.workers = max(1, workers)
+        self._lock = threading.Lock()
+        self.running = False
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self._cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _cluster_all(self, partitions: Dict[str, List[tuple]]) -> Dict[str, List[List[int]]]:
+        """Cluster every category partition, in worker processes when there are several"""
+        jobs = {category: [row[1:5] for row in rows] for category, rows in partitions.items()}
+        workers = min(self.workers, len(jobs))
+        if workers <= 1:
+            return {category: cluster_partition(rows) for category, rows in jobs.items()}
+        # spawn, not fork: the API process has threads, and workers need none of its state
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            # Largest partitions first so a big one does not start last
+            futures = {
+                category: executor.submit(cluster_partition, rows)
+                for category, rows in sorted(jobs.items(), key=lambda item: -len(item[1]))
+            }
+            return {category: future.result() for category, future in futures.items()}
+
+    def _build(self, partitions: Dict[str, List[tuple]]) -> Tuple[Dict[str, Optional[str]], List[Dict[str, Any]]]:
+        """Incident ID of every grievance (None outside incidents) and the incident summaries"""
+        clusters = self._cluster_all(partitions)
+
+        # Everything not in an incident is cleared, so stale IDs do not linger
+        assignments: Dict[str, Optional[str]] = {
+            row[0]: None for rows in partitions.values() for row in rows
+        }
+        incidents = []
+        for category, category_clusters in clusters.items():
+            rows = partitions[category]
+            for members in category_clusters:
+                member_rows = [rows[i] for i in members]
+                incident_id = incident_id_for(member_rows[0][0])
+                for row in member_rows:
+                    assignments[row[0]] = incident_id
+                incidents.append(summarize(incident_id, category, member_rows))
+        incidents.sort(key=lambda incident: (-incident["size"], incident["first_reported"]))
+        return assignments, incidents
+
+    def _claim(self) -> bool:
+        """Mark the job as running; False if it already is"""
+        with self._lock:
+            if self.running:
+                return False
+            self.running = True
+            return True
+
+    async def run(self, store) -> Dict[str, Any]:
+        """Cluster the whole store, write incident IDs back and save the summaries"""
+        if not self._claim():
+            raise RuntimeError("Incident clustering is already running")
+        return await self._run_claimed(store)
+
+    async def _run_claimed(self, store) -> Dict[str, Any]:
+        """
+        The job itself, once claimed. The store is read and written on the
+        event loop like every other store access; only the clustering runs
+        on a worker thread.
+        """
+        started = time.perf_counter()
+        started_at = datetime.now().isoformat()
+        try:
+            partitions = {}
+            for category in GrievanceCategory:
+                rows = store.get_incident_rows(category.value)
+                if rows:
+                    partitions[category.value] = rows
+
+            assignments, incidents = await asyncio.to_thread(self._build, partitions)
+
+            updated = store.set_incident_ids(assignments)
+            finished_at = datetime.now().isoformat()
+            atomic_write_json(self.path, {"generated_at": finished_at, "incidents": incidents})
+
+            result = {
+                "started_at": started_at,
+                "finished_at": finished_at,
+                "duration_seconds": round(time.perf_counter() - started, 3),
+                "grievances": len(assignments),
+                "incidents": len(incidents),
+                "clustered_grievances": sum(incident["size"] for incident in incidents),
+                "updated_grievances": updated
+            }
+            with self._lock:
+                self.last_run = result
+                self.last_error = None
+            return result
+        except Exception as e:
+            with self._lock:
+                self.last_error = str(e)
+            raise
+        finally:
+            with self._lock:
+                self.running = False
+
+    async def _run_in_background(self, store):
+        try:
+            await self._run_claimed(store)
+        except Exception as e:
+            print(f"Warning: Incident clustering failed: {e}")
+
+    def start(self, store) -> bool:
+        """Run the job as a task on the current event loop; False if it is already running"""
+        if not self._claim():
+            return False
+        # Keep a reference so the task is not garbage-collected while it runs
+        self._task = asyncio.get_running_loop().create_task(self._run_in_background(store))
+        return True
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self.running,
+                "last_run": self.last_run,
+                "last_error": self.last_error
+            }
+
+    def _load(self) -> Dict[str, Any]:
+        """The saved summaries, re-read only when the file changes"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return {"generated_at": None, "incidents": []}
+        stamp = (st.st_mtime_ns, st.st_size)
+        cache = self._cache
+        if cache is not None and cache[0] == stamp:
+            return cache[1]
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load incidents from {self.path}: {e}")
+            return {"generated_at": None, "incidents": []}
+        data["by_id"] = {incident["incident_id"]: incident for incident in data.get("incidents", [])}
+        self._cache = (stamp, data)
+        return data
+
+    def incidents(self) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+        """(generated_at, incident summaries, largest first) from the latest run"""
+        data = self._load()
+        return data["generated_at"], data["incidents"]
+
+    def get(self, incident_id: str) -> Optional[Dict[str, Any]]:
+        return self._load().get("by_id", {}).get(incident_id)
+
+
+# Singleton instance
+incident_clusterer = IncidentClusterer()
+
+
+if __name__ == "__main__":
+    from storage.data_store import data_store
+    from storage.persistence import persister
+
+    summary = asyncio.run(incident_clusterer.run(data_store))
+    persister.stop()
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,211 @@
+"""
+Multi-pattern keyword matcher (Aho-Corasick)
+Keyword tables are compiled once into an automaton that finds every
+keyword of every table in a single pass over the text, so matching cost
+grows with the length of the text rather than the number of keywords.
+"""
+from collections import deque
+import threading
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordHits:
+    """Result of one scan: which keywords occur in the text, and where"""
+
+    def __init__(self, matcher: "KeywordMatcher", first_offsets: Dict[int, int], state: int = 0, length: int = 0):
+        self._matcher = matcher
+        # Keyword id -> offset of its first occurrence
+        self._first_offsets = first_offsets
+        # Automaton state after the scanned text and that text's length,
+        # so a scan of a longer text with the same prefix can resume here
+        self.state = state
+        self.length = length
+
+    @property
+    def matcher(self) -> "KeywordMatcher":
+        """The matcher that produced these hits"""
+        return self._matcher
+
+    @property
+    def found(self) -> Dict[str, int]:
+        """Each keyword found, with the offset of its first occurrence"""
+        keywords = self._matcher.keywords
+        return {keywords[kid]: offset for kid, offset in self._first_offsets.items()}
+
+    def matches(self, table: Hashable) -> List[str]:
+        """
+        The table's keywords that occur in the text, in table order
+        (the same list as [kw for kw in table if kw in text]).
+        """
+        keywords = self._matcher.tables.get(table)
+        if not keywords:
+            return []
+        positions = []
+        for kid in self._first_offsets:
+            positions.extend(self._matcher.postings[kid].get(table, ()))
+        return [keywords[i] for i in sorted(positions)]
+
+    def count(self, table: Hashable) -> int:
+        """Number of the table's keywords that occur (duplicates in the table count twice)"""
+        return sum(len(self._matcher.postings[kid].get(table, ())) for kid in self._first_offsets)
+
+    def keyword_ids(self) -> List[int]:
+        """Ids (indexes into matcher.keywords) of the keywords found"""
+        return list(self._first_offsets)
+
+    def __contains__(self, keyword: str) -> bool:
+        kid = self._matcher.keyword_ids.get(keyword)
+        return kid is not None and kid in self._first_offsets
+
+    def __len__(self) -> int:
+        return len(self._first_offsets)
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over one or more named keyword tables.
+
+    By default a keyword matches anywhere in the text, like `kw in text`.
+    With word_boundary=True it only matches when not preceded or followed
+    by a letter, digit or underscore. Texts are expected in lower case
+    (keywords are lower-cased when compiled).
+    """
+
+    def __init__(self, tables: Mapping[Hashable, Sequence[str]], word_boundary: bool = False):
+        self.word_boundary = word_boundary
+        # Number of scanned texts each keyword occurred in (by keyword id)
+        self.hit_counts: List[int] = []
+        self._counts_lock = threading.Lock()
+        self.tables: Dict[Hashable, List[str]] = {name: list(kws) for name, kws in tables.items()}
+        self.keywords: List[str] = []
+        self.keyword_ids: Dict[str, int] = {}
+        # Keyword id -> {table: [positions of the keyword in that table]}
+        self.postings: List[Dict[Hashable, List[int]]] = []
+
+        for name, keywords in self.tables.items():
+            for position, keyword in enumerate(keywords):
+                keyword = keyword.lower()
+                kid = self.keyword_ids.get(keyword)
+                if kid is None:
+                    kid = self.keyword_ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.postings.append({})
+                    self.hit_counts.append(0)
+                self.postings[kid].setdefault(name, []).append(position)
+
+        self._build()
+
+    def _build(self):
+        """
+        Trie of all keywords plus failure links (breadth-first), flattened
+        into a transition table so scanning costs one lookup per character.
+        """
+        goto: List[Dict[str, int]] = [{}]
+        own_output: List[List[int]] = [[]]
+        for kid, keyword in enumerate(self.keywords):
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = goto[state][ch] = len(goto)
+                    goto.append({})
+                    own_output.append([])
+                state = nxt
+            own_output[state].append(kid)
+
+        fail = [0] * len(goto)
+        # Keyword ids ending at each state, including those reached via failure links
+        output: List[Tuple[int, ...]] = [()] * len(goto)
+        # Full transition function; a missing character means "back to the root"
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in range(len(goto) - 1)]
+
+        queue = deque()
+        for child in goto[0].values():
+            queue.append(child)
+            output[child] = tuple(own_output[child])
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fail[child] = delta[fail[state]].get(ch, 0)
+                output[child] = tuple(own_output[child]) + output[fail[child]]
+
+        self._delta = delta
+        self._output = output
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Every occurrence as (start, end, keyword), in order of end offset"""
+        delta, output, keywords = self._delta, self._output, self.keywords
+        word_boundary = self.word_boundary
+        state = 0
+        for index, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if not output[state]:
+                continue
+            end = index + 1
+            for kid in output[state]:
+                start = end - len(keywords[kid])
+                if word_boundary and (
+                    (start > 0 and _is_word_char(text[start - 1])) or
+                    (end < len(text) and _is_word_char(text[end]))
+                ):
+                    continue
+                yield start, end, keywords[kid]
+
+    def _count(self, kids: Iterable[int], already_counted: Mapping[int, int]):
+        with self._counts_lock:
+            for kid in kids:
+                if kid not in already_counted:
+                    self.hit_counts[kid] += 1
+
+    def keyword_hit_counts(self) -> Dict[str, int]:
+        """Keyword -> number of scanned texts it occurred in"""
+        with self._counts_lock:
+            return dict(zip(self.keywords, self.hit_counts))
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """All occurrences as (start, end, keyword)"""
+        return list(self.iter_matches(text))
+
+    def scan(self, text: str, resume: Optional[KeywordHits] = None, record_hits: bool = True) -> KeywordHits:
+        """
+        Which keywords occur in the text, from a single pass.
+        If resume is the scan of a prefix of text (by this matcher), only
+        the rest of the text is scanned. record_hits=False leaves the hit
+        counts alone (for previews and other scans of unsaved text).
+        """
+        first_offsets: Dict[int, int] = {}
+        if self.word_boundary:
+            # A boundary depends on the next character, so scans cannot resume
+            ids = self.keyword_ids
+            for start, _end, keyword in self.iter_matches(text):
+                first_offsets.setdefault(ids[keyword], start)
+            if record_hits:
+                self._count(first_offsets, {})
+            return KeywordHits(self, first_offsets, length=len(text))
+
+        state, begin = 0, 0
+        previous: Mapping[int, int] = {}
+        if resume is not None and resume.matcher is self and resume.length <= len(text):
+            previous = resume._first_offsets
+            first_offsets = dict(previous)
+            state, begin = resume.state, resume.length
+
+        delta, output, keywords = self._delta, self._output, self.keywords
+        for index, ch in enumerate(text[begin:] if begin else text, begin):
+            state = delta[state].get(ch, 0)
+            if output[state]:
+                for kid in output[state]:
+                    if kid not in first_offsets:
+                        first_offsets[kid] = index + 1 - len(keywords[kid])
+        # Keywords carried over from a resumed scan were counted by that scan
+        if record_hits:
+            self._count(first_offsets, previous)
+        return KeywordHits(self, first_offsets, state, len(text))
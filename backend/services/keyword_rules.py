@@ -0,0 +1,299 @@
+"""
+Hot-reloadable keyword rules
+The classifier and auto-categorizer keyword tables can be overridden by a
+versioned rules file (KEYWORD_RULES_FILE). When the file changes it is
+validated and compiled into matchers on a background thread, then swapped
+in as a whole; requests keep using the rule set they started with.
+Without a file the built-in tables are used (version 0).
+
+Write the built-in tables out as a starting point with:
+    python -m services.keyword_rules
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+from models.schemas import GrievanceCategory, Priority
+from services.keyword_matcher import KeywordMatcher
+from storage.coordination import atomic_write_json
+
+KEYWORD_RULES_FILE = os.environ.get(
+    "KEYWORD_RULES_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "storage", "keyword_rules.json")
+)
+
+# How often (seconds) to stat the rules file for changes
+KEYWORD_RULES_CHECK_SECONDS = float(os.environ.get("KEYWORD_RULES_CHECK_SECONDS", "5"))
+
+
+def _keyword_list(value: Any, where: str) -> List[str]:
+    if not isinstance(value, list) or not all(isinstance(kw, str) and kw.strip() for kw in value):
+        raise ValueError(f"{where}: expected a list of non-empty strings")
+    return [kw.lower() for kw in value]
+
+
+def _category(value: Any, where: str) -> GrievanceCategory:
+    try:
+        return GrievanceCategory(value)
+    except ValueError:
+        raise ValueError(f"{where}: unknown category {value!r}")
+
+
+class RuleSet:
+    """One immutable version of the keyword tables and their compiled matchers"""
+
+    def __init__(
+        self,
+        version: int,
+        source: str,
+        category_keywords: Dict[GrievanceCategory, List[str]],
+        priority_keywords: Dict[Priority, List[str]],
+        department_keywords: Dict[str, Dict[str, Any]],
+        category_text_keywords: Dict[GrievanceCategory, List[str]]
+    ):
+        self.version = version
+        self.source = source
+        self.loaded_at = datetime.now().isoformat()
+        self.category_keywords = category_keywords
+        self.priority_keywords = priority_keywords
+        self.department_keywords = department_keywords
+        self.category_text_keywords = category_text_keywords
+        # Identifies the exact rule content (two files with the same version may differ)
+        self.fingerprint = hashlib.sha256(
+            json.dumps(self.to_dict(), sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+        classifier_tables = {
+            **{("category", c): kws for c, kws in category_keywords.items()},
+            **{("priority", p): kws for p, kws in priority_keywords.items()}
+        }
+        categorizer_tables = {
+            **{("department", name): info["keywords"] for name, info in department_keywords.items()},
+            **{("category_text", c): kws for c, kws in category_text_keywords.items()}
+        }
+        # classify_grievance
+        self.classifier = KeywordMatcher(classifier_tables)
+        # analyze_grievance_for_auto_assignment
+        self.categorizer = KeywordMatcher(categorizer_tables)
+        # Every table, for TextFeatures (one scan per submission)
+        self.text = KeywordMatcher({**classifier_tables, **categorizer_tables})
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: str) -> "RuleSet":
+        """Validate a rules document; raises ValueError on any problem"""
+        if not isinstance(data, dict):
+            raise ValueError("Rules file must contain a JSON object")
+        version = data.get("version")
+        if not isinstance(version, int) or isinstance(version, bool) or version < 1:
+            raise ValueError("'version' must be a positive integer")
+
+        def category_tables(name: str) -> Dict[GrievanceCategory, List[str]]:
+            tables = data.get(name)
+            if not isinstance(tables, dict):
+                raise ValueError(f"'{name}' must be an object")
+            return {
+                _category(c, f"{name}.{c}"): _keyword_list(kws, f"{name}.{c}")
+                for c, kws in tables.items()
+            }
+
+        priorities = data.get("priority_keywords")
+        if not isinstance(priorities, dict):
+            raise ValueError("'priority_keywords' must be an object")
+        priority_keywords = {}
+        for level, kws in priorities.items():
+            try:
+                priority = Priority(level)
+            except ValueError:
+                raise ValueError(f"priority_keywords.{level}: unknown priority")
+            priority_keywords[priority] = _keyword_list(kws, f"priority_keywords.{level}")
+
+        departments = data.get("department_keywords")
+        if not isinstance(departments, dict) or not departments:
+            raise ValueError("'department_keywords' must be a non-empty object")
+        department_keywords = {}
+        for name, info in departments.items():
+            if not isinstance(info, dict):
+                raise ValueError(f"department_keywords.{name}: expected an object")
+            categories = info.get("categories", [])
+            if not isinstance(categories, list):
+                raise ValueError(f"department_keywords.{name}.categories: expected a list")
+            department_keywords[name] = {
+                "keywords": _keyword_list(info.get("keywords"), f"department_keywords.{name}.keywords"),
+                "categories": [_category(c, f"department_keywords.{name}.categories") for c in categories]
+            }
+
+        return cls(
+            version,
+            source,
+            category_tables("category_keywords"),
+            priority_keywords,
+            department_keywords,
+            category_tables("category_text_keywords")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The rules document for this rule set"""
+        return {
+            "version": self.version,
+            "category_keywords": {c.value: kws for c, kws in self.category_keywords.items()},
+            "priority_keywords": {p.value: kws for p, kws in self.priority_keywords.items()},
+            "department_keywords": {
+                name: {"keywords": info["keywords"], "categories": [c.value for c in info["categories"]]}
+                for name, info in self.department_keywords.items()
+            },
+            "category_text_keywords": {c.value: kws for c, kws in self.category_text_keywords.items()}
+        }
+
+    def hit_counts(self) -> Dict[str, Dict[str, int]]:
+        """Per table ("category:road", ...), how many scanned texts each keyword occurred in"""
+        matcher_counts = [
+            (matcher, matcher.keyword_hit_counts()) for matcher in (self.classifier, self.categorizer, self.text)
+        ]
+        result: Dict[str, Dict[str, int]] = {}
+        for table, keywords in self.text.tables.items():
+            kind, name = table
+            counts = {}
+            for keyword in keywords:
+                counts[keyword] = sum(
+                    hits.get(keyword.lower(), 0) for matcher, hits in matcher_counts if table in matcher.tables
+                )
+            result[f"{kind}:{getattr(name, 'value', name)}"] = counts
+        return result
+
+
+def builtin_rules() -> RuleSet:
+    """The tables defined in ai_classifier and auto_categorizer (version 0)"""
+    from services import ai_classifier, auto_categorizer
+    return RuleSet(
+        0,
+        "built-in",
+        ai_classifier.CATEGORY_KEYWORDS,
+        ai_classifier.PRIORITY_KEYWORDS,
+        auto_categorizer.DEPARTMENT_KEYWORDS,
+        auto_categorizer.CATEGORY_TEXT_KEYWORDS
+    )
+
+
+class KeywordRules:
+    """The current RuleSet, reloaded in the background when the rules file changes"""
+
+    def __init__(self, path: str = KEYWORD_RULES_FILE, check_interval: float = KEYWORD_RULES_CHECK_SECONDS):
+        self.path = path
+        self.check_interval = check_interval
+        self._rules: Optional[RuleSet] = None
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._checked_at = 0.0
+        self._compiling = False
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _compile(self, stamp) -> RuleSet:
+        if stamp is None:
+            return builtin_rules()
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        return RuleSet.from_dict(data, self.path)
+
+    def _install(self, rules: RuleSet, stamp):
+        with self._lock:
+            # A single reference assignment: readers see the old or the new set, never a mix
+            self._rules = rules
+            self._stamp = stamp
+            self.reloads += 1
+            self.last_error = None
+
+    def _compile_in_background(self, stamp):
+        try:
+            rules = self._compile(stamp)
+        except Exception as e:
+            print(f"Warning: Could not load keyword rules from {self.path}: {e}")
+            with self._lock:
+                # Keep serving the current rules until the file changes again
+                self._stamp = stamp
+                self.last_error = str(e)
+        else:
+            self._install(rules, stamp)
+        finally:
+            with self._lock:
+                self._compiling = False
+
+    def current(self) -> RuleSet:
+        """
+        The rule set to use for one request. Stats the rules file at most
+        once per check_interval; a change is compiled on a background thread
+        while the previous rules keep serving.
+        """
+        rules = self._rules
+        if rules is None:
+            return self.reload()
+
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            stamp = self._file_stamp()
+            with self._lock:
+                start = stamp != self._stamp and not self._compiling
+                if start:
+                    self._compiling = True
+            if start:
+                threading.Thread(
+                    target=self._compile_in_background, args=(stamp,), name="keyword-rules", daemon=True
+                ).start()
+        return rules
+
+    def reload(self) -> RuleSet:
+        """Load and compile the rules file now; raises ValueError if it is invalid"""
+        stamp = self._file_stamp()
+        self._checked_at = time.monotonic()
+        try:
+            rules = self._compile(stamp)
+        except (OSError, ValueError) as e:
+            if self._rules is not None:
+                with self._lock:
+                    self.last_error = str(e)
+                raise ValueError(str(e))
+            # Nothing loaded yet: start on the built-in rules rather than fail
+            print(f"Warning: Could not load keyword rules from {self.path}: {e}; using built-in rules")
+            self._install(builtin_rules(), stamp)
+            self.last_error = str(e)
+            return self._rules
+        self._install(rules, stamp)
+        return rules
+
+    def status(self) -> Dict[str, Any]:
+        """Version and origin of the active rules, plus reload state"""
+        rules = self.current()
+        return {
+            "version": rules.version,
+            "fingerprint": rules.fingerprint,
+            "source": rules.source,
+            "loaded_at": rules.loaded_at,
+            "keywords": len(rules.text.keywords),
+            "reloads": self.reloads,
+            "last_error": self.last_error
+        }
+
+
+# Singleton instance
+keyword_rules = KeywordRules()
+
+
+if __name__ == "__main__":
+    rules = builtin_rules().to_dict()
+    rules["version"] = 1
+    if os.path.exists(KEYWORD_RULES_FILE):
+        raise SystemExit(f"{KEYWORD_RULES_FILE} already exists")
+    atomic_write_json(KEYWORD_RULES_FILE, rules, indent=2)
+    print(f"Wrote built-in keyword rules to {KEYWORD_RULES_FILE}")
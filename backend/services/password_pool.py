@@ -0,0 +1,97 @@
+"""
+Bounded worker pool for bcrypt
+bcrypt is deliberately slow (tens of milliseconds of CPU per call), so
+hashing and verification run on a small thread pool - bcrypt releases the
+GIL - instead of blocking the event loop. When every worker is busy and
+PASSWORD_POOL_MAX_QUEUE calls are already waiting, new calls are rejected
+immediately so the API can answer 503 instead of stalling.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio
+import os
+import threading
+import time
+
+# Leave one core for the event loop
+PASSWORD_POOL_WORKERS = int(os.environ.get("PASSWORD_POOL_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+PASSWORD_POOL_MAX_QUEUE = int(os.environ.get("PASSWORD_POOL_MAX_QUEUE", "32"))
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the bcrypt pool cannot accept more work"""
+
+
+class PasswordPool:
+    """Thread pool with admission control and latency metrics"""
+
+    def __init__(self, workers: int = PASSWORD_POOL_WORKERS, max_queue: int = PASSWORD_POOL_MAX_QUEUE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+        # Metrics
+        self._completed = 0
+        self._rejected = 0
+        self._max_in_flight = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._total_run_ms = 0.0
+        self._max_run_ms = 0.0
+
+    def _admit(self):
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise PasswordPoolSaturated("Password hashing pool is saturated")
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def _timed(self, submitted: float, fn: Callable, args: tuple) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            wait_ms = (started - submitted) * 1000
+            run_ms = (finished - started) * 1000
+            with self._lock:
+                self._completed += 1
+                self._total_wait_ms += wait_ms
+                self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+                self._total_run_ms += run_ms
+                self._max_run_ms = max(self._max_run_ms, run_ms)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Run fn(*args) on the pool; raises PasswordPoolSaturated if it is full"""
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._timed, time.perf_counter(), fn, args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def metrics(self) -> Dict:
+        """Queue depth, rejections and wait/run latency"""
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.workers),
+                "max_in_flight": self._max_in_flight,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait_ms / completed, 3) if completed else 0,
+                "max_wait_ms": round(self._max_wait_ms, 3),
+                "avg_run_ms": round(self._total_run_ms / completed, 3) if completed else 0,
+                "max_run_ms": round(self._max_run_ms, 3)
+            }
+
+
+# Singleton instance
+password_pool = PasswordPool()
@@ -0,0 +1,33 @@
+"""
+Shared text analysis for a grievance description
+The classifier, the auto-categorizer and the duplicate checker all need
+the lower-cased text, its keyword hits and its word tokens. analyze_text
+computes them once so a submission is analyzed once, not per service.
+"""
+from typing import List, Set
+
+from services.keyword_matcher import KeywordHits
+from services.keyword_rules import keyword_rules, RuleSet
+from storage.duplicate_index import tokenize_normalized
+
+
+class TextFeatures:
+    """The analyzed form of one description"""
+
+    def __init__(self, text: str, normalized: str, tokens: List[str], hits: KeywordHits, rules: RuleSet):
+        self.text = text
+        # Lower-cased text, as the keyword tables expect
+        self.normalized = normalized
+        # Words longer than two characters, punctuation removed, in text order
+        self.tokens = tokens
+        self.token_set: Set[str] = set(tokens)
+        # Hits for every keyword table, and the rule set they come from
+        self.hits = hits
+        self.rules = rules
+
+
+def analyze_text(text: str) -> TextFeatures:
+    """Normalize, tokenize and keyword-scan a description (with the current keyword rules)"""
+    rules = keyword_rules.current()
+    normalized = text.lower()
+    return TextFeatures(text, normalized, tokenize_normalized(normalized), rules.text.scan(normalized), rules)
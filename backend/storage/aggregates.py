@@ -0,0 +1,238 @@
+"""
+Incrementally maintained counters for the analytics endpoints
+The stores apply a delta on every create, status change and assignment,
+so dashboards read counts in O(1) instead of scanning every record.
+Hourly and daily rollups do the same for volume over time.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime, timedelta
+from enum import Enum
+import re
+import threading
+
+from models.auto_assignment_schemas import AutoAssignmentStatus
+
+# Grievance fields that are counted
+GRIEVANCE_DIMENSIONS = ("status", "priority", "category", "department")
+
+# Rollup bucket sizes and their key formats
+GRANULARITIES = {"hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d"}
+
+_TIMESTAMP_RE = re.compile(r"^(\d{4}-\d{2}-\d{2})[T ](\d{2})")
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _bump(counts: Dict[Any, int], key: Any, delta: int):
+    """Add delta to counts[key], dropping keys that reach zero"""
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        counts.pop(key, None)
+
+
+def counter_values(grievance) -> Dict[str, Any]:
+    """The counted dimension values of a grievance (enums as plain values)"""
+    values = {}
+    for dimension in GRIEVANCE_DIMENSIONS:
+        value = getattr(grievance, dimension)
+        values[dimension] = _plain(value)
+    return values
+
+
+def assignment_values(data) -> Optional[Tuple[str, float]]:
+    """The counted (status, confidence) of an auto-assignment, None if absent"""
+    return (data.auto_status.value, data.confidence_score) if data is not None else None
+
+
+class GrievanceCounters:
+    """Grievance counts by status, priority, category and department"""
+
+    def __init__(self):
+        self.total = 0
+        self.counts: Dict[str, Dict[Any, int]] = {d: {} for d in GRIEVANCE_DIMENSIONS}
+        self._lock = threading.Lock()
+
+    def _add(self, values: Dict[str, Any], delta: int):
+        self.total += delta
+        for dimension in GRIEVANCE_DIMENSIONS:
+            _bump(self.counts[dimension], values[dimension], delta)
+
+    def apply(self, previous: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]]):
+        """Move one grievance from its previous values (None = new) to current (None = removed)"""
+        if previous is not None and current is not None and all(
+            previous[d] == current[d] for d in GRIEVANCE_DIMENSIONS
+        ):
+            return
+        with self._lock:
+            if previous is not None:
+                self._add(previous, -1)
+            if current is not None:
+                self._add(current, 1)
+
+    def seed(self, total: int, counts: Dict[str, Dict[Any, int]]):
+        """Replace all counters (e.g. from GROUP BY queries at startup)"""
+        with self._lock:
+            self.total = total
+            self.counts = {d: dict(counts.get(d, {})) for d in GRIEVANCE_DIMENSIONS}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Consistent copy: {"total": n, "by_status": {...}, "by_priority": {...}, ...}"""
+        with self._lock:
+            result: Dict[str, Any] = {"total": self.total}
+            for dimension in GRIEVANCE_DIMENSIONS:
+                result[f"by_{dimension}"] = dict(self.counts[dimension])
+            return result
+
+
+class AssignmentCounters:
+    """Auto-assignment counts by status plus the running confidence sum"""
+
+    def __init__(self):
+        self.total = 0
+        self.confidence_sum = 0.0
+        self.by_status: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, value: Tuple[str, float], delta: int):
+        status, confidence = value
+        self.total += delta
+        self.confidence_sum += delta * confidence
+        _bump(self.by_status, status, delta)
+
+    def apply(self, previous: Optional[Tuple[str, float]], current: Optional[Tuple[str, float]]):
+        """Move one assignment from previous (status, confidence) to current"""
+        if previous == current:
+            return
+        with self._lock:
+            if previous is not None:
+                self._add(previous, -1)
+            if current is not None:
+                self._add(current, 1)
+
+    def seed(self, total: int, confidence_sum: float, by_status: Dict[str, int]):
+        """Replace all counters (e.g. from GROUP BY queries at startup)"""
+        with self._lock:
+            self.total = total
+            self.confidence_sum = confidence_sum or 0.0
+            self.by_status = dict(by_status)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total,
+                "by_status": dict(self.by_status),
+                "average_confidence": self.confidence_sum / self.total if self.total else 0
+            }
+
+    def stats(self) -> Dict[str, Any]:
+        """The auto-assignment get_stats() response"""
+        snapshot = self.snapshot()
+        by_status = snapshot["by_status"]
+        return {
+            "total": snapshot["total"],
+            "pending": by_status.get(AutoAssignmentStatus.PENDING_APPROVAL.value, 0),
+            "approved": by_status.get(AutoAssignmentStatus.APPROVED.value, 0),
+            "rejected": by_status.get(AutoAssignmentStatus.REJECTED.value, 0),
+            "review_required": by_status.get(AutoAssignmentStatus.REVIEW_REQUIRED.value, 0),
+            "average_confidence": round(snapshot["average_confidence"], 1)
+        }
+
+
+def _empty_bucket() -> Dict[str, Any]:
+    return {"created": 0, "by_category": {}, "by_department": {}, "transitions": {}}
+
+
+class TimeRollups:
+    """
+    Hourly and daily buckets of created grievances (by category and
+    department) and status transitions (timeline entries by new status).
+    Reading a range costs one dict lookup per bucket, not per record.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[str, Dict[str, Dict[str, Any]]] = {g: {} for g in GRANULARITIES}
+        self._lock = threading.Lock()
+
+    def _buckets_for(self, timestamp: Optional[str]) -> List[Dict[str, Any]]:
+        """The hour and day buckets of an ISO timestamp (none if unparseable)"""
+        match = _TIMESTAMP_RE.match(timestamp or "")
+        if not match:
+            return []
+        day, hour = match.groups()
+        buckets = []
+        for granularity, key in (("hour", f"{day}T{hour}"), ("day", day)):
+            bucket = self.buckets[granularity].get(key)
+            if bucket is None:
+                bucket = self.buckets[granularity][key] = _empty_bucket()
+            buckets.append(bucket)
+        return buckets
+
+    @staticmethod
+    def _add_created(bucket: Dict[str, Any], values: Dict[str, Any], delta: int, count: int = 1):
+        bucket["created"] += delta * count
+        _bump(bucket["by_category"], values["category"], delta * count)
+        _bump(bucket["by_department"], values["department"], delta * count)
+
+    def move_created(
+        self,
+        previous: Optional[Dict[str, Any]],
+        current: Optional[Dict[str, Any]],
+        created_at: str
+    ):
+        """Move one grievance's creation count when its category or department changes (None = new/removed)"""
+        if previous is not None and current is not None and (
+            previous["category"] == current["category"] and previous["department"] == current["department"]
+        ):
+            return
+        with self._lock:
+            for bucket in self._buckets_for(created_at):
+                if previous is not None:
+                    self._add_created(bucket, previous, -1)
+                if current is not None:
+                    self._add_created(bucket, current, 1)
+
+    def record_transition(self, status: Any, timestamp: str):
+        """Count one timeline entry"""
+        with self._lock:
+            for bucket in self._buckets_for(timestamp):
+                _bump(bucket["transitions"], _plain(status), 1)
+
+    def seed(self, created: Iterable[Tuple[str, Any, Any, int]], transitions: Iterable[Tuple[str, Any, int]]):
+        """
+        Replace all buckets from pre-aggregated rows:
+        (timestamp, category, department, count) and (timestamp, status, count).
+        """
+        with self._lock:
+            self.buckets = {g: {} for g in GRANULARITIES}
+            for timestamp, category, department, count in created:
+                for bucket in self._buckets_for(timestamp):
+                    self._add_created(bucket, {"category": category, "department": department}, 1, count)
+            for timestamp, status, count in transitions:
+                for bucket in self._buckets_for(timestamp):
+                    _bump(bucket["transitions"], status, count)
+
+    def series(self, granularity: str, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """One entry per bucket from start to end (inclusive), empty buckets included"""
+        key_format = GRANULARITIES[granularity]
+        step = timedelta(hours=1) if granularity == "hour" else timedelta(days=1)
+        current = start.replace(minute=0, second=0, microsecond=0)
+        if granularity == "day":
+            current = current.replace(hour=0)
+        result = []
+        with self._lock:
+            buckets = self.buckets[granularity]
+            while current <= end:
+                key = current.strftime(key_format)
+                bucket = buckets.get(key)
+                entry = {"bucket": key, **_empty_bucket()}
+                if bucket is not None:
+                    entry["created"] = bucket["created"]
+                    for name in ("by_category", "by_department", "transitions"):
+                        entry[name] = dict(bucket[name])
+                result.append(entry)
+                current += step
+        return result
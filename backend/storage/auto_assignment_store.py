@@ -3,6 +3,7 @@ Storage for Auto Assignment Data
 Stores auto-assignment metadata and audit logs
 """
 from typing import Dict, List, Optional
+from contextlib import contextmanager
 from datetime import datetime
 import json
 import os
@@ -13,19 +14,65 @@ from models.auto_assignment_schemas import (
     AutoAssignmentStatus,
     AutoAssignmentConfig
 )
+from storage.aggregates import AssignmentCounters, assignment_values
+from storage.base_store import STORAGE_BACKEND
+from storage.coordination import MULTI_WORKER, SharedState, atomic_write_json
+from storage.persistence import persister
 
 
 class AutoAssignmentStore:
     """Storage for auto-assignment data and audit logs"""
     
-    def __init__(self):
-        self.assignments: Dict[str, AutoAssignmentData] = {}
-        self.audit_logs: List[AutoAssignmentAuditLog] = []
-        self.config: AutoAssignmentConfig = AutoAssignmentConfig()
+    def __init__(self, multi_worker: bool = MULTI_WORKER):
         self.data_file = "storage/auto_assignments.json"
         self.audit_file = "storage/auto_assignment_audit.json"
         self.config_file = "storage/auto_assignment_config.json"
+        self._assignments_target = persister.register("auto_assignments", self._save_assignments)
+        self._audit_target = persister.register("auto_assignment_audit", self._save_audit_logs)
+        # With several workers, every change is saved under a cross-process
+        # lock and other workers reload when the generation moves on
+        self._shared = SharedState(f"{self.data_file}.lock") if multi_worker else None
+        self._seen = (0, 0)
+        self._load()
+    
+    def _load(self):
+        """(Re)load all data and rebuild the counters"""
+        self.assignments: Dict[str, AutoAssignmentData] = {}
+        self.audit_logs: List[AutoAssignmentAuditLog] = []
+        self.config: AutoAssignmentConfig = AutoAssignmentConfig()
+        self.counters = AssignmentCounters()
         self._load_from_files()
+        for data in self.assignments.values():
+            self.counters.apply(None, assignment_values(data))
+        if self._shared:
+            self._seen = self._shared.read()
+    
+    def _sync(self):
+        """Reload if another worker has saved changes (no-op with one worker)"""
+        if self._shared is None or self._shared.read() == self._seen:
+            return
+        with self._shared:
+            if self._shared.read() != self._seen:
+                self._load()
+    
+    @contextmanager
+    def _write_lock(self):
+        """Serialize a read-modify-write with other workers (no-op with one worker)"""
+        if self._shared is None:
+            yield
+            return
+        with self._shared:
+            if self._shared.read() != self._seen:
+                self._load()
+            yield
+    
+    def _changed(self, target):
+        """Persist a change: write-behind with one worker, synchronous (and published) with several"""
+        if self._shared is None:
+            persister.mark_dirty(target)
+            return
+        target.flush_fn()
+        self._seen = self._shared.bump()
     
     def _load_from_files(self):
         """Load existing data from JSON files"""
@@ -60,29 +107,23 @@ class AutoAssignmentStore:
     def _save_assignments(self):
         """Persist assignments to JSON file"""
         try:
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            with open(self.data_file, 'w') as f:
-                data = {gid: a.model_dump() for gid, a in self.assignments.items()}
-                json.dump(data, f, indent=2, default=str)
+            data = {gid: a.model_dump() for gid, a in list(self.assignments.items())}
+            atomic_write_json(self.data_file, data, indent=2, default=str)
         except Exception as e:
             print(f"Warning: Could not save auto-assignments: {e}")
     
     def _save_audit_logs(self):
         """Persist audit logs to JSON file"""
         try:
-            os.makedirs(os.path.dirname(self.audit_file), exist_ok=True)
-            with open(self.audit_file, 'w') as f:
-                data = [log.model_dump() for log in self.audit_logs]
-                json.dump(data, f, indent=2, default=str)
+            data = [log.model_dump() for log in list(self.audit_logs)]
+            atomic_write_json(self.audit_file, data, indent=2, default=str)
         except Exception as e:
             print(f"Warning: Could not save audit logs: {e}")
     
     def _save_config(self):
         """Persist config to JSON file"""
         try:
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config.model_dump(), f, indent=2)
+            atomic_write_json(self.config_file, self.config.model_dump(), indent=2)
         except Exception as e:
             print(f"Warning: Could not save config: {e}")
     
@@ -92,12 +133,16 @@ class AutoAssignmentStore:
         data: AutoAssignmentData
     ) -> AutoAssignmentData:
         """Create auto-assignment record for a grievance"""
-        self.assignments[grievance_id] = data
-        self._save_assignments()
+        with self._write_lock():
+            previous = assignment_values(self.assignments.get(grievance_id))
+            self.assignments[grievance_id] = data
+            self.counters.apply(previous, assignment_values(data))
+            self._changed(self._assignments_target)
         return data
     
     def get_auto_assignment(self, grievance_id: str) -> Optional[AutoAssignmentData]:
         """Get auto-assignment data for a grievance"""
+        self._sync()
         return self.assignments.get(grievance_id)
     
     def update_auto_status(
@@ -106,14 +151,19 @@ class AutoAssignmentStore:
         new_status: AutoAssignmentStatus
     ) -> Optional[AutoAssignmentData]:
         """Update the auto-assignment status"""
-        if grievance_id in self.assignments:
-            self.assignments[grievance_id].auto_status = new_status
-            self._save_assignments()
-            return self.assignments[grievance_id]
+        with self._write_lock():
+            if grievance_id in self.assignments:
+                data = self.assignments[grievance_id]
+                previous = assignment_values(data)
+                data.auto_status = new_status
+                self.counters.apply(previous, assignment_values(data))
+                self._changed(self._assignments_target)
+                return self.assignments[grievance_id]
         return None
     
     def get_pending_assignments(self) -> Dict[str, AutoAssignmentData]:
         """Get all pending auto-assignment records"""
+        self._sync()
         return {
             gid: data for gid, data in self.assignments.items()
             if data.auto_status == AutoAssignmentStatus.PENDING_APPROVAL
@@ -124,6 +174,7 @@ class AutoAssignmentStore:
         status: AutoAssignmentStatus
     ) -> Dict[str, AutoAssignmentData]:
         """Get assignments by status"""
+        self._sync()
         return {
             gid: data for gid, data in self.assignments.items()
             if data.auto_status == status
@@ -131,8 +182,9 @@ class AutoAssignmentStore:
     
     def add_audit_log(self, log: AutoAssignmentAuditLog):
         """Add an audit log entry"""
-        self.audit_logs.append(log)
-        self._save_audit_logs()
+        with self._write_lock():
+            self.audit_logs.append(log)
+            self._changed(self._audit_target)
     
     def get_audit_logs(
         self,
@@ -140,6 +192,7 @@ class AutoAssignmentStore:
         limit: int = 100
     ) -> List[AutoAssignmentAuditLog]:
         """Get audit logs, optionally filtered by grievance ID"""
+        self._sync()
         logs = self.audit_logs
         if grievance_id:
             logs = [log for log in logs if log.grievance_id == grievance_id]
@@ -147,40 +200,37 @@ class AutoAssignmentStore:
         logs = sorted(logs, key=lambda x: x.timestamp, reverse=True)
         return logs[:limit]
     
+    def flush(self):
+        """Block until all queued changes are on disk"""
+        persister.flush()
+    
     def get_config(self) -> AutoAssignmentConfig:
         """Get current configuration"""
+        self._sync()
         return self.config
     
     def update_config(self, new_config: AutoAssignmentConfig) -> AutoAssignmentConfig:
         """Update configuration"""
-        self.config = new_config
-        self._save_config()
+        with self._write_lock():
+            self.config = new_config
+            self._save_config()
+            if self._shared:
+                self._seen = self._shared.bump()
         return self.config
     
     def get_stats(self) -> Dict:
-        """Get statistics about auto-assignments"""
-        pending = sum(1 for a in self.assignments.values() 
-                     if a.auto_status == AutoAssignmentStatus.PENDING_APPROVAL)
-        approved = sum(1 for a in self.assignments.values() 
-                      if a.auto_status == AutoAssignmentStatus.APPROVED)
-        rejected = sum(1 for a in self.assignments.values() 
-                      if a.auto_status == AutoAssignmentStatus.REJECTED)
-        review = sum(1 for a in self.assignments.values() 
-                    if a.auto_status == AutoAssignmentStatus.REVIEW_REQUIRED)
-        
-        # Average confidence score
-        scores = [a.confidence_score for a in self.assignments.values()]
-        avg_confidence = sum(scores) / len(scores) if scores else 0
-        
-        return {
-            "total": len(self.assignments),
-            "pending": pending,
-            "approved": approved,
-            "rejected": rejected,
-            "review_required": review,
-            "average_confidence": round(avg_confidence, 1)
-        }
+        """Get statistics about auto-assignments (from the running counters)"""
+        self._sync()
+        return self.counters.stats()
+
+
+def create_auto_assignment_store():
+    """Create the auto-assignment store selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "sqlite":
+        from storage.sqlite_store import SqliteAutoAssignmentStore
+        return SqliteAutoAssignmentStore()
+    return AutoAssignmentStore()
 
 
 # Singleton instance
-auto_assignment_store = AutoAssignmentStore()
+auto_assignment_store = create_auto_assignment_store()
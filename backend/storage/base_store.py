@@ -0,0 +1,138 @@
+"""
+Common interface for grievance storage backends
+The JSON-backed DataStore and the SQLite store both implement it, so
+routers can use whichever backend STORAGE_BACKEND selects.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+import uuid
+import os
+
+from models.schemas import Grievance, Status
+from storage.duplicate_index import DuplicateIndex
+from storage.spatial_index import SpatialIndex
+
+# "json" (in-memory + JSON files) or "sqlite"
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "json").lower()
+
+
+class BaseDataStore:
+    """Methods every grievance storage backend provides"""
+
+    backend_name = "base"
+
+    def generate_id(self) -> str:
+        """Generate unique complaint ID in government format"""
+        timestamp = datetime.now().strftime("%Y%m%d")
+        random_part = uuid.uuid4().hex[:6].upper()
+        return f"CSP-{timestamp}-{random_part}"
+
+    def create_grievance(self, grievance: Grievance, durable: bool = False) -> Grievance:
+        raise NotImplementedError
+
+    def get_grievance(self, grievance_id: str) -> Optional[Grievance]:
+        raise NotImplementedError
+
+    def get_all_grievances(self) -> List[Grievance]:
+        raise NotImplementedError
+
+    def get_grievances(self, grievance_ids: Iterable[str]) -> List[Grievance]:
+        """The grievances with these IDs (unknown IDs are skipped), in one lookup"""
+        raise NotImplementedError
+
+    def update_status(
+        self,
+        grievance_id: str,
+        new_status: Status,
+        remarks: str = None,
+        durable: bool = False
+    ) -> Optional[Grievance]:
+        raise NotImplementedError
+
+    def update_grievance(self, grievance_id: str, durable: bool = False, **fields) -> Optional[Grievance]:
+        raise NotImplementedError
+
+    def flush(self):
+        """Block until all queued changes are on disk"""
+
+    def _sync(self):
+        """Catch up with changes committed by other worker processes"""
+
+    def find_ids(self, **criteria) -> Set[str]:
+        raise NotImplementedError
+
+    def filter_grievances(self, **criteria) -> List[Grievance]:
+        raise NotImplementedError
+
+    def query_grievances(
+        self,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        status: Optional[str] = None,
+        area: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[Tuple[str, str]] = None,
+        sort: Optional[str] = None
+    ) -> List[Grievance]:
+        """
+        Filtered grievances with optional LIMIT/OFFSET.
+        Sorted newest first, or by relevance when searching (unless sort="newest").
+        `after` is a (created_at, id) keyset cursor for newest-first order.
+        """
+        raise NotImplementedError
+
+    def get_counts(self) -> Dict:
+        """Grievance totals: {"total": n, "by_status": {...}, "by_priority": {...}, ...}"""
+        self._sync()
+        return self.counters.snapshot()
+
+    def get_trends(self, granularity: str, start: datetime, end: datetime) -> List[Dict]:
+        """Created grievances and status transitions per hour or day bucket"""
+        self._sync()
+        return self.rollups.series(granularity, start, end)
+
+    def get_duplicate_index(self) -> DuplicateIndex:
+        """The duplicate-detection index, up to date with the store"""
+        raise NotImplementedError
+
+    def get_spatial_index(self) -> SpatialIndex:
+        """The grid index over grievance coordinates, up to date with the store"""
+        raise NotImplementedError
+
+    def get_nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_meters: float,
+        category: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Grievance, float]]:
+        """Grievances within radius_meters of a point with their distances, nearest first"""
+        results = []
+        for grievance_id, distance in self.get_spatial_index().within(lat, lng, radius_meters):
+            grievance = self.get_grievance(grievance_id)
+            if grievance is None or (category is not None and grievance.category.value != category):
+                continue
+            results.append((grievance, distance))
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def get_descriptions_for_category(self, category: str) -> List[tuple]:
+        raise NotImplementedError
+
+    def get_incident_rows(self, category: str) -> List[tuple]:
+        """(id, description, location, lat, lng, created_at) of a category, oldest first (for clustering)"""
+        raise NotImplementedError
+
+    def set_incident_ids(self, assignments: Dict[str, Optional[str]]) -> int:
+        """Write incident IDs back in one batch; returns how many grievances changed"""
+        raise NotImplementedError
+
+    def get_user_grievances(self, user_id: str) -> List[Grievance]:
+        raise NotImplementedError
+
+    def get_grievances_by_email(self, email: str) -> List[Grievance]:
+        raise NotImplementedError
@@ -0,0 +1,92 @@
+"""
+Content-addressed blob storage for uploaded images
+Images are decoded once and written to uploads/blobs/<aa>/<sha256>.<ext>;
+identical files are stored only once. Grievance records keep just the
+hash and the served path instead of inline base64 data.
+"""
+from typing import Dict, Tuple
+import base64
+import binascii
+import hashlib
+import os
+
+from models.schemas import Grievance
+
+BLOB_DIR = "uploads/blobs"
+
+# Leading bytes -> file extension
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+)
+
+
+def _detect_extension(data: bytes) -> str:
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return ".webp"
+    for signature, ext in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    return ".jpg"
+
+
+class BlobStore:
+    """Stores files on disk keyed by the SHA-256 of their content"""
+
+    def __init__(self, root: str = BLOB_DIR):
+        self.root = root
+        self.stored = 0
+        self.deduplicated = 0
+
+    def put_bytes(self, data: bytes) -> Tuple[str, str]:
+        """Store raw bytes; returns (sha256 hex digest, path served under /uploads)"""
+        digest = hashlib.sha256(data).hexdigest()
+        directory = os.path.join(self.root, digest[:2])
+        path = os.path.join(directory, f"{digest}{_detect_extension(data)}")
+
+        if os.path.exists(path):
+            self.deduplicated += 1
+        else:
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.stored += 1
+        return digest, path.replace(os.sep, "/")
+
+    def put_base64(self, encoded: str) -> Tuple[str, str]:
+        """Decode a base64 string (optionally a data: URL) and store it"""
+        if "," in encoded and encoded.lstrip().startswith("data:"):
+            encoded = encoded.split(",", 1)[1]
+        try:
+            data = base64.b64decode(encoded, validate=False)
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"Invalid base64 data: {e}")
+        if not data:
+            raise ValueError("Empty image data")
+        return self.put_bytes(data)
+
+    def externalize_image(self, grievance: Grievance) -> bool:
+        """Move a legacy inline image_data payload into the blob store"""
+        if not grievance.image_data:
+            return False
+        try:
+            grievance.image_hash, grievance.image_path = self.put_base64(grievance.image_data)
+        except (ValueError, OSError) as e:
+            print(f"Warning: Could not move image of {grievance.id} to blob store: {e}")
+            return False
+        grievance.image_data = None
+        return True
+
+    def metrics(self) -> Dict:
+        return {
+            "stored": self.stored,
+            "deduplicated": self.deduplicated
+        }
+
+
+# Singleton instance
+blob_store = BlobStore()
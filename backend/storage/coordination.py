@@ -0,0 +1,106 @@
+"""
+Cross-process coordination for the JSON-backed stores
+When uvicorn runs several workers (WEB_CONCURRENCY > 1), every store file
+gets an advisory lock file that also records a generation counter. Writers
+commit under the lock and bump the generation; readers compare it with the
+generation they last saw and reload only when another worker committed.
+"""
+from typing import Any, Tuple
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single worker only
+    fcntl = None
+
+# Uvicorn's default worker count; more than one switches the JSON stores
+# to locked, synchronous commits with change detection
+MULTI_WORKER = int(os.environ.get("WEB_CONCURRENCY", "1")) > 1
+
+
+class FileLock:
+    """Reentrant exclusive lock, held across threads and (via flock) processes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    def _open(self):
+        if self._fd is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def acquire(self):
+        self._lock.acquire()
+        try:
+            if self._depth == 0:
+                self._open()
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+            self._depth += 1
+        except Exception:
+            self._lock.release()
+            raise
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SharedState(FileLock):
+    """
+    A FileLock whose file holds "<generation> <epoch>".
+    The generation changes on every commit; the epoch only when the
+    snapshot is rewritten, which tells readers that a full reload is needed.
+    """
+
+    _FORMAT = "{:016d} {:016d}\n"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._read_lock = threading.Lock()
+
+    def read(self) -> Tuple[int, int]:
+        """Current (generation, epoch); cheap enough to call on every read"""
+        with self._read_lock:
+            self._open()
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            data = os.read(self._fd, 64)
+        try:
+            generation, epoch = data.split()
+            return int(generation), int(epoch)
+        except ValueError:
+            return 0, 0
+
+    def bump(self, new_epoch: bool = False) -> Tuple[int, int]:
+        """Record a commit (call with the lock held); returns the new state"""
+        generation, epoch = self.read()
+        state = (generation + 1, epoch + 1 if new_epoch else epoch)
+        with self._read_lock:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            os.write(self._fd, self._FORMAT.format(*state).encode())
+        return state
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs):
+    """Write JSON to a temp file and rename it over `path`, so readers never see a partial file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -2,25 +2,124 @@
 In-memory data storage for grievances
 Simple JSON-based storage for hackathon demo
 """
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from contextlib import contextmanager
+from enum import Enum
 from datetime import datetime
-import uuid
+import bisect
 import json
 import os
+import threading
 
 from models.schemas import Grievance, Status, TimelineEntry
+from storage.aggregates import GrievanceCounters, TimeRollups
+from storage.base_store import BaseDataStore, STORAGE_BACKEND
+from storage.blob_store import blob_store
+from storage.coordination import MULTI_WORKER, SharedState
+from storage.duplicate_index import DuplicateIndex, create_duplicate_index
+from storage.spatial_index import SpatialIndex
+from storage.journal import WriteAheadJournal
+from storage.persistence import persister
+from storage.search_index import SearchIndex, SEARCH_FIELDS
 
+# Journal mode appends one record per mutation instead of rewriting the
+# whole file; the snapshot is rewritten every SNAPSHOT_EVERY records.
+JOURNAL_ENABLED = os.environ.get("DATASTORE_JOURNAL", "1") != "0"
+SNAPSHOT_EVERY = int(os.environ.get("DATASTORE_SNAPSHOT_EVERY", "500"))
 
-class DataStore:
+# Fields with a hash index (value -> set of grievance IDs)
+INDEXED_FIELDS = ("category", "status", "priority", "department", "user_id", "submitter_email")
+
+
+class DataStore(BaseDataStore):
     """In-memory storage with optional JSON persistence"""
     
-    def __init__(self):
-        self.grievances: Dict[str, Grievance] = {}
+    backend_name = "in-memory"
+    
+    def __init__(self, journal_enabled: bool = JOURNAL_ENABLED, multi_worker: bool = MULTI_WORKER):
         self.data_file = "storage/grievances.json"
+        self.journal_file = "storage/grievances.journal"
+        self.journal = WriteAheadJournal(self.journal_file) if journal_enabled else None
+        self._pending_records: List[dict] = []
+        self._pending_lock = threading.Lock()
+        self._duplicates_lock = threading.Lock()
+        # With several workers, writes commit under a cross-process lock and
+        # the lock file's (generation, epoch) tells us when to catch up
+        self._shared = SharedState(f"{self.data_file}.lock") if multi_worker else None
+        self._file_lock = self._shared or threading.RLock()
+        self._seen: Tuple[int, int] = (0, 0)
+        self._persist_target = persister.register("grievances", self._flush)
+        with self._file_lock:
+            self._load()
+    
+    def _load(self):
+        """(Re)build all in-memory state from the snapshot and journal"""
+        self.grievances: Dict[str, Grievance] = {}
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {f: {} for f in INDEXED_FIELDS}
+        self._indexed_values: Dict[str, Dict[str, Any]] = {}
+        # (created_at, id) keys in ascending order, for newest-first paging
+        self._order: List[Tuple[str, str]] = []
+        self.search_index = SearchIndex()
+        # Built on first use rather than at startup
+        self.duplicate_index = create_duplicate_index()
+        self._duplicates_stale = True
+        self.spatial_index = SpatialIndex()
+        self.counters = GrievanceCounters()
+        self.rollups = TimeRollups()
         self._load_from_file()
+        self._externalize_inline_images()
+        for grievance in self.grievances.values():
+            self._index(grievance)
+        self._order = sorted((g.created_at, g.id) for g in self.grievances.values())
+        if self._shared:
+            self._seen = self._shared.read()
+    
+    def _sync(self):
+        """Catch up with commits made by other workers (no-op with one worker)"""
+        if self._shared is None or self._shared.read() == self._seen:
+            return
+        with self._shared:
+            self._catch_up()
+    
+    def _catch_up(self):
+        """Apply other workers' commits; call with the shared lock held"""
+        state = self._shared.read()
+        if state == self._seen:
+            return
+        if state[1] != self._seen[1] or not self.journal:
+            # The snapshot was rewritten: reload everything
+            self._load()
+        else:
+            for record in self.journal.tail():
+                self._apply_remote(record)
+        self._seen = state
+    
+    def _apply_remote(self, record: dict):
+        """Apply a journal record written by another worker"""
+        if record.get("op") != "put":
+            return
+        grievance = Grievance(**record["grievance"])
+        previous = self.grievances.get(grievance.id)
+        if previous is None:
+            bisect.insort(self._order, (grievance.created_at, grievance.id))
+        else:
+            for entry in grievance.timeline[len(previous.timeline):]:
+                self.rollups.record_transition(entry.status, entry.timestamp)
+        self.grievances[grievance.id] = grievance
+        self._index(grievance)
+    
+    @contextmanager
+    def _write_lock(self):
+        """Serialize a read-modify-write with other workers (no-op with one worker)"""
+        if self._shared is None:
+            yield
+            return
+        with self._shared:
+            self._catch_up()
+            yield
     
     def _load_from_file(self):
-        """Load existing data from JSON file if exists"""
+        """Load the snapshot, then replay any journal records written after it"""
         if os.path.exists(self.data_file):
             try:
                 with open(self.data_file, 'r') as f:
@@ -29,70 +128,373 @@ class DataStore:
                         self.grievances[gid] = Grievance(**g_data)
             except Exception as e:
                 print(f"Warning: Could not load data file: {e}")
+        
+        if self.journal:
+            try:
+                for record in self.journal.replay():
+                    self._apply_journal_record(record)
+            except Exception as e:
+                print(f"Warning: Could not replay journal: {e}")
+            if self.journal.record_count >= SNAPSHOT_EVERY:
+                self.compact()
     
-    def _save_to_file(self):
-        """Persist data to JSON file"""
+    def _apply_journal_record(self, record: dict):
+        """Apply a single replayed journal record"""
+        if record.get("op") == "put":
+            grievance = Grievance(**record["grievance"])
+            self.grievances[grievance.id] = grievance
+    
+    def _externalize_inline_images(self):
+        """Move legacy base64 image_data into the blob store, then re-snapshot"""
+        moved = [g for g in self.grievances.values() if blob_store.externalize_image(g)]
+        if moved:
+            print(f"Moved {len(moved)} inline images to the blob store")
+            self.compact()
+    
+    def _save_to_file(self) -> bool:
+        """Persist data to JSON file (atomically, via a temp file)"""
         try:
-            os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
-            with open(self.data_file, 'w') as f:
-                data = {gid: g.model_dump() for gid, g in self.grievances.items()}
-                json.dump(data, f, indent=2, default=str)
+            with self._file_lock:
+                os.makedirs(os.path.dirname(self.data_file), exist_ok=True)
+                tmp_file = f"{self.data_file}.tmp"
+                with open(tmp_file, 'w') as f:
+                    data = {gid: g.model_dump() for gid, g in list(self.grievances.items())}
+                    json.dump(data, f, indent=2, default=str)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, self.data_file)
+            return True
         except Exception as e:
             print(f"Warning: Could not save data file: {e}")
+            return False
     
-    def generate_id(self) -> str:
-        """Generate unique complaint ID in government format"""
-        timestamp = datetime.now().strftime("%Y%m%d")
-        random_part = uuid.uuid4().hex[:6].upper()
-        return f"CSP-{timestamp}-{random_part}"
+    def _persist(self, grievance: Grievance, durable: bool = False):
+        """Queue one changed grievance for the write-behind persister"""
+        if self._shared:
+            self._commit(grievance)
+            return
+        if self.journal:
+            record = {"op": "put", "grievance": grievance.model_dump(mode="json")}
+            with self._pending_lock:
+                self._pending_records.append(record)
+        persister.mark_dirty(self._persist_target, durable)
     
-    def create_grievance(self, grievance: Grievance) -> Grievance:
-        """Store a new grievance"""
-        self.grievances[grievance.id] = grievance
-        self._save_to_file()
+    def _commit(self, grievance: Grievance):
+        """Write one change synchronously and publish it to other workers (lock held)"""
+        if not self.journal:
+            if self._save_to_file():
+                self._seen = self._shared.bump(new_epoch=True)
+            return
+        try:
+            self.journal.append({"op": "put", "grievance": grievance.model_dump(mode="json")})
+        except Exception as e:
+            print(f"Warning: Could not append to journal: {e}")
+            self.compact()
+            return
+        self._seen = self._shared.bump()
+        if self.journal.record_count >= SNAPSHOT_EVERY:
+            self.compact()
+    
+    def _flush(self):
+        """Write queued changes: one journal append per batch, or a full rewrite"""
+        if not self.journal:
+            self._save_to_file()
+            return
+        with self._pending_lock:
+            records, self._pending_records = self._pending_records, []
+        with self._file_lock:
+            try:
+                self.journal.append_many(records)
+            except Exception as e:
+                # The snapshot covers everything in memory, including these records
+                print(f"Warning: Could not append to journal: {e}")
+                self.compact()
+                return
+            if self.journal.record_count >= SNAPSHOT_EVERY:
+                self.compact()
+    
+    def flush(self):
+        """Block until all queued changes are on disk"""
+        persister.flush()
+    
+    def compact(self):
+        """Write a fresh snapshot and truncate the journal"""
+        with self._file_lock:
+            if not self._save_to_file():
+                return
+            if self.journal:
+                try:
+                    self.journal.reset()
+                except Exception as e:
+                    print(f"Warning: Could not truncate journal: {e}")
+            if self._shared:
+                self._seen = self._shared.bump(new_epoch=True)
+    
+    @staticmethod
+    def _index_key(value: Any) -> Any:
+        return value.value if isinstance(value, Enum) else value
+    
+    def _index(self, grievance: Grievance):
+        """Add a grievance to the secondary indexes and aggregates, moving it if a field changed"""
+        old_values = self._indexed_values.get(grievance.id)
+        new_values = {f: self._index_key(getattr(grievance, f)) for f in INDEXED_FIELDS}
+        for field, value in new_values.items():
+            if old_values is not None:
+                old_value = old_values[field]
+                if old_value == value:
+                    continue
+                bucket = self._indexes[field].get(old_value)
+                if bucket is not None:
+                    bucket.discard(grievance.id)
+                    if not bucket:
+                        del self._indexes[field][old_value]
+            self._indexes[field].setdefault(value, set()).add(grievance.id)
+        self._indexed_values[grievance.id] = new_values
+        self.counters.apply(old_values, new_values)
+        self.rollups.move_created(old_values, new_values, grievance.created_at)
+        if old_values is None:
+            for entry in grievance.timeline:
+                self.rollups.record_transition(entry.status, entry.timestamp)
+        self.search_index.add(grievance.id, {f: getattr(grievance, f) for f in SEARCH_FIELDS})
+        self.spatial_index.add(grievance.id, grievance.lat, grievance.lng)
+        with self._duplicates_lock:
+            if not self._duplicates_stale:
+                self.duplicate_index.add(grievance.id, grievance.category, grievance.description, grievance.location)
+    
+    def _candidate_ids(self, **criteria) -> Optional[Set[str]]:
+        """Intersect index buckets; None means no criteria were given"""
+        buckets = []
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            if field not in self._indexes:
+                raise ValueError(f"Field '{field}' is not indexed")
+            bucket = self._indexes[field].get(self._index_key(value))
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+        if not buckets:
+            return None
+        buckets.sort(key=len)
+        return buckets[0].intersection(*buckets[1:])
+    
+    def find_ids(self, **criteria) -> Set[str]:
+        """
+        Return IDs matching every given field == value criterion.
+        Only INDEXED_FIELDS may be used; None values are ignored.
+        """
+        self._sync()
+        ids = self._candidate_ids(**criteria)
+        return set(self.grievances.keys()) if ids is None else ids
+    
+    def filter_grievances(self, **criteria) -> List[Grievance]:
+        """Get grievances matching indexed field criteria (see find_ids)"""
+        return [self.grievances[gid] for gid in self.find_ids(**criteria)]
+    
+    def create_grievance(self, grievance: Grievance, durable: bool = False) -> Grievance:
+        """Store a new grievance (durable=True waits until it is on disk)"""
+        with self._write_lock():
+            if grievance.id not in self.grievances:
+                bisect.insort(self._order, (grievance.created_at, grievance.id))
+            self.grievances[grievance.id] = grievance
+            self._index(grievance)
+            self._persist(grievance, durable)
         return grievance
     
     def get_grievance(self, grievance_id: str) -> Optional[Grievance]:
         """Retrieve grievance by ID"""
+        self._sync()
         return self.grievances.get(grievance_id)
     
     def get_all_grievances(self) -> List[Grievance]:
         """Get all grievances for admin view"""
+        self._sync()
         return list(self.grievances.values())
     
-    def update_status(self, grievance_id: str, new_status: Status, remarks: str = None) -> Optional[Grievance]:
+    def get_grievances(self, grievance_ids: Iterable[str]) -> List[Grievance]:
+        """The grievances with these IDs (unknown IDs are skipped)"""
+        self._sync()
+        grievances = self.grievances
+        return [grievances[gid] for gid in grievance_ids if gid in grievances]
+    
+    def update_status(
+        self,
+        grievance_id: str,
+        new_status: Status,
+        remarks: str = None,
+        durable: bool = False
+    ) -> Optional[Grievance]:
         """Update grievance status and add timeline entry"""
-        grievance = self.grievances.get(grievance_id)
-        if not grievance:
-            return None
+        with self._write_lock():
+            grievance = self.grievances.get(grievance_id)
+            if not grievance:
+                return None
+            
+            # Update status
+            grievance.status = new_status
+            grievance.updated_at = datetime.now().isoformat()
+            
+            # Add timeline entry
+            timeline_entry = TimelineEntry(
+                status=new_status,
+                timestamp=datetime.now().isoformat(),
+                remarks=remarks
+            )
+            grievance.timeline.append(timeline_entry)
+            self.rollups.record_transition(new_status, timeline_entry.timestamp)
+            
+            self._index(grievance)
+            self._persist(grievance, durable)
+        return grievance
+    
+    def update_grievance(self, grievance_id: str, durable: bool = False, **fields) -> Optional[Grievance]:
+        """
+        Update plain fields (e.g. department, location) of a grievance.
+        Use this instead of assigning attributes directly so that indexes
+        and persistence stay in sync. Status changes go through update_status.
+        """
+        with self._write_lock():
+            grievance = self.grievances.get(grievance_id)
+            if not grievance:
+                return None
+            
+            for field, value in fields.items():
+                if field not in Grievance.model_fields or field in ("id", "status", "timeline", "created_at"):
+                    raise ValueError(f"Field '{field}' cannot be updated directly")
+                setattr(grievance, field, value)
+            grievance.updated_at = datetime.now().isoformat()
+            
+            self._index(grievance)
+            self._persist(grievance, durable)
+        return grievance
+    
+    def _newest_first(self, candidates: Optional[Set[str]], after: Optional[Tuple[str, str]]) -> Iterator[Grievance]:
+        """Yield grievances newest first, starting strictly after the cursor key"""
+        if candidates is not None and len(candidates) * 8 < len(self._order):
+            # Selective filter: sorting the matches beats walking the whole order
+            keys = sorted(((self.grievances[gid].created_at, gid) for gid in candidates), reverse=True)
+            for key in keys:
+                if after is None or key < after:
+                    yield self.grievances[key[1]]
+            return
         
-        # Update status
-        grievance.status = new_status
-        grievance.updated_at = datetime.now().isoformat()
+        position = len(self._order) if after is None else bisect.bisect_left(self._order, after)
+        order = self._order
+        for i in range(position - 1, -1, -1):
+            gid = order[i][1]
+            if candidates is None or gid in candidates:
+                yield self.grievances[gid]
+    
+    def query_grievances(
+        self,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        status: Optional[str] = None,
+        area: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[Tuple[str, str]] = None,
+        sort: Optional[str] = None
+    ) -> List[Grievance]:
+        """
+        Filtered grievances with optional LIMIT/OFFSET.
+        Sorted newest first, or by relevance when searching (unless sort="newest").
+        `after` is a (created_at, id) keyset cursor for newest-first order.
+        """
+        self._sync()
+        # Exact-match filters are answered from the hash indexes
+        candidates = self._candidate_ids(category=category, priority=priority, status=status)
         
-        # Add timeline entry
-        timeline_entry = TimelineEntry(
-            status=new_status,
-            timestamp=datetime.now().isoformat(),
-            remarks=remarks
-        )
-        grievance.timeline.append(timeline_entry)
+        if search:
+            ranked = self.search_index.search(search, candidates)
+            if sort == "newest":
+                ordered = self._newest_first({gid for gid, _ in ranked}, after)
+            else:
+                ordered = (self.grievances[gid] for gid, _ in ranked)
+        else:
+            ordered = self._newest_first(candidates, after)
         
-        self._save_to_file()
-        return grievance
+        area_lower = area.lower() if area else None
+        results = []
+        skipped = 0
+        for g in ordered:
+            if area_lower and area_lower not in g.location.lower():
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            results.append(g)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+    
+    def get_duplicate_index(self) -> DuplicateIndex:
+        """The duplicate-detection index, built on first use and then maintained with the other indexes"""
+        self._sync()
+        with self._duplicates_lock:
+            if self._duplicates_stale:
+                for grievance in list(self.grievances.values()):
+                    self.duplicate_index.add(grievance.id, grievance.category, grievance.description, grievance.location)
+                self._duplicates_stale = False
+            return self.duplicate_index
+    
+    def get_spatial_index(self) -> SpatialIndex:
+        """The grid index over grievance coordinates (maintained with the other indexes)"""
+        self._sync()
+        return self.spatial_index
     
     def get_descriptions_for_category(self, category: str) -> List[tuple]:
         """Get all descriptions and locations for a category (for duplicate check)"""
-        results = []
-        for gid, g in self.grievances.items():
-            if g.category.value == category:
-                results.append((gid, g.description, g.location))
-        return results
+        return [
+            (g.id, g.description, g.location)
+            for g in self.filter_grievances(category=category)
+        ]
+    
+    def get_incident_rows(self, category: str) -> List[tuple]:
+        """(id, description, location, lat, lng, created_at) of a category, oldest first (for clustering)"""
+        return sorted(
+            ((g.id, g.description, g.location, g.lat, g.lng, g.created_at)
+             for g in self.filter_grievances(category=category)),
+            key=lambda row: (row[5], row[0])
+        )
+    
+    def set_incident_ids(self, assignments: Dict[str, Optional[str]]) -> int:
+        """Write incident IDs back in one batch; returns how many grievances changed"""
+        changed = 0
+        with self._write_lock():
+            for grievance_id, incident_id in assignments.items():
+                grievance = self.grievances.get(grievance_id)
+                if grievance is None or grievance.incident_id == incident_id:
+                    continue
+                # Derived data: updated_at is left alone
+                grievance.incident_id = incident_id
+                self._persist(grievance)
+                changed += 1
+        return changed
+    
+    def _lookup(self, field: str, value: Any) -> List[Grievance]:
+        """Exact single-field index lookup (None is a valid value here)"""
+        self._sync()
+        ids = self._indexes[field].get(self._index_key(value), ())
+        return [self.grievances[gid] for gid in ids]
     
     def get_user_grievances(self, user_id: str) -> List[Grievance]:
         """Get all grievances submitted by a specific user"""
-        return [g for g in self.grievances.values() if g.user_id == user_id]
+        return self._lookup("user_id", user_id)
+    
+    def get_grievances_by_email(self, email: str) -> List[Grievance]:
+        """Get all grievances whose submitter email matches"""
+        return self._lookup("submitter_email", email)
+
+
+def create_data_store() -> BaseDataStore:
+    """Create the grievance store selected by STORAGE_BACKEND"""
+    if STORAGE_BACKEND == "sqlite":
+        from storage.sqlite_store import SqliteDataStore
+        return SqliteDataStore()
+    return DataStore()
 
 
 # Singleton instance
-data_store = DataStore()
+data_store = create_data_store()
@@ -0,0 +1,211 @@
+"""
+Inverted index for duplicate detection
+Each grievance's description is tokenized once, when it is stored, into
+the word set the duplicate checker compares. Per category, tokens map to
+the grievances containing them, so a new complaint is only scored against
+grievances that share its rarer tokens (prefix filtering): a grievance
+can only reach a Jaccard similarity of t if it shares one of the
+len(A) - ceil(t * len(A)) + 1 rarest tokens of the new text A.
+
+Tokens are interned as small integers (TokenVocabulary), so each
+grievance's token set is a frozenset of ints and every distinct word is
+stored once. The stores build the index on first use, not at startup.
+
+DUPLICATE_ENGINE=minhash swaps in the approximate MinHash/LSH index
+(storage/minhash_index.py), which also catches reworded complaints.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import os
+import re
+import threading
+
+# "exact" (token Jaccard) or "minhash" (LSH over character shingles)
+DUPLICATE_ENGINE = os.environ.get("DUPLICATE_ENGINE", "exact").lower()
+
+# Added to the text similarity when both locations are the same string
+LOCATION_BONUS = 0.15
+
+# Runs of alphanumeric characters (anything else separates words)
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize_normalized(normalized: str) -> List[str]:
+    """Words of already lower-cased text (punctuation removed, short words dropped)"""
+    return [w for w in _WORD_RE.findall(normalized) if len(w) > 2]
+
+
+class TokenVocabulary:
+    """Interns tokens as integer IDs (IDs are never reused)"""
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.tokens: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def intern(self, token: str) -> int:
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = self._ids[token] = len(self.tokens)
+            self.tokens.append(token)
+        return token_id
+
+    def lookup(self, token: str) -> Optional[int]:
+        """ID of a known token, None if it was never interned"""
+        return self._ids.get(token)
+
+
+def _category_key(category) -> str:
+    return getattr(category, "value", category)
+
+
+class DuplicateIndex:
+    """category -> token ID -> grievance IDs, plus each grievance's token IDs and location"""
+
+    def __init__(self):
+        self.vocabulary = TokenVocabulary()
+        self._postings: Dict[str, Dict[int, Set[str]]] = {}
+        self._locations: Dict[Tuple[str, str], Set[str]] = {}
+        # id -> (category, token IDs, lower-cased location, fingerprint, insertion order)
+        self._docs: Dict[str, Tuple[str, frozenset, str, int, int]] = {}
+        self._next_seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: str, category, description: str, location: Optional[str]):
+        """Index (or re-index) a grievance; unchanged grievances are skipped"""
+        category = _category_key(category)
+        fingerprint = hash((category, description, location))
+        with self._lock:
+            existing = self._docs.get(doc_id)
+            if existing is not None and existing[3] == fingerprint:
+                return
+            if existing is not None:
+                # Keep the grievance's place in the order ties are decided by
+                seq = existing[4]
+                self._remove(doc_id)
+            else:
+                seq = self._next_seq
+                self._next_seq += 1
+            words = set(tokenize_normalized((description or "").lower()))
+            self._insert(doc_id, category, words, (location or "").lower(), fingerprint, seq)
+
+    def _insert(self, doc_id: str, category: str, words: Set[str], location_key: str, fingerprint: int, seq: int):
+        tokens = frozenset(self.vocabulary.intern(word) for word in words)
+        postings = self._postings.setdefault(category, {})
+        for token in tokens:
+            postings.setdefault(token, set()).add(doc_id)
+        if location_key:
+            self._locations.setdefault((category, location_key), set()).add(doc_id)
+        self._docs[doc_id] = (category, tokens, location_key, fingerprint, seq)
+
+    def remove(self, doc_id: str):
+        """Drop a grievance from the index"""
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        existing = self._docs.pop(doc_id, None)
+        if existing is None:
+            return
+        category, tokens, location_key = existing[:3]
+        postings = self._postings.get(category, {})
+        for token in tokens:
+            ids = postings.get(token)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del postings[token]
+        if location_key:
+            ids = self._locations.get((category, location_key))
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self._locations[(category, location_key)]
+
+    def clear(self):
+        with self._lock:
+            self.vocabulary = TokenVocabulary()
+            self._postings.clear()
+            self._locations.clear()
+            self._docs.clear()
+            self._next_seq = 0
+
+    def best_match(
+        self,
+        category,
+        tokens: Set[str],
+        location: Optional[str] = None,
+        floor: float = 0.0,
+        nearby: Optional[Dict[str, float]] = None
+    ) -> Tuple[Optional[str], float, int]:
+        """
+        The most similar grievance in the category as (id, similarity, grievances scored).
+        Similarity is check_duplicates' score: Jaccard of the token sets plus
+        a location bonus, capped at 1; ties go to the grievance indexed first.
+        The bonus is LOCATION_BONUS for the same location string, or the
+        grievance's value in `nearby` (id -> bonus, at most LOCATION_BONUS)
+        if larger. The result is exact whenever the best
+        similarity is at least `floor`; below it, only grievances sharing a
+        rare token are scored.
+        """
+        category = _category_key(category)
+        location_key = (location or "").lower()
+        size = len(tokens)
+        best_id, best, best_seq = None, 0.0, -1
+        scored: Set[str] = set()
+
+        with self._lock:
+            docs = self._docs
+            postings = self._postings.get(category, {})
+            # Words never indexed get no ID: they only count towards the size
+            query = [self.vocabulary.lookup(token) for token in tokens]
+            query_ids = frozenset(token_id for token_id in query if token_id is not None)
+
+            def score(doc_id: str):
+                nonlocal best_id, best, best_seq
+                scored.add(doc_id)
+                _, doc_tokens, doc_location, _, seq = docs[doc_id]
+                if size and doc_tokens:
+                    shared = len(query_ids & doc_tokens) if len(query_ids) < len(doc_tokens) else len(doc_tokens & query_ids)
+                    similarity = shared / (size + len(doc_tokens) - shared)
+                else:
+                    similarity = 0.0
+                bonus = LOCATION_BONUS if location_key and doc_location == location_key else 0.0
+                if nearby:
+                    bonus = max(bonus, nearby.get(doc_id, 0.0))
+                similarity = min(similarity + bonus, 1.0)
+                if similarity > best or (similarity == best and best_id is not None and seq < best_seq):
+                    best_id, best, best_seq = doc_id, similarity, seq
+
+            # Same or nearby location: the bonus alone can make these the best match
+            if location_key:
+                for doc_id in self._locations.get((category, location_key), ()):
+                    score(doc_id)
+            for doc_id in nearby or ():
+                entry = docs.get(doc_id)
+                if entry is not None and entry[0] == category and doc_id not in scored:
+                    score(doc_id)
+
+            # Rarest tokens first; a grievance first seen at position i shares at most
+            # size - i tokens, so its similarity is at most (size - i) / size
+            ordered = sorted(query, key=lambda t: len(postings.get(t, ())))
+            for position, token_id in enumerate(ordered):
+                if (size - position) / size < max(best, floor):
+                    break
+                for doc_id in postings.get(token_id, ()):
+                    if doc_id not in scored:
+                        score(doc_id)
+
+        return best_id, best, len(scored)
+
+
+def create_duplicate_index() -> DuplicateIndex:
+    """Create the duplicate index selected by DUPLICATE_ENGINE"""
+    if DUPLICATE_ENGINE == "minhash":
+        from storage.minhash_index import MinHashIndex
+        return MinHashIndex()
+    return DuplicateIndex()
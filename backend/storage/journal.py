@@ -0,0 +1,111 @@
+"""
+Append-only write-ahead journal for JSON-backed stores
+Each mutation is appended as one checksummed line; the snapshot file is
+only rewritten when the journal is compacted.
+"""
+from typing import Iterator, List
+import json
+import os
+import zlib
+
+
+class WriteAheadJournal:
+    """Line-oriented journal of JSON records protected by a CRC32 checksum"""
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.record_count = 0
+        # Bytes of the file this process has read or written
+        self.offset = 0
+
+    @staticmethod
+    def _encode(record: dict) -> str:
+        payload = json.dumps(record, default=str, separators=(",", ":"))
+        checksum = zlib.crc32(payload.encode("utf-8")) & 0xFFFFFFFF
+        return f"{checksum:08x} {payload}\n"
+
+    @staticmethod
+    def _decode(line: str) -> dict:
+        """Decode one journal line, raising ValueError if it is damaged"""
+        if not line.endswith("\n") or len(line) < 10 or line[8] != " ":
+            raise ValueError("truncated journal record")
+        payload = line[9:-1]
+        checksum = zlib.crc32(payload.encode("utf-8")) & 0xFFFFFFFF
+        if f"{checksum:08x}" != line[:8]:
+            raise ValueError("journal checksum mismatch")
+        return json.loads(payload)
+
+    def append(self, record: dict):
+        """Append a single record"""
+        self.append_many([record])
+
+    def append_many(self, records: List[dict]):
+        """Append several records with a single write and fsync"""
+        if not records:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = "".join(self._encode(r) for r in records)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self.offset = f.tell()
+        self.record_count += len(records)
+
+    def replay(self) -> Iterator[dict]:
+        """
+        Yield every intact record in order.
+        Replay stops at the first damaged record (e.g. a torn write from a
+        crash) and the damaged tail is truncated so later appends stay valid.
+        """
+        self.record_count = 0
+        self.offset = 0
+        if not os.path.exists(self.path):
+            return
+        valid_offset = 0
+        damaged = False
+        with open(self.path, "r", encoding="utf-8", newline="\n") as f:
+            while True:
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    record = self._decode(line)
+                except ValueError as e:
+                    print(f"Warning: Journal {self.path} damaged after {self.record_count} records: {e}")
+                    damaged = True
+                    break
+                valid_offset += len(line.encode("utf-8"))
+                self.record_count += 1
+                self.offset = valid_offset
+                yield record
+        if damaged:
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_offset)
+
+    def tail(self) -> Iterator[dict]:
+        """Yield intact records appended after `offset` (e.g. by another worker)"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            for raw in f:
+                try:
+                    record = self._decode(raw.decode("utf-8"))
+                except ValueError as e:
+                    print(f"Warning: Journal {self.path} damaged at offset {self.offset}: {e}")
+                    return
+                self.offset += len(raw)
+                self.record_count += 1
+                yield record
+
+    def reset(self):
+        """Discard all records (called after a snapshot has been written)"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self.record_count = 0
+        self.offset = 0
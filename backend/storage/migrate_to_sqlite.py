@@ -0,0 +1,45 @@
+"""
+Import the existing JSON stores into the SQLite backend
+Run from the backend directory:
+    python -m storage.migrate_to_sqlite [--db storage/civic_sense.db]
+Then start the API with STORAGE_BACKEND=sqlite.
+Safe to re-run: records are upserted and the audit log is replaced.
+"""
+import argparse
+
+from storage.data_store import DataStore
+from storage.auto_assignment_store import AutoAssignmentStore
+from storage.sqlite_store import SqliteDataStore, SqliteAutoAssignmentStore, SQLITE_PATH
+
+
+def migrate(db_path: str = SQLITE_PATH) -> dict:
+    """Copy grievances (snapshot + journal) and auto-assignment data into SQLite"""
+    source = DataStore()
+    target = SqliteDataStore(db_path)
+    target.add_many(list(source.grievances.values()))
+
+    auto_source = AutoAssignmentStore()
+    auto_target = SqliteAutoAssignmentStore(db_path)
+    with auto_target._transaction() as conn:
+        conn.execute("DELETE FROM auto_assignment_audit")
+    auto_target.add_many(auto_source.assignments, auto_source.audit_logs)
+    auto_target.update_config(auto_source.config)
+
+    return {
+        "grievances": len(source.grievances),
+        "auto_assignments": len(auto_source.assignments),
+        "audit_logs": len(auto_source.audit_logs)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import JSON storage files into SQLite")
+    parser.add_argument("--db", default=SQLITE_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    counts = migrate(args.db)
+    print(
+        f"Migrated {counts['grievances']} grievances, "
+        f"{counts['auto_assignments']} auto-assignments and "
+        f"{counts['audit_logs']} audit log entries into {args.db}"
+    )
@@ -0,0 +1,173 @@
+"""
+MinHash/LSH index for near-duplicate detection
+Each grievance gets a MinHash signature of the character 3-grams of its
+words when it is indexed, so reworded complaints ("potholes" / "pothole",
+"leaking" / "leakage") still look alike. The signature is split into
+MINHASH_BANDS bands of MINHASH_ROWS values; grievances sharing any whole
+band land in the same bucket and become candidates. Two texts with
+shingle Jaccard similarity s share a band with probability
+1 - (1 - s^rows)^bands: more bands raise recall, more rows make candidates
+fewer and more similar.
+
+Enable with DUPLICATE_ENGINE=minhash.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import os
+import zlib
+
+import numpy as np
+
+from storage.duplicate_index import DuplicateIndex, LOCATION_BONUS, _category_key
+
+MINHASH_BANDS = int(os.environ.get("MINHASH_BANDS", "32"))
+MINHASH_ROWS = int(os.environ.get("MINHASH_ROWS", "3"))
+MINHASH_SEED = int(os.environ.get("MINHASH_SEED", "1"))
+
+# Mersenne prime for the (a * x + b) mod p hash family; shingle hashes are
+# masked to 31 bits so a * x stays within uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_MASK = (1 << 31) - 1
+
+
+def shingles(tokens: Iterable[str], size: int = 3) -> Set[str]:
+    """Character n-grams of each word, padded so word starts and ends count"""
+    result = set()
+    for token in tokens:
+        padded = f" {token} "
+        for i in range(len(padded) - size + 1):
+            result.add(padded[i:i + size])
+    return result
+
+
+class MinHasher:
+    """Computes fixed-length MinHash signatures"""
+
+    def __init__(self, bands: int = MINHASH_BANDS, rows: int = MINHASH_ROWS, seed: int = MINHASH_SEED):
+        if bands < 1 or rows < 1:
+            raise ValueError("MINHASH_BANDS and MINHASH_ROWS must be positive")
+        self.bands = bands
+        self.rows = rows
+        self.num_perm = bands * rows
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=(self.num_perm, 1), dtype=np.uint64)
+        self._b = rng.randint(0, _PRIME, size=(self.num_perm, 1), dtype=np.uint64)
+
+    def signature(self, tokens: Iterable[str]) -> Optional[np.ndarray]:
+        """MinHash of the words' shingles, or None for text without any"""
+        return self.signature_of(shingles(tokens))
+
+    def signature_of(self, items: Set[str]) -> Optional[np.ndarray]:
+        """MinHash of a set of strings, or None if it is empty"""
+        if not items:
+            return None
+        # crc32 rather than hash(): stable across processes and restarts
+        values = np.fromiter((zlib.crc32(item.encode()) & _MASK for item in items), dtype=np.uint64, count=len(items))
+        return ((self._a * values + self._b) % _PRIME).min(axis=1).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """One bucket key per band"""
+        rows = self.rows
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+
+class MinHashIndex(DuplicateIndex):
+    """DuplicateIndex whose candidates come from LSH buckets and are scored by estimated Jaccard"""
+
+    def __init__(self, bands: int = MINHASH_BANDS, rows: int = MINHASH_ROWS, seed: int = MINHASH_SEED):
+        super().__init__()
+        self.hasher = MinHasher(bands, rows, seed)
+        # id -> signature (kept next to the grievance's tokens)
+        self._signatures: Dict[str, np.ndarray] = {}
+        # category -> (band, band values) -> grievance IDs
+        self._buckets: Dict[str, Dict[Tuple[int, bytes], Set[str]]] = {}
+
+    def _insert(self, doc_id: str, category: str, words: Set[str], location_key: str, fingerprint: int, seq: int):
+        super()._insert(doc_id, category, words, location_key, fingerprint, seq)
+        signature = self.hasher.signature(words)
+        if signature is None:
+            return
+        self._signatures[doc_id] = signature
+        buckets = self._buckets.setdefault(category, {})
+        for key in self.hasher.band_keys(signature):
+            buckets.setdefault(key, set()).add(doc_id)
+
+    def _remove(self, doc_id: str):
+        existing = self._docs.get(doc_id)
+        super()._remove(doc_id)
+        signature = self._signatures.pop(doc_id, None)
+        if existing is None or signature is None:
+            return
+        buckets = self._buckets.get(existing[0], {})
+        for key in self.hasher.band_keys(signature):
+            ids = buckets.get(key)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._signatures.clear()
+            self._buckets.clear()
+        super().clear()
+
+    def best_match(
+        self,
+        category,
+        tokens: Set[str],
+        location: Optional[str] = None,
+        floor: float = 0.0,
+        nearby: Optional[Dict[str, float]] = None
+    ) -> Tuple[Optional[str], float, int]:
+        """
+        The most similar candidate as (id, similarity, grievances scored).
+        Candidates are grievances sharing an LSH band, the location or a
+        `nearby` entry; similarity is the fraction of equal signature values
+        (an estimate of shingle Jaccard) plus the location bonus (see
+        DuplicateIndex.best_match), capped at 1. `floor` is accepted for
+        interface compatibility.
+        """
+        category = _category_key(category)
+        location_key = (location or "").lower()
+        signature = self.hasher.signature(tokens)
+
+        with self._lock:
+            candidates: Set[str] = set()
+            if signature is not None:
+                buckets = self._buckets.get(category, {})
+                for key in self.hasher.band_keys(signature):
+                    candidates.update(buckets.get(key, ()))
+            if location_key:
+                candidates.update(self._locations.get((category, location_key), ()))
+            for doc_id in nearby or ():
+                entry = self._docs.get(doc_id)
+                if entry is not None and entry[0] == category:
+                    candidates.add(doc_id)
+            if not candidates:
+                return None, 0.0, 0
+
+            # Insertion order, so ties go to the grievance indexed first
+            ordered = sorted(candidates, key=lambda doc_id: self._docs[doc_id][4])
+            similarities = np.zeros(len(ordered))
+            if signature is not None:
+                hashed = [i for i, doc_id in enumerate(ordered) if doc_id in self._signatures]
+                if hashed:
+                    matrix = np.stack([self._signatures[ordered[i]] for i in hashed])
+                    similarities[hashed] = (matrix == signature).mean(axis=1)
+            if location_key or nearby:
+                nearby = nearby or {}
+                similarities += np.fromiter(
+                    (
+                        max(LOCATION_BONUS if location_key and self._docs[doc_id][2] == location_key else 0.0,
+                            nearby.get(doc_id, 0.0))
+                        for doc_id in ordered
+                    ),
+                    dtype=float,
+                    count=len(ordered)
+                )
+            np.minimum(similarities, 1.0, out=similarities)
+
+        best = int(np.argmax(similarities))
+        if similarities[best] <= 0.0:
+            return None, 0.0, len(ordered)
+        return ordered[best], float(similarities[best]), len(ordered)
@@ -0,0 +1,151 @@
+"""
+Write-behind persistence for the JSON-backed stores
+Mutations only mark a store dirty; a background thread flushes every
+PERSIST_INTERVAL_MS, or as soon as PERSIST_MAX_BATCH mutations are
+pending, so disk I/O no longer runs inside request handlers.
+Callers that need durability can pass durable=True to flush on commit.
+"""
+from typing import Callable, Dict, List, Optional
+import atexit
+import os
+import threading
+import time
+
+WRITE_BEHIND_ENABLED = os.environ.get("PERSIST_WRITE_BEHIND", "1") != "0"
+FLUSH_INTERVAL_MS = int(os.environ.get("PERSIST_INTERVAL_MS", "200"))
+FLUSH_MAX_BATCH = int(os.environ.get("PERSIST_MAX_BATCH", "100"))
+
+
+class PersistTarget:
+    """A store registered with the persister"""
+
+    def __init__(self, name: str, flush_fn: Callable[[], None]):
+        self.name = name
+        self.flush_fn = flush_fn
+        self.dirty = 0
+
+
+class WriteBehindPersister:
+    """Coalesces dirty stores into one flush per interval or batch"""
+
+    def __init__(
+        self,
+        interval_ms: int = FLUSH_INTERVAL_MS,
+        max_batch: int = FLUSH_MAX_BATCH,
+        enabled: bool = WRITE_BEHIND_ENABLED
+    ):
+        self.interval = interval_ms / 1000
+        self.max_batch = max_batch
+        self.enabled = enabled
+        self._targets: List[PersistTarget] = []
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+        # Metrics
+        self._flush_count = 0
+        self._mutations_flushed = 0
+        self._max_batch_seen = 0
+        self._total_flush_ms = 0.0
+        self._max_flush_ms = 0.0
+        self._last_flush_ms = 0.0
+        self._errors = 0
+
+    def register(self, name: str, flush_fn: Callable[[], None]) -> PersistTarget:
+        """Register a store's flush function"""
+        target = PersistTarget(name, flush_fn)
+        with self._cond:
+            self._targets.append(target)
+        return target
+
+    def mark_dirty(self, target: PersistTarget, durable: bool = False):
+        """Record one mutation; flush immediately if durable or write-behind is off"""
+        with self._cond:
+            target.dirty += 1
+            self._pending += 1
+            if self.enabled and not durable:
+                self._ensure_thread()
+                if self._pending >= self.max_batch:
+                    self._cond.notify()
+                return
+        self.flush()
+
+    def flush(self):
+        """Synchronously flush every dirty store"""
+        with self._flush_lock:
+            with self._cond:
+                dirty = [t for t in self._targets if t.dirty]
+                mutations = sum(t.dirty for t in dirty)
+                for target in dirty:
+                    target.dirty = 0
+                self._pending = 0
+            if not dirty:
+                return
+
+            start = time.perf_counter()
+            for target in dirty:
+                try:
+                    target.flush_fn()
+                except Exception as e:
+                    self._errors += 1
+                    print(f"Warning: Could not flush {target.name}: {e}")
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            self._flush_count += 1
+            self._mutations_flushed += mutations
+            self._max_batch_seen = max(self._max_batch_seen, mutations)
+            self._total_flush_ms += elapsed_ms
+            self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+            self._last_flush_ms = elapsed_ms
+
+    def _ensure_thread(self):
+        if self._thread is None and not self._stopped:
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopped or self._pending >= self.max_batch,
+                    timeout=self.interval
+                )
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
+
+    def stop(self):
+        """Flush outstanding writes and stop the background thread"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=10)
+        self.flush()
+
+    def metrics(self) -> Dict:
+        """Flush latency and batching statistics"""
+        flushes = self._flush_count
+        return {
+            "write_behind": self.enabled,
+            "interval_ms": int(self.interval * 1000),
+            "max_batch": self.max_batch,
+            "pending_mutations": self._pending,
+            "flushes": flushes,
+            "mutations_flushed": self._mutations_flushed,
+            "avg_mutations_per_flush": round(self._mutations_flushed / flushes, 2) if flushes else 0,
+            "max_mutations_per_flush": self._max_batch_seen,
+            "last_flush_ms": round(self._last_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / flushes, 3) if flushes else 0,
+            "max_flush_ms": round(self._max_flush_ms, 3),
+            "errors": self._errors
+        }
+
+
+# Singleton instance
+persister = WriteBehindPersister()
+atexit.register(persister.stop)
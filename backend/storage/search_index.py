@@ -0,0 +1,150 @@
+"""
+Incremental inverted index for admin full-text search
+Documents are split into lowercase word tokens; every vocabulary token is
+also registered under its prefixes, so "pot" finds "pothole". Queries
+intersect the posting lists of all query terms and rank by a weighted
+IDF score.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import math
+import re
+import threading
+
+# Searched fields and their relevance weights
+SEARCH_FIELDS = {
+    "id": 3.0,
+    "submitter_name": 2.0,
+    "location": 1.5,
+    "description": 1.0,
+}
+
+# Prefix n-grams are kept for lengths 1..MAX_PREFIX_LENGTH
+MAX_PREFIX_LENGTH = 12
+
+# Score multiplier when a query term only matches a longer token
+PREFIX_MATCH_WEIGHT = 0.6
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric word tokens"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+class SearchIndex:
+    """Token -> {doc_id: field weight} postings plus a prefix map over the vocabulary"""
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._prefixes: Dict[str, Set[str]] = {}
+        self._doc_tokens: Dict[str, Tuple[int, Set[str]]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def _add_vocabulary(self, token: str):
+        for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+            self._prefixes.setdefault(token[:length], set()).add(token)
+
+    def _remove_vocabulary(self, token: str):
+        for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+            prefix = token[:length]
+            tokens = self._prefixes.get(prefix)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._prefixes[prefix]
+
+    def add(self, doc_id: str, fields: Dict[str, str]):
+        """Index (or re-index) a document; unchanged documents are skipped"""
+        fingerprint = hash(tuple(fields.get(f) or "" for f in SEARCH_FIELDS))
+        weights: Dict[str, float] = {}
+        for field, weight in SEARCH_FIELDS.items():
+            for token in set(tokenize(fields.get(field) or "")):
+                weights[token] = weights.get(token, 0.0) + weight
+
+        with self._lock:
+            existing = self._doc_tokens.get(doc_id)
+            if existing is not None and existing[0] == fingerprint:
+                return
+            if existing is not None:
+                self.remove(doc_id)
+            for token, weight in weights.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    # Publish the postings only once they are filled
+                    self._postings[token] = {doc_id: weight}
+                    self._add_vocabulary(token)
+                else:
+                    postings[doc_id] = weight
+            self._doc_tokens[doc_id] = (fingerprint, set(weights))
+
+    def remove(self, doc_id: str):
+        """Drop a document from the index"""
+        with self._lock:
+            existing = self._doc_tokens.pop(doc_id, None)
+            if existing is None:
+                return
+            for token in existing[1]:
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+                    self._remove_vocabulary(token)
+
+    def _expand(self, term: str) -> Set[str]:
+        """Vocabulary tokens that start with the query term (a copy of the prefix set)"""
+        if len(term) <= MAX_PREFIX_LENGTH:
+            return set(self._prefixes.get(term, ()))
+        candidates = self._prefixes.get(term[:MAX_PREFIX_LENGTH], set())
+        return {t for t in candidates if t.startswith(term)}
+
+    def _term_scores(self, term: str, restrict=None) -> Dict[str, float]:
+        """Best score of each document for one query term (optionally only for `restrict`)"""
+        total_docs = max(len(self._doc_tokens), 1)
+        scores: Dict[str, float] = {}
+        for token in self._expand(term):
+            postings = self._postings[token]
+            idf = math.log(1 + total_docs / len(postings))
+            factor = idf * (1.0 if token == term else PREFIX_MATCH_WEIGHT)
+            if restrict is not None and len(restrict) < len(postings):
+                matches = ((d, postings[d]) for d in restrict if d in postings)
+            else:
+                matches = postings.items()
+            for doc_id, weight in matches:
+                score = weight * factor
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        return scores
+
+    def search(self, query: str, candidates: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Documents containing every query term (as a token or token prefix),
+        optionally restricted to `candidates`, best match first.
+        """
+        with self._lock:
+            # Start with the most selective term so later terms only score survivors
+            terms = sorted(
+                set(tokenize(query)),
+                key=lambda t: sum(len(self._postings[token]) for token in self._expand(t))
+            )
+            if not terms:
+                return []
+
+            totals: Optional[Dict[str, float]] = None
+            for term in terms:
+                scores = self._term_scores(term, candidates if totals is None else totals)
+                if totals is None:
+                    totals = scores if candidates is None else {
+                        d: s for d, s in scores.items() if d in candidates
+                    }
+                else:
+                    totals = {d: s + scores[d] for d, s in totals.items() if d in scores}
+                if not totals:
+                    return []
+
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,113 @@
+"""
+Uniform grid index over grievance coordinates
+Points are bucketed into square cells of SPATIAL_CELL_METERS (measured
+along a meridian); a radius query only looks at the cells overlapping the
+circle's bounding box and then checks the great-circle distance.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+import math
+import os
+import threading
+
+SPATIAL_CELL_METERS = float(os.environ.get("SPATIAL_CELL_METERS", "200"))
+
+EARTH_RADIUS_METERS = 6371000.0
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_METERS / 180
+
+
+def haversine_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def valid_coordinates(lat: Optional[float], lng: Optional[float]) -> bool:
+    return (
+        lat is not None and lng is not None
+        and -90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0
+    )
+
+
+class SpatialIndex:
+    """grid cell -> grievance IDs, plus each grievance's coordinates"""
+
+    def __init__(self, cell_meters: float = SPATIAL_CELL_METERS):
+        self.cell_degrees = cell_meters / METERS_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._points: Dict[str, Tuple[float, float, Tuple[int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    def add(self, doc_id: str, lat: Optional[float], lng: Optional[float]):
+        """Index (or move) a grievance; one without valid coordinates is dropped"""
+        with self._lock:
+            existing = self._points.get(doc_id)
+            if existing is not None and existing[:2] == (lat, lng):
+                return
+            self._remove(doc_id)
+            if not valid_coordinates(lat, lng):
+                return
+            cell = self._cell(lat, lng)
+            self._cells.setdefault(cell, set()).add(doc_id)
+            self._points[doc_id] = (lat, lng, cell)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._remove(doc_id)
+
+    def _remove(self, doc_id: str):
+        existing = self._points.pop(doc_id, None)
+        if existing is None:
+            return
+        ids = self._cells.get(existing[2])
+        if ids is not None:
+            ids.discard(doc_id)
+            if not ids:
+                del self._cells[existing[2]]
+
+    def clear(self):
+        with self._lock:
+            self._cells.clear()
+            self._points.clear()
+
+    def within(self, lat: float, lng: float, radius_meters: float) -> List[Tuple[str, float]]:
+        """(id, distance in meters) of grievances within the radius, nearest first"""
+        if not valid_coordinates(lat, lng) or radius_meters < 0:
+            return []
+        lat_span = radius_meters / METERS_PER_DEGREE
+        # Longitude degrees shrink with cos(latitude); clamp near the poles
+        lng_span = min(lat_span / max(math.cos(math.radians(lat)), 0.01), 180.0)
+        low_lat, low_lng = self._cell(lat - lat_span, lng - lng_span)
+        high_lat, high_lng = self._cell(lat + lat_span, lng + lng_span)
+
+        results = []
+        with self._lock:
+            if (high_lat - low_lat + 1) * (high_lng - low_lng + 1) > len(self._cells):
+                # Fewer occupied cells than cells in the box: walk the occupied ones
+                cells = [
+                    ids for (row, col), ids in self._cells.items()
+                    if low_lat <= row <= high_lat and low_lng <= col <= high_lng
+                ]
+            else:
+                cells = [
+                    self._cells[(row, col)]
+                    for row in range(low_lat, high_lat + 1)
+                    for col in range(low_lng, high_lng + 1)
+                    if (row, col) in self._cells
+                ]
+            for ids in cells:
+                for doc_id in ids:
+                    point_lat, point_lng, _ = self._points[doc_id]
+                    distance = haversine_meters(lat, lng, point_lat, point_lng)
+                    if distance <= radius_meters:
+                        results.append((doc_id, distance))
+        results.sort(key=lambda item: item[1])
+        return results
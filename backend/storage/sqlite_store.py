@@ -0,0 +1,683 @@
+"""
+SQLite storage backend (stdlib sqlite3, WAL mode)
+Same interface as the JSON-backed stores; filters, sorting and paging are
+pushed down into SQL so the dataset does not have to fit in memory.
+Enable with STORAGE_BACKEND=sqlite.
+"""
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import os
+
+from models.schemas import Grievance, Status, TimelineEntry
+from models.auto_assignment_schemas import (
+    AutoAssignmentData,
+    AutoAssignmentAuditLog,
+    AutoAssignmentStatus,
+    AutoAssignmentConfig
+)
+from storage.aggregates import (
+    AssignmentCounters,
+    GrievanceCounters,
+    TimeRollups,
+    GRIEVANCE_DIMENSIONS,
+    assignment_values,
+    counter_values
+)
+from storage.base_store import BaseDataStore
+from storage.duplicate_index import DuplicateIndex, create_duplicate_index
+from storage.spatial_index import SpatialIndex
+from storage.search_index import tokenize
+
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "storage/civic_sense.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS grievances (
+    id TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    department TEXT,
+    user_id TEXT,
+    submitter_email TEXT,
+    submitter_name TEXT,
+    description TEXT NOT NULL,
+    location TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_grievances_category ON grievances(category);
+CREATE INDEX IF NOT EXISTS idx_grievances_status ON grievances(status);
+CREATE INDEX IF NOT EXISTS idx_grievances_priority ON grievances(priority);
+CREATE INDEX IF NOT EXISTS idx_grievances_department ON grievances(department);
+CREATE INDEX IF NOT EXISTS idx_grievances_user_id ON grievances(user_id);
+CREATE INDEX IF NOT EXISTS idx_grievances_email ON grievances(submitter_email);
+CREATE INDEX IF NOT EXISTS idx_grievances_created ON grievances(created_at, id);
+
+-- Full-text index over the searchable columns, kept in sync by triggers
+CREATE VIRTUAL TABLE IF NOT EXISTS grievances_fts USING fts5(
+    id, description, location, submitter_name,
+    content='grievances', content_rowid='rowid'
+);
+CREATE TRIGGER IF NOT EXISTS grievances_fts_insert AFTER INSERT ON grievances BEGIN
+    INSERT INTO grievances_fts(rowid, id, description, location, submitter_name)
+    VALUES (new.rowid, new.id, new.description, new.location, new.submitter_name);
+END;
+CREATE TRIGGER IF NOT EXISTS grievances_fts_delete AFTER DELETE ON grievances BEGIN
+    INSERT INTO grievances_fts(grievances_fts, rowid, id, description, location, submitter_name)
+    VALUES ('delete', old.rowid, old.id, old.description, old.location, old.submitter_name);
+END;
+CREATE TRIGGER IF NOT EXISTS grievances_fts_update AFTER UPDATE ON grievances BEGIN
+    INSERT INTO grievances_fts(grievances_fts, rowid, id, description, location, submitter_name)
+    VALUES ('delete', old.rowid, old.id, old.description, old.location, old.submitter_name);
+    INSERT INTO grievances_fts(rowid, id, description, location, submitter_name)
+    VALUES (new.rowid, new.id, new.description, new.location, new.submitter_name);
+END;
+
+CREATE TABLE IF NOT EXISTS auto_assignments (
+    grievance_id TEXT PRIMARY KEY,
+    auto_status TEXT NOT NULL,
+    confidence_score REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_auto_assignments_status ON auto_assignments(auto_status);
+
+CREATE TABLE IF NOT EXISTS auto_assignment_audit (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    grievance_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_grievance ON auto_assignment_audit(grievance_id, timestamp);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+-- Per-table change counters, so a store only reloads when its own table changed
+CREATE TABLE IF NOT EXISTS table_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO table_versions (name, version) VALUES ('grievances', 0), ('auto_assignments', 0);
+CREATE TRIGGER IF NOT EXISTS grievances_version_insert AFTER INSERT ON grievances BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE name = 'grievances';
+END;
+CREATE TRIGGER IF NOT EXISTS grievances_version_update AFTER UPDATE ON grievances BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE name = 'grievances';
+END;
+CREATE TRIGGER IF NOT EXISTS grievances_version_delete AFTER DELETE ON grievances BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE name = 'grievances';
+END;
+CREATE TRIGGER IF NOT EXISTS auto_assignments_version_insert AFTER INSERT ON auto_assignments BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE name = 'auto_assignments';
+END;
+CREATE TRIGGER IF NOT EXISTS auto_assignments_version_update AFTER UPDATE ON auto_assignments BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE name = 'auto_assignments';
+END;
+CREATE TRIGGER IF NOT EXISTS auto_assignments_version_delete AFTER DELETE ON auto_assignments BEGIN
+    UPDATE table_versions SET version = version + 1 WHERE name = 'auto_assignments';
+END;
+"""
+
+# Grievance fields copied into their own columns for filtering
+COLUMN_FIELDS = (
+    "category", "status", "priority", "department", "user_id",
+    "submitter_email", "submitter_name", "description", "location",
+    "created_at", "updated_at"
+)
+
+
+def connect(db_path: str = SQLITE_PATH) -> sqlite3.Connection:
+    """Open a connection in WAL mode and make sure the schema exists"""
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.executescript(SCHEMA)
+    # Databases created before the full-text index existed need one rebuild
+    if conn.execute("SELECT COUNT(*) FROM grievances_fts_docsize").fetchone()[0] == 0:
+        conn.execute("INSERT INTO grievances_fts(grievances_fts) VALUES ('rebuild')")
+    return conn
+
+
+class _SqliteStore:
+    """Shared connection handling: one connection guarded by a lock"""
+
+    # The table (in table_versions) whose in-process state this store keeps
+    watched_table = ""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = connect(db_path)
+        self._lock = threading.RLock()
+        self._data_version = None
+        self._table_version = None
+
+    def _seed_counters(self):
+        """Rebuild the in-process aggregates from the tables"""
+
+    def _reload(self):
+        """Refresh in-process state after another connection changed the watched table"""
+        self._seed_counters()
+
+    def _current_table_version(self) -> int:
+        return self._conn.execute(
+            "SELECT version FROM table_versions WHERE name = ?", (self.watched_table,)
+        ).fetchone()[0]
+
+    def _sync(self):
+        """
+        Reload when another connection (e.g. worker) has committed to the
+        watched table. data_version changes on any other connection's commit,
+        including this process's other stores, so the table's own change
+        counter decides.
+        """
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return
+            self._data_version = version
+            table_version = self._current_table_version()
+            if table_version != self._table_version:
+                self._reload()
+                self._table_version = table_version
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Catch up with other connections first; our own writes are tracked incrementally
+                self._sync()
+                yield self._conn
+                self._table_version = self._current_table_version()
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+
+class SqliteDataStore(_SqliteStore, BaseDataStore):
+    """Grievance storage in a SQLite table"""
+
+    backend_name = "sqlite"
+    watched_table = "grievances"
+
+    def __init__(self, db_path: str = SQLITE_PATH):
+        super().__init__(db_path)
+        self.counters = GrievanceCounters()
+        self.rollups = TimeRollups()
+        # Built on first use and rebuilt after other connections change grievances
+        self.duplicate_index = create_duplicate_index()
+        self.spatial_index = SpatialIndex()
+        self._memory_indexes_stale = True
+        self._sync()
+
+    def _seed_counters(self):
+        """Load the analytics counters and rollups with GROUP BY queries"""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM grievances").fetchone()[0]
+            counts = {
+                dimension: dict(self._conn.execute(
+                    f"SELECT {dimension}, COUNT(*) FROM grievances GROUP BY {dimension}"
+                ).fetchall())
+                for dimension in GRIEVANCE_DIMENSIONS
+            }
+            self.counters.seed(total, counts)
+            created = self._conn.execute(
+                "SELECT substr(created_at, 1, 13), category, department, COUNT(*)"
+                " FROM grievances GROUP BY 1, 2, 3"
+            ).fetchall()
+            transitions = self._conn.execute(
+                "SELECT substr(json_extract(t.value, '$.timestamp'), 1, 13), json_extract(t.value, '$.status'), COUNT(*)"
+                " FROM grievances, json_each(grievances.data, '$.timeline') AS t GROUP BY 1, 2"
+            ).fetchall()
+            self.rollups.seed(created, transitions)
+
+    def _reload(self):
+        """Grievance rows changed elsewhere: reseed the counters, rebuild the memory indexes on next use"""
+        with self._lock:
+            self._memory_indexes_stale = True
+            self._seed_counters()
+
+    def _current_values(self, conn: sqlite3.Connection, grievance_id: str) -> Optional[Dict]:
+        row = conn.execute(
+            f"SELECT {', '.join(GRIEVANCE_DIMENSIONS)} FROM grievances WHERE id = ?", (grievance_id,)
+        ).fetchone()
+        return dict(zip(GRIEVANCE_DIMENSIONS, row)) if row else None
+
+    def _track(self, grievance: Grievance, previous: Optional[Dict]):
+        """Apply a committed write to the counters and rollups"""
+        current = counter_values(grievance)
+        self.counters.apply(previous, current)
+        self.rollups.move_created(previous, current, grievance.created_at)
+        if previous is None:
+            for entry in grievance.timeline:
+                self.rollups.record_transition(entry.status, entry.timestamp)
+        if not self._memory_indexes_stale:
+            self.duplicate_index.add(grievance.id, grievance.category, grievance.description, grievance.location)
+            self.spatial_index.add(grievance.id, grievance.lat, grievance.lng)
+
+    @staticmethod
+    def _row_values(grievance: Grievance) -> tuple:
+        values = []
+        for field in COLUMN_FIELDS:
+            value = getattr(grievance, field)
+            values.append(value.value if hasattr(value, "value") else value)
+        return (grievance.id, *values, grievance.model_dump_json())
+
+    def _write(self, conn: sqlite3.Connection, grievance: Grievance):
+        # An upsert (not INSERT OR REPLACE) so the full-text update trigger fires
+        columns = ("id",) + COLUMN_FIELDS + ("data",)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in columns[1:])
+        conn.execute(
+            f"INSERT INTO grievances ({', '.join(columns)}) VALUES ({placeholders})"
+            f" ON CONFLICT(id) DO UPDATE SET {updates}",
+            self._row_values(grievance)
+        )
+
+    def _load(self, conn: sqlite3.Connection, grievance_id: str) -> Optional[Grievance]:
+        row = conn.execute("SELECT data FROM grievances WHERE id = ?", (grievance_id,)).fetchone()
+        return Grievance.model_validate_json(row[0]) if row else None
+
+    def _select(self, where: str = "", params: tuple = (), suffix: str = "") -> List[Grievance]:
+        sql = "SELECT data FROM grievances"
+        if where:
+            sql += f" WHERE {where}"
+        rows = self._query(f"{sql} {suffix}", params)
+        return [Grievance.model_validate_json(row[0]) for row in rows]
+
+    @staticmethod
+    def _criteria_sql(criteria: Dict, prefix: str = "") -> tuple:
+        clauses, params = [], []
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            if field not in COLUMN_FIELDS:
+                raise ValueError(f"Field '{field}' is not indexed")
+            clauses.append(f"{prefix}{field} = ?")
+            params.append(value.value if hasattr(value, "value") else value)
+        return " AND ".join(clauses), tuple(params)
+
+    def create_grievance(self, grievance: Grievance, durable: bool = False) -> Grievance:
+        """Store a new grievance (SQLite commits synchronously, so always durable)"""
+        with self._lock:
+            with self._transaction() as conn:
+                previous = self._current_values(conn, grievance.id)
+                self._write(conn, grievance)
+            self._track(grievance, previous)
+        return grievance
+
+    def add_many(self, grievances: List[Grievance]):
+        """Bulk insert (used by the JSON migration tool)"""
+        with self._transaction() as conn:
+            for grievance in grievances:
+                self._write(conn, grievance)
+        self._reload()
+
+    def get_grievance(self, grievance_id: str) -> Optional[Grievance]:
+        """Retrieve grievance by ID"""
+        with self._lock:
+            return self._load(self._conn, grievance_id)
+
+    def get_all_grievances(self) -> List[Grievance]:
+        """Get all grievances for admin view"""
+        return self._select()
+
+    def get_grievances(self, grievance_ids: Iterable[str]) -> List[Grievance]:
+        """The grievances with these IDs (unknown IDs are skipped), in one query"""
+        # One JSON array parameter instead of a placeholder per ID (SQLite limits those)
+        return self._select("id IN (SELECT value FROM json_each(?))", (json.dumps(list(grievance_ids)),))
+
+    def update_status(
+        self,
+        grievance_id: str,
+        new_status: Status,
+        remarks: str = None,
+        durable: bool = False
+    ) -> Optional[Grievance]:
+        """Update grievance status and add timeline entry"""
+        with self._lock:
+            with self._transaction() as conn:
+                grievance = self._load(conn, grievance_id)
+                if not grievance:
+                    return None
+                previous = counter_values(grievance)
+                now = datetime.now().isoformat()
+                grievance.status = new_status
+                grievance.updated_at = now
+                grievance.timeline.append(TimelineEntry(status=new_status, timestamp=now, remarks=remarks))
+                self._write(conn, grievance)
+            self.rollups.record_transition(new_status, now)
+            self._track(grievance, previous)
+        return grievance
+
+    def update_grievance(self, grievance_id: str, durable: bool = False, **fields) -> Optional[Grievance]:
+        """Update plain fields (e.g. department, location) of a grievance"""
+        with self._lock:
+            with self._transaction() as conn:
+                grievance = self._load(conn, grievance_id)
+                if not grievance:
+                    return None
+                previous = counter_values(grievance)
+                for field, value in fields.items():
+                    if field not in Grievance.model_fields or field in ("id", "status", "timeline", "created_at"):
+                        raise ValueError(f"Field '{field}' cannot be updated directly")
+                    setattr(grievance, field, value)
+                grievance.updated_at = datetime.now().isoformat()
+                self._write(conn, grievance)
+            self._track(grievance, previous)
+        return grievance
+
+    def find_ids(self, **criteria) -> Set[str]:
+        """IDs matching every given field == value criterion"""
+        where, params = self._criteria_sql(criteria)
+        sql = "SELECT id FROM grievances" + (f" WHERE {where}" if where else "")
+        return {row[0] for row in self._query(sql, params)}
+
+    def filter_grievances(self, **criteria) -> List[Grievance]:
+        """Get grievances matching field criteria"""
+        where, params = self._criteria_sql(criteria)
+        return self._select(where, params)
+
+    def query_grievances(
+        self,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        status: Optional[str] = None,
+        area: Optional[str] = None,
+        search: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        after: Optional[Tuple[str, str]] = None,
+        sort: Optional[str] = None
+    ) -> List[Grievance]:
+        """
+        Filtered grievances with optional LIMIT/OFFSET.
+        Sorted newest first, or by bm25 relevance when searching (unless sort="newest").
+        """
+        where, params = self._criteria_sql(
+            {"category": category, "priority": priority, "status": status}, prefix="g."
+        )
+        clauses = [where] if where else []
+        params = list(params)
+        source = "grievances g"
+        order = "g.created_at DESC, g.id DESC"
+
+        if area:
+            clauses.append("instr(lower(g.location), ?) > 0")
+            params.append(area.lower())
+
+        if search:
+            terms = tokenize(search)
+            if not terms:
+                return []
+            source += " JOIN grievances_fts ON grievances_fts.rowid = g.rowid"
+            clauses.append("grievances_fts MATCH ?")
+            params.append(" ".join(f'"{term}"*' for term in terms))
+            if sort != "newest":
+                # Column weights: id, description, location, submitter_name
+                order = "bm25(grievances_fts, 3.0, 1.0, 1.5, 2.0), " + order
+
+        if after is not None and not (search and sort != "newest"):
+            clauses.append("(g.created_at, g.id) < (?, ?)")
+            params.extend(after)
+
+        sql = f"SELECT g.data FROM {source}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit if limit is not None else -1, offset])
+        return [Grievance.model_validate_json(row[0]) for row in self._query(sql, tuple(params))]
+
+    def _refresh_memory_indexes(self):
+        """(Re)build the duplicate and spatial indexes from the table when stale"""
+        self._sync()
+        with self._lock:
+            if self._memory_indexes_stale:
+                self.duplicate_index.clear()
+                self.spatial_index.clear()
+                for gid, category, description, location, lat, lng in self._conn.execute(
+                    "SELECT id, category, description, location,"
+                    " json_extract(data, '$.lat'), json_extract(data, '$.lng') FROM grievances"
+                ):
+                    self.duplicate_index.add(gid, category, description, location)
+                    self.spatial_index.add(gid, lat, lng)
+                self._memory_indexes_stale = False
+
+    def get_duplicate_index(self) -> DuplicateIndex:
+        """The duplicate-detection index, (re)built from the table when stale"""
+        self._refresh_memory_indexes()
+        return self.duplicate_index
+
+    def get_spatial_index(self) -> SpatialIndex:
+        """The grid index over grievance coordinates, (re)built from the table when stale"""
+        self._refresh_memory_indexes()
+        return self.spatial_index
+
+    def get_descriptions_for_category(self, category: str) -> List[tuple]:
+        """Get all descriptions and locations for a category (for duplicate check)"""
+        return self._query(
+            "SELECT id, description, location FROM grievances WHERE category = ?",
+            (category,)
+        )
+
+    def get_incident_rows(self, category: str) -> List[tuple]:
+        """(id, description, location, lat, lng, created_at) of a category, oldest first (for clustering)"""
+        return self._query(
+            "SELECT id, description, location, json_extract(data, '$.lat'), json_extract(data, '$.lng'), created_at"
+            " FROM grievances WHERE category = ? ORDER BY created_at, id",
+            (category,)
+        )
+
+    def set_incident_ids(self, assignments: Dict[str, Optional[str]]) -> int:
+        """Write incident IDs back in one transaction; returns how many grievances changed"""
+        with self._transaction() as conn:
+            # Derived data: updated_at is left alone
+            cursor = conn.executemany(
+                "UPDATE grievances SET data = json_set(data, '$.incident_id', ?)"
+                " WHERE id = ? AND json_extract(data, '$.incident_id') IS NOT ?",
+                ((incident_id, grievance_id, incident_id) for grievance_id, incident_id in assignments.items())
+            )
+            return cursor.rowcount
+
+    def get_user_grievances(self, user_id: str) -> List[Grievance]:
+        """Get all grievances submitted by a specific user"""
+        return self._select("user_id IS ?", (user_id,))
+
+    def get_grievances_by_email(self, email: str) -> List[Grievance]:
+        """Get all grievances whose submitter email matches"""
+        return self._select("submitter_email IS ?", (email,))
+
+
+class _AssignmentsView(Mapping):
+    """Read-only dict-like view of the auto_assignments table"""
+
+    def __init__(self, store: "SqliteAutoAssignmentStore"):
+        self._store = store
+
+    def __getitem__(self, grievance_id: str) -> AutoAssignmentData:
+        data = self._store.get_auto_assignment(grievance_id)
+        if data is None:
+            raise KeyError(grievance_id)
+        return data
+
+    def __contains__(self, grievance_id) -> bool:
+        rows = self._store._query("SELECT 1 FROM auto_assignments WHERE grievance_id = ?", (grievance_id,))
+        return bool(rows)
+
+    def __iter__(self):
+        return iter([row[0] for row in self._store._query("SELECT grievance_id FROM auto_assignments")])
+
+    def __len__(self) -> int:
+        return self._store._query("SELECT COUNT(*) FROM auto_assignments")[0][0]
+
+    def items(self):
+        rows = self._store._query("SELECT grievance_id, data FROM auto_assignments")
+        return [(gid, AutoAssignmentData.model_validate_json(data)) for gid, data in rows]
+
+
+class SqliteAutoAssignmentStore(_SqliteStore):
+    """Auto-assignment data, audit logs and config in SQLite tables"""
+
+    watched_table = "auto_assignments"
+
+    def __init__(self, db_path: str = SQLITE_PATH):
+        super().__init__(db_path)
+        self.assignments = _AssignmentsView(self)
+        self.counters = AssignmentCounters()
+        self._sync()
+
+    def _seed_counters(self):
+        """Load the status counts and confidence sum with two aggregate queries"""
+        with self._lock:
+            total, confidence_sum = self._conn.execute(
+                "SELECT COUNT(*), SUM(confidence_score) FROM auto_assignments"
+            ).fetchone()
+            by_status = dict(self._conn.execute(
+                "SELECT auto_status, COUNT(*) FROM auto_assignments GROUP BY auto_status"
+            ).fetchall())
+            self.counters.seed(total, confidence_sum, by_status)
+
+    def _current_values(self, conn: sqlite3.Connection, grievance_id: str):
+        row = conn.execute(
+            "SELECT auto_status, confidence_score FROM auto_assignments WHERE grievance_id = ?",
+            (grievance_id,)
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def _write_assignment(self, conn: sqlite3.Connection, grievance_id: str, data: AutoAssignmentData):
+        conn.execute(
+            "INSERT OR REPLACE INTO auto_assignments (grievance_id, auto_status, confidence_score, data)"
+            " VALUES (?, ?, ?, ?)",
+            (grievance_id, data.auto_status.value, data.confidence_score, data.model_dump_json())
+        )
+
+    def _write_audit_log(self, conn: sqlite3.Connection, log: AutoAssignmentAuditLog):
+        conn.execute(
+            "INSERT INTO auto_assignment_audit (grievance_id, timestamp, data) VALUES (?, ?, ?)",
+            (log.grievance_id, log.timestamp, log.model_dump_json())
+        )
+
+    def create_auto_assignment(
+        self,
+        grievance_id: str,
+        data: AutoAssignmentData
+    ) -> AutoAssignmentData:
+        """Create auto-assignment record for a grievance"""
+        with self._lock:
+            with self._transaction() as conn:
+                previous = self._current_values(conn, grievance_id)
+                self._write_assignment(conn, grievance_id, data)
+            self.counters.apply(previous, assignment_values(data))
+        return data
+
+    def add_many(self, assignments: Dict[str, AutoAssignmentData], logs: List[AutoAssignmentAuditLog]):
+        """Bulk insert (used by the JSON migration tool)"""
+        with self._transaction() as conn:
+            for grievance_id, data in assignments.items():
+                self._write_assignment(conn, grievance_id, data)
+            for log in logs:
+                self._write_audit_log(conn, log)
+        self._seed_counters()
+
+    def get_auto_assignment(self, grievance_id: str) -> Optional[AutoAssignmentData]:
+        """Get auto-assignment data for a grievance"""
+        rows = self._query("SELECT data FROM auto_assignments WHERE grievance_id = ?", (grievance_id,))
+        return AutoAssignmentData.model_validate_json(rows[0][0]) if rows else None
+
+    def update_auto_status(
+        self,
+        grievance_id: str,
+        new_status: AutoAssignmentStatus
+    ) -> Optional[AutoAssignmentData]:
+        """Update the auto-assignment status"""
+        with self._lock:
+            with self._transaction() as conn:
+                row = conn.execute(
+                    "SELECT data FROM auto_assignments WHERE grievance_id = ?", (grievance_id,)
+                ).fetchone()
+                if not row:
+                    return None
+                data = AutoAssignmentData.model_validate_json(row[0])
+                previous = assignment_values(data)
+                data.auto_status = new_status
+                self._write_assignment(conn, grievance_id, data)
+            self.counters.apply(previous, assignment_values(data))
+        return data
+
+    def get_pending_assignments(self) -> Dict[str, AutoAssignmentData]:
+        """Get all pending auto-assignment records"""
+        return self.get_assignments_by_status(AutoAssignmentStatus.PENDING_APPROVAL)
+
+    def get_assignments_by_status(
+        self,
+        status: AutoAssignmentStatus
+    ) -> Dict[str, AutoAssignmentData]:
+        """Get assignments by status"""
+        rows = self._query(
+            "SELECT grievance_id, data FROM auto_assignments WHERE auto_status = ?",
+            (status.value,)
+        )
+        return {gid: AutoAssignmentData.model_validate_json(data) for gid, data in rows}
+
+    def add_audit_log(self, log: AutoAssignmentAuditLog):
+        """Add an audit log entry"""
+        with self._transaction() as conn:
+            self._write_audit_log(conn, log)
+
+    def get_audit_logs(
+        self,
+        grievance_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[AutoAssignmentAuditLog]:
+        """Get audit logs, optionally filtered by grievance ID (newest first)"""
+        if grievance_id:
+            rows = self._query(
+                "SELECT data FROM auto_assignment_audit WHERE grievance_id = ?"
+                " ORDER BY timestamp DESC LIMIT ?",
+                (grievance_id, limit)
+            )
+        else:
+            rows = self._query(
+                "SELECT data FROM auto_assignment_audit ORDER BY timestamp DESC LIMIT ?",
+                (limit,)
+            )
+        return [AutoAssignmentAuditLog.model_validate_json(row[0]) for row in rows]
+
+    def flush(self):
+        """Writes are committed synchronously; nothing is queued"""
+
+    def get_config(self) -> AutoAssignmentConfig:
+        """Get current configuration"""
+        rows = self._query("SELECT value FROM settings WHERE key = 'auto_assignment_config'")
+        return AutoAssignmentConfig.model_validate_json(rows[0][0]) if rows else AutoAssignmentConfig()
+
+    def update_config(self, new_config: AutoAssignmentConfig) -> AutoAssignmentConfig:
+        """Update configuration"""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('auto_assignment_config', ?)",
+                (new_config.model_dump_json(),)
+            )
+        return new_config
+
+    def get_stats(self) -> Dict:
+        """Get statistics about auto-assignments (from the running counters)"""
+        self._sync()
+        return self.counters.stats()
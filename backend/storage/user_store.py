@@ -1,73 +1,144 @@
 import json
 import os
-from typing import Optional, Dict, List
+import time
+import uuid
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
 
+from storage.coordination import FileLock, atomic_write_json
+
 # File path for user storage
 USERS_FILE = os.path.join(os.path.dirname(__file__), "users.json")
 
-def _load_users() -> Dict[str, dict]:
-    """Load users from JSON file"""
-    if os.path.exists(USERS_FILE):
+# How often (seconds) to stat users.json for changes made by other workers
+USER_REFRESH_INTERVAL = float(os.environ.get("USER_STORE_REFRESH_SECONDS", "1.0"))
+
+
+class UserStore:
+    """users.json cached in memory and indexed by email and id"""
+
+    def __init__(self, path: str = USERS_FILE, refresh_interval: float = USER_REFRESH_INTERVAL):
+        self.path = path
+        self.refresh_interval = refresh_interval
+        # Serializes read-modify-write of users.json across threads and workers
+        self._lock = FileLock(f"{path}.lock")
+        self._by_email: Dict[str, dict] = {}
+        self._by_id: Dict[str, dict] = {}
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._checked_at = 0.0
+
+    def _file_stamp(self) -> Optional[Tuple[int, int, int]]:
         try:
-            with open(USERS_FILE, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _refresh(self, force: bool = False):
+        """Reload users.json if it changed on disk (stat at most once per refresh_interval)"""
+        now = time.monotonic()
+        if not force and self._checked_at and now - self._checked_at < self.refresh_interval:
+            return
+        self._checked_at = now
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return
+        users = {}
+        if stamp is not None:
+            try:
+                with open(self.path, 'r') as f:
+                    users = json.load(f)
+            except Exception as e:
+                print(f"Warning: Could not load users: {e}")
+                return
+        self._set(users, stamp)
+
+    def _set(self, users: Dict[str, dict], stamp):
+        self._by_email = users
+        self._by_id = {u["id"]: u for u in users.values() if u.get("id")}
+        self._stamp = stamp
+
+    def _new_id(self) -> str:
+        """USR<timestamp><random>, re-drawn until unused (called with the lock held)"""
+        while True:
+            user_id = f"USR{datetime.now().strftime('%Y%m%d%H%M%S')}{uuid.uuid4().hex[:6].upper()}"
+            if user_id not in self._by_id:
+                return user_id
+
+    def _lookup(self, index: str, key: str) -> Optional[dict]:
+        self._refresh()
+        user = getattr(self, index).get(key)
+        if user is None:
+            # A miss may be a user another worker just created
+            self._refresh(force=True)
+            user = getattr(self, index).get(key)
+        return dict(user) if user else None
+
+    def get_by_email(self, email: str) -> Optional[dict]:
+        return self._lookup("_by_email", email.lower())
+
+    def get_by_id(self, user_id: str) -> Optional[dict]:
+        return self._lookup("_by_id", user_id)
+
+    def create(self, email: str, hashed_password: str, name: str, role: str = "user") -> dict:
+        """Add a user and write users.json through (atomically) before returning"""
+        with self._lock:
+            self._refresh(force=True)
+            email_lower = email.lower()
+
+            if email_lower in self._by_email:
+                raise ValueError("User already exists")
+
+            user = {
+                "id": self._new_id(),
+                "email": email_lower,
+                "password": hashed_password,
+                "name": name,
+                "role": role,
+                "created_at": datetime.now().isoformat()
+            }
+
+            users = {**self._by_email, email_lower: user}
+            atomic_write_json(self.path, users, indent=2, default=str)
+            self._set(users, self._file_stamp())
+            return dict(user)
+
+    def all(self) -> List[dict]:
+        """All users (without passwords)"""
+        self._refresh()
+        return [{k: v for k, v in u.items() if k != "password"} for u in self._by_email.values()]
+
+    def is_empty(self) -> bool:
+        self._refresh(force=True)
+        return not self._by_email
+
 
-def _save_users(users: Dict[str, dict]):
-    """Save users to JSON file"""
-    with open(USERS_FILE, 'w') as f:
-        json.dump(users, f, indent=2, default=str)
+# Singleton instance
+user_store = UserStore()
 
 def get_user_by_email(email: str) -> Optional[dict]:
     """Get user by email"""
-    users = _load_users()
-    return users.get(email.lower())
+    return user_store.get_by_email(email)
 
 def get_user_by_id(user_id: str) -> Optional[dict]:
     """Get user by ID"""
-    users = _load_users()
-    for user in users.values():
-        if user.get("id") == user_id:
-            return user
-    return None
+    return user_store.get_by_id(user_id)
 
 def create_user(email: str, hashed_password: str, name: str, role: str = "user") -> dict:
     """Create a new user"""
-    users = _load_users()
-    email_lower = email.lower()
-    
-    if email_lower in users:
-        raise ValueError("User already exists")
-    
-    user_id = f"USR{datetime.now().strftime('%Y%m%d%H%M%S')}{len(users):03d}"
-    
-    user = {
-        "id": user_id,
-        "email": email_lower,
-        "password": hashed_password,
-        "name": name,
-        "role": role,
-        "created_at": datetime.now().isoformat()
-    }
-    
-    users[email_lower] = user
-    _save_users(users)
-    return user
+    return user_store.create(email, hashed_password, name, role)
 
 def get_all_users() -> List[dict]:
     """Get all users (without passwords)"""
-    users = _load_users()
-    return [{k: v for k, v in u.items() if k != "password"} for u in users.values()]
+    return user_store.all()
 
 # Initialize with default admin if no users exist
 def init_default_admin():
     """Create default admin user if none exists"""
     import bcrypt
-    users = _load_users()
-    if not users:
-        hashed = bcrypt.hashpw("admin123".encode(), bcrypt.gensalt()).decode()
-        create_user("admin@civicsense.gov.in", hashed, "Admin User", "admin")
-        print("Default admin created: admin@civicsense.gov.in / admin123")
+    # Held across the check so concurrent workers create the admin only once
+    with user_store._lock:
+        if user_store.is_empty():
+            hashed = bcrypt.hashpw("admin123".encode(), bcrypt.gensalt()).decode()
+            create_user("admin@civicsense.gov.in", hashed, "Admin User", "admin")
+            print("Default admin created: admin@civicsense.gov.in / admin123")
@@ -0,0 +1,10 @@
+"""
+Tests run the API against a throwaway SQLite database, so they never touch
+the JSON files in storage/. The store singletons are created at import
+time, so this has to happen before any test module imports them.
+"""
+import os
+import tempfile
+
+os.environ["STORAGE_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(), "civic_sense.db")
@@ -0,0 +1,46 @@
+"""
+The auto-assignment queue reads a fixed number of SQLite statements,
+however many grievances are queued
+"""
+from fastapi.testclient import TestClient
+
+import main
+from storage.auto_assignment_store import auto_assignment_store
+from storage.data_store import data_store
+
+client = TestClient(main.app)
+ADMIN = {"Authorization": "Bearer demo-token"}
+
+
+def submit(i: int):
+    response = client.post("/api/grievances", json={
+        "category": "water",
+        "description": f"Water pipe leakage number {i} on 3rd street, drinking water contaminated",
+        "location": f"Ward {i}",
+        "submitter_email": "citizen@example.com",
+    })
+    assert response.status_code == 200, response.text
+
+
+def queue_statements() -> tuple:
+    statements = []
+    for store in (data_store, auto_assignment_store):
+        store._conn.set_trace_callback(statements.append)
+    try:
+        response = client.get("/api/admin/auto-assignment/queue", headers=ADMIN)
+    finally:
+        for store in (data_store, auto_assignment_store):
+            store._conn.set_trace_callback(None)
+    assert response.status_code == 200, response.text
+    return len(statements), response.json()["total"]
+
+
+def test_queue_does_not_query_per_grievance():
+    for i in range(3):
+        submit(i)
+    statements, total = queue_statements()
+    for i in range(3, 10):
+        submit(i)
+    more_statements, more_total = queue_statements()
+    assert more_total == total + 7
+    assert more_statements == statements
@@ -0,0 +1,32 @@
+"""
+Only one incident clustering run can be started at a time
+"""
+import asyncio
+
+from services.incident_clustering import IncidentClusterer
+
+
+class EmptyStore:
+    def get_incident_rows(self, category):
+        return []
+
+    def set_incident_ids(self, assignments):
+        return 0
+
+
+def test_second_start_is_rejected_until_the_run_finishes(tmp_path):
+    clusterer = IncidentClusterer(path=str(tmp_path / "incidents.json"), workers=1)
+
+    async def scenario():
+        store = EmptyStore()
+        assert clusterer.start(store)
+        assert not clusterer.start(store)
+        await clusterer._task
+        assert clusterer.start(store)
+        await clusterer._task
+
+    asyncio.run(scenario())
+    status = clusterer.status()
+    assert not status["running"]
+    assert status["last_error"] is None
+    assert status["last_run"]["grievances"] == 0
@@ -0,0 +1,96 @@
+"""
+The JSON store's write-ahead journal survives damaged tails, compaction
+and reloads
+"""
+import os
+
+import pytest
+
+from models.schemas import Grievance, Status
+from storage.data_store import DataStore
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    # DataStore keeps its files under storage/ relative to the working directory
+    (tmp_path / "storage").mkdir()
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def new_grievance(i: int) -> Grievance:
+    return Grievance(
+        id=f"CSP-20260301-{i:06d}",
+        category="road",
+        description=f"Pothole number {i} on the main road",
+        location="MG Road",
+        submitter_name="Citizen",
+        created_at=f"2026-03-01T10:00:{i:02d}",
+        updated_at=f"2026-03-01T10:00:{i:02d}"
+    )
+
+
+def open_store() -> DataStore:
+    return DataStore(journal_enabled=True, multi_worker=False)
+
+
+def snapshot(store: DataStore) -> dict:
+    return {gid: g.model_dump() for gid, g in store.grievances.items()}
+
+
+def mutate(store: DataStore):
+    for i in range(3):
+        store.create_grievance(new_grievance(i))
+    store.update_status(new_grievance(0).id, Status.IN_PROGRESS, remarks="Crew assigned")
+    store.update_grievance(new_grievance(1).id, department="Public Works Department (PWD)")
+    store.flush()
+
+
+def test_reload_after_flush_keeps_every_mutation(workdir):
+    store = open_store()
+    mutate(store)
+    assert store.journal.record_count == 5
+
+    reloaded = open_store()
+    assert snapshot(reloaded) == snapshot(store)
+    assert reloaded.grievances[new_grievance(0).id].status == Status.IN_PROGRESS
+    assert reloaded.grievances[new_grievance(0).id].timeline[-1].remarks == "Crew assigned"
+
+
+@pytest.mark.parametrize("tail", [
+    '0badc0de {"op":"put","grievance":{}}\n',  # checksum mismatch
+    '1234abcd {"op":"put","griev',  # torn write
+])
+def test_replay_keeps_intact_prefix_of_damaged_journal(workdir, tail):
+    store = open_store()
+    mutate(store)
+    expected = snapshot(store)
+    journal_path = store.journal.path
+    intact_size = os.path.getsize(journal_path)
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write(tail)
+
+    reloaded = open_store()
+    assert snapshot(reloaded) == expected
+    assert reloaded.journal.record_count == 5
+    # The damaged tail is cut off so later appends stay readable
+    assert os.path.getsize(journal_path) == intact_size
+
+    reloaded.create_grievance(new_grievance(3))
+    reloaded.flush()
+    assert new_grievance(3).id in open_store().grievances
+
+
+def test_compaction_preserves_state(workdir):
+    store = open_store()
+    mutate(store)
+    expected = snapshot(store)
+
+    store.compact()
+    assert os.path.getsize(store.journal.path) == 0
+    assert snapshot(open_store()) == expected
+
+    # Records journaled after the snapshot are replayed on top of it
+    store.update_status(new_grievance(2).id, Status.RESOLVED)
+    store.flush()
+    assert snapshot(open_store()) == snapshot(store)
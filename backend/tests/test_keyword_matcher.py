@@ -0,0 +1,105 @@
+"""
+The Aho-Corasick matcher finds exactly what the per-keyword substring
+scan (`[kw for kw in keywords if kw in text]`) used to find
+"""
+import random
+
+from models.schemas import GrievanceCategory, Priority
+from services.ai_classifier import CATEGORY_KEYWORDS, DEPARTMENT_MAPPING, PRIORITY_KEYWORDS, classify_hits
+from services.batch_classifier import classify_batch
+from services.classification_preview import ClassificationPreview
+from services.keyword_matcher import KeywordMatcher
+from services.keyword_rules import builtin_rules, keyword_rules
+
+# Words that contain keywords ("tar" in "started", "light" in "streetlight")
+# and multi-word phrases that overlap single keywords
+TRAPS = [
+    "started", "streetlight", "street light", "dirty water", "no water", "water shortage",
+    "power cut", "powerful", "signalling", "hospitality", "childhood", "broken road",
+    "public toilet", "zebra crossing", "drinking water", "life-threatening", "pipeline",
+    "borewell", "delayed", "issues", "currently", "waterlogged",
+]
+FILLER = ["the", "near", "our", "colony", "since", "for", "and", "is", "a", "very", "!", ",", "\n"]
+
+
+def corpus(size: int = 400, seed: int = 7):
+    rng = random.Random(seed)
+    vocabulary = sorted({kw for table in (*CATEGORY_KEYWORDS.values(), *PRIORITY_KEYWORDS.values()) for kw in table})
+    vocabulary += TRAPS + FILLER
+    texts = ["", "road", "street light pole", "nothing relevant here"]
+    for _ in range(size):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(1, 25))]
+        separator = rng.choice([" ", " ", ""])
+        texts.append(separator.join(words).lower())
+    return texts
+
+
+def reference_classify(description: str, selected_category: GrievanceCategory):
+    """classify_grievance as it was before the matcher: one `in` test per keyword"""
+    text = description.lower()
+    detected_category = selected_category
+    category_keywords_found = []
+    max_category_matches = 0
+    for category, keywords in CATEGORY_KEYWORDS.items():
+        matches = [kw for kw in keywords if kw in text]
+        if len(matches) > max_category_matches:
+            max_category_matches = len(matches)
+            detected_category = category
+            category_keywords_found = matches
+    if max_category_matches < 2:
+        detected_category = selected_category
+
+    priority_keywords_found = []
+    for priority in (Priority.HIGH, Priority.MEDIUM, Priority.LOW):
+        priority_keywords_found = [kw for kw in PRIORITY_KEYWORDS[priority] if kw in text]
+        if priority_keywords_found or priority == Priority.LOW:
+            break
+    return detected_category, priority, set(category_keywords_found + priority_keywords_found)
+
+
+def test_matches_equal_substring_scan():
+    tables = {**{("category", c): kws for c, kws in CATEGORY_KEYWORDS.items()},
+              **{("priority", p): kws for p, kws in PRIORITY_KEYWORDS.items()}}
+    matcher = KeywordMatcher(tables)
+    for text in corpus():
+        hits = matcher.scan(text)
+        for name, keywords in tables.items():
+            expected = [kw for kw in keywords if kw in text]
+            assert hits.matches(name) == expected, (text, name)
+            assert hits.count(name) == len(expected)
+
+
+def test_resumed_scan_equals_full_scan():
+    matcher = KeywordMatcher({"road": CATEGORY_KEYWORDS[GrievanceCategory.ROAD]})
+    for text in corpus(100):
+        previous = None
+        for end in range(0, len(text) + 1, 7):
+            previous = matcher.scan(text[:end], resume=previous)
+        hits = matcher.scan(text, resume=previous)
+        assert hits.matches("road") == [kw for kw in matcher.tables["road"] if kw in text], text
+
+
+def test_classify_hits_equals_substring_classifier():
+    rules = builtin_rules()
+    for i, text in enumerate(corpus()):
+        selected = list(GrievanceCategory)[i % len(GrievanceCategory)]
+        result = classify_hits(rules.classifier.scan(text), selected, rules)
+        category, priority, keywords = reference_classify(text, selected)
+        assert result.detected_category == category, text
+        assert result.priority == priority, text
+        assert result.department == DEPARTMENT_MAPPING.get(category, "General Administration")
+        assert set(result.keywords_found) == keywords, text
+
+
+def test_previews_and_batches_do_not_count_hits():
+    rules = keyword_rules.current()
+    before = rules.hit_counts()
+    preview = ClassificationPreview()
+    text = "Huge pothole on the main road near the school, accident risk"
+    for end in range(20, len(text) + 1, 5):
+        preview.classify(text[:end], GrievanceCategory.ROAD, session_id="typing")
+    classify_batch([(text, GrievanceCategory.ROAD)] * 3, rules)
+    assert rules.hit_counts() == before
+
+    rules.classifier.scan(text.lower())
+    assert rules.hit_counts()["category:road"]["pothole"] == before["category:road"]["pothole"] + 1
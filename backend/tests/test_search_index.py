@@ -0,0 +1,37 @@
+"""
+SearchIndex can be searched while another thread indexes documents
+"""
+import random
+import threading
+
+from storage.search_index import SearchIndex
+
+
+def test_search_during_concurrent_updates():
+    index = SearchIndex()
+    words = [f"w{i}x{j}" for i in range(100) for j in range(5)]
+    errors = []
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            try:
+                index.search(random.choice(["w1", "w12x", "w3 w4", "g1"]))
+            except Exception as e:
+                errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    try:
+        for i in range(5000):
+            index.add(f"G{i}", {"id": f"G{i}", "description": " ".join(random.sample(words, 5))})
+            if i % 3 == 0:
+                index.remove(f"G{i - 1}")
+    finally:
+        done.set()
+        for reader in readers:
+            reader.join()
+
+    assert errors == []
+    assert [doc_id for doc_id, _ in index.search("g4999")] == ["G4999"]
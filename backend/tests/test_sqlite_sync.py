@@ -0,0 +1,65 @@
+"""
+SQLite stores only reload their in-process state when their own table was
+changed by another connection
+"""
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+import main
+from storage.data_store import data_store
+from storage.sqlite_store import SqliteDataStore, SQLITE_PATH
+
+client = TestClient(main.app)
+
+DESCRIPTIONS = [
+    "Huge pothole on the main road near the school, accident risk for children",
+    "Water pipe leakage on 3rd street, drinking water contaminated for days",
+    "Street light pole broken and power cut every night in our colony",
+]
+
+
+def submit(description: str) -> str:
+    response = client.post("/api/grievances", json={
+        "category": "road",
+        "description": description,
+        "location": "MG Road",
+        "submitter_email": "citizen@example.com",
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["complaint_id"]
+
+
+def test_submissions_do_not_reseed_counters():
+    submit(DESCRIPTIONS[0])
+    with mock.patch.object(data_store, "_seed_counters", wraps=data_store._seed_counters) as seed:
+        for description in DESCRIPTIONS:
+            submit(description)
+        assert client.get("/api/admin/stats").status_code == 200
+    assert seed.call_count == 0
+
+
+def test_submissions_update_memory_indexes_in_place():
+    submit(DESCRIPTIONS[0])
+    index = data_store.get_duplicate_index()
+    size = len(index)
+    with mock.patch.object(data_store.duplicate_index, "clear") as clear_duplicates, \
+            mock.patch.object(data_store.spatial_index, "clear") as clear_spatial:
+        for description in DESCRIPTIONS:
+            submit(description)
+        assert data_store.get_duplicate_index() is index
+    assert clear_duplicates.call_count == 0
+    assert clear_spatial.call_count == 0
+    assert len(index) == size + len(DESCRIPTIONS)
+
+
+def test_commit_from_another_connection_reseeds():
+    before = data_store.counters.total
+    other = SqliteDataStore(SQLITE_PATH)
+    grievance = data_store.get_grievance(submit(DESCRIPTIONS[1]))
+    other.create_grievance(grievance.model_copy(update={"id": grievance.id + "-copy"}))
+    with mock.patch.object(data_store, "_seed_counters", wraps=data_store._seed_counters) as seed:
+        data_store._sync()
+    assert seed.call_count == 1
+    assert data_store.counters.total == before + 2
+    assert grievance.id + "-copy" in data_store.get_duplicate_index()._docs
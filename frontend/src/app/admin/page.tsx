@@ -2,7 +2,7 @@
 
 import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
-import { getAllGrievances, updateGrievanceStatus, adminLogin, getAdminStats, login, setStoredToken, setStoredUser, getStoredUser, getStoredToken } from '@/lib/api';
+import { getAllGrievances, getImageUrl, updateGrievanceStatus, adminLogin, getAdminStats, login, setStoredToken, setStoredUser, getStoredUser, getStoredToken } from '@/lib/api';
 import type { Grievance, AdminStats } from '@/lib/api';
 
 const DEPARTMENTS = [
@@ -505,7 +505,7 @@ export default function AdminDashboard() {
                                                         </span>
                                                     </td>
                                                     <td>
-                                                        {g.image_data ? (
+                                                        {getImageUrl(g) ? (
                                                             <button
                                                                 onClick={() => setSelectedGrievance(g)}
                                                                 className="text-blue-600 hover:underline text-sm"
@@ -691,11 +691,11 @@ export default function AdminDashboard() {
                                     <p className="detail-description">{selectedGrievance.description}</p>
                                 </div>
 
-                                {selectedGrievance.image_data && (
+                                {getImageUrl(selectedGrievance) && (
                                     <div className="detail-section">
                                         <h4>Attached Image</h4>
                                         <img
-                                            src={selectedGrievance.image_data}
+                                            src={getImageUrl(selectedGrievance)!}
                                             alt="Complaint evidence"
                                             className="detail-image"
                                         />
@@ -4,7 +4,7 @@ import { useState, useEffect } from 'react';
 import { useRouter, useParams } from 'next/navigation';
 import Link from 'next/link';
 import dynamic from 'next/dynamic';
-import { getStoredToken, getUserComplaintDetail, type Grievance } from '@/lib/api';
+import { getStoredToken, getUserComplaintDetail, getImageUrl, type Grievance } from '@/lib/api';
 
 const LocationMap = dynamic(() => import('@/components/LocationMap'), { ssr: false });
 
@@ -199,11 +199,11 @@ export default function ComplaintDetailPage() {
                 </div>
 
                 {/* Image Evidence */}
-                {complaint.image_data && (
+                {getImageUrl(complaint) && (
                     <div className="gov-card mb-6">
                         <h2 className="text-lg font-bold text-[#003366] mb-4">📸 Attached Evidence</h2>
                         <img
-                            src={complaint.image_data}
+                            src={getImageUrl(complaint)!}
                             alt="Complaint evidence"
                             className="max-w-full h-auto rounded-lg border max-h-96 object-contain"
                         />
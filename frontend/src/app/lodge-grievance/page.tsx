@@ -4,8 +4,8 @@ import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
 import Link from 'next/link';
 import dynamic from 'next/dynamic';
-import { submitGrievance, uploadMedia, getStoredUser, getStoredToken } from '@/lib/api';
-import type { AuthUser, GrievanceResponse } from '@/lib/api';
+import { submitGrievance, uploadMedia, getStoredUser, getStoredToken, createClassificationPreview } from '@/lib/api';
+import type { AuthUser, ClassificationResult, GrievanceResponse } from '@/lib/api';
 
 const LocationMap = dynamic(() => import('@/components/LocationMap'), { ssr: false });
 
@@ -92,6 +92,8 @@ export default function LodgeGrievance() {
     const [location, setLocation] = useState('');
     const [lat, setLat] = useState<number | undefined>(undefined);
     const [lng, setLng] = useState<number | undefined>(undefined);
+    const [classifyPreview] = useState(() => createClassificationPreview());
+    const [preview, setPreview] = useState<ClassificationResult | null>(null);
 
     // Step 4: Evidence
     const [imageBase64, setImageBase64] = useState('');
@@ -127,6 +129,19 @@ export default function LodgeGrievance() {
         }
     }, []);
 
+    useEffect(() => {
+        // Live priority/department preview while the description is typed
+        if (!category || description.trim().length < 20) {
+            setPreview(null);
+            return;
+        }
+        let active = true;
+        classifyPreview(description, category)
+            .then(result => { if (active && result) setPreview(result); })
+            .catch(() => { if (active) setPreview(null); });
+        return () => { active = false; };
+    }, [description, category, classifyPreview]);
+
     // Validation functions
     const validateStep1 = () => {
         const newErrors: Record<string, string> = {};
@@ -694,6 +709,12 @@ ${description}
                                                 {description.length} / 100+ characters
                                             </p>
                                         </div>
+                                        {preview && (
+                                            <p className="text-xs text-gray-600 mt-2">
+                                                Suggested priority: <span className="font-semibold capitalize">{preview.priority}</span>
+                                                {' · '}Department: <span className="font-semibold">{preview.department}</span>
+                                            </p>
+                                        )}
                                     </div>
 
                                     <div className="grid grid-cols-1 md:grid-cols-2 gap-6">
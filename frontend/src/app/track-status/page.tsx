@@ -2,7 +2,7 @@
 
 import { useState, useEffect, Suspense } from 'react';
 import { useSearchParams } from 'next/navigation';
-import { getGrievance } from '@/lib/api';
+import { getGrievance, getImageUrl } from '@/lib/api';
 import type { Grievance } from '@/lib/api';
 
 // Child component that uses useSearchParams - must be wrapped in Suspense
@@ -189,11 +189,11 @@ function TrackStatusContent() {
                     </div>
 
                     {/* Attached Image */}
-                    {grievance.image_data && (
+                    {getImageUrl(grievance) && (
                         <div className="gov-card">
                             <h3 className="font-bold mb-2">📷 Attached Evidence</h3>
                             <img
-                                src={grievance.image_data}
+                                src={getImageUrl(grievance)!}
                                 alt="Grievance evidence"
                                 className="max-h-64 rounded border"
                             />
@@ -31,8 +31,9 @@ export interface Grievance {
   category: string;
   description: string;
   location: string;
-  image_path: string | null;
-  image_data: string | null;  // Base64 image data for preview
+  image_path: string | null;  // Served path of the stored image (uploads/blobs/...)
+  image_hash: string | null;  // SHA-256 of the stored image
+  image_data: string | null;  // Legacy inline base64 image
   audio_path: string | null;  // Path to voice note
   link: string | null;  // For generic media
   audio_meta: { size: number; duration?: number; original_name: string } | null;
@@ -147,13 +148,24 @@ export async function getGrievance(id: string): Promise<Grievance> {
   return response.json();
 }
 
-export async function checkDuplicate(description: string, category: string): Promise<DuplicateCheckResponse> {
+// Resolve the displayable image for a grievance (blob store URL or legacy inline data)
+export function getImageUrl(grievance: Pick<Grievance, 'image_data' | 'image_hash' | 'image_path'>): string | null {
+  if (grievance.image_data) return grievance.image_data;
+  if (grievance.image_hash && grievance.image_path) return `${API_BASE_URL}/${grievance.image_path}`;
+  return null;
+}
+
+export async function checkDuplicate(
+  description: string,
+  category: string,
+  place: { location?: string; lat?: number; lng?: number } = {}
+): Promise<DuplicateCheckResponse> {
   const response = await fetch(`${API_BASE_URL}/api/grievances/check-duplicate`, {
     method: 'POST',
     headers: {
       'Content-Type': 'application/json',
     },
-    body: JSON.stringify({ description, category }),
+    body: JSON.stringify({ description, category, ...place }),
   });
 
   if (!response.ok) {
@@ -163,10 +175,18 @@ export async function checkDuplicate(description: string, category: string): Pro
   return response.json();
 }
 
-export async function classifyGrievance(description: string, category: string): Promise<ClassificationResult> {
+export async function classifyGrievance(
+  description: string,
+  category: string,
+  previewSession?: string
+): Promise<ClassificationResult> {
   const response = await fetch(
     `${API_BASE_URL}/api/grievances/classify?description=${encodeURIComponent(description)}&category=${category}`,
-    { method: 'POST' }
+    {
+      method: 'POST',
+      // Lets the server resume the keyword scan of this session's previous text
+      headers: previewSession ? { 'X-Preview-Session': previewSession } : undefined,
+    }
   );
 
   if (!response.ok) {
@@ -176,6 +196,32 @@ export async function classifyGrievance(description: string, category: string):
   return response.json();
 }
 
+/**
+ * Debounced live classification preview for one form.
+ * Only the last call within `delayMs` is sent, and all calls share a
+ * preview session so the server only re-scans newly typed text.
+ */
+export function createClassificationPreview(delayMs = 300) {
+  const session = Math.random().toString(36).slice(2) + Date.now().toString(36);
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  let pending: ((result: ClassificationResult | null) => void) | null = null;
+
+  return (description: string, category: string): Promise<ClassificationResult | null> => {
+    if (timer) clearTimeout(timer);
+    // A superseded call resolves to null
+    pending?.(null);
+
+    return new Promise((resolve, reject) => {
+      pending = resolve;
+      timer = setTimeout(() => {
+        timer = null;
+        pending = null;
+        classifyGrievance(description, category, session).then(resolve, reject);
+      }, delayMs);
+    });
+  };
+}
+
 // Admin APIs
 
 export interface AdminAnalytics {